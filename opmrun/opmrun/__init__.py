@@ -1,11 +1,97 @@
-from opmrun import *
-from opmrun.opm_common import (copy_to_clipboard, convert_string, get_time, kill_job, set_gui_options, opm_popup, print_dict,
-                        remove_ansii_escape_codes, run_command, tail, wsl_path)
-from opmrun.opm_compress import (change_directory, compress_cmd, compress_files, uncompress_files)
-from opmrun.opm_keyw import keyw_main
-from opmrun.opm_sensitivity import *
-from opmrun.opm_prodsched import *
-from opmrun.opm_wellspec import wellspec_main
-from opmrun.opm_welltraj import welltraj_main
+import importlib
 
 __version__ = '2021.4.1'
+#
+# OPMRUN Routines are Loaded on First Use, so that the GUI Modules are Not Imported by the Headless Batch Runner
+#
+_routines = {'archive_compress'         : 'opm_archive',
+             'archive_files'            : 'opm_archive',
+             'archive_methods'          : 'opm_archive',
+             'archive_pool'             : 'opm_archive',
+             'archive_store'            : 'opm_archive',
+             'archive_uncompress'       : 'opm_archive',
+             'copy_to_clipboard'        : 'opm_common',
+             'convert_string'           : 'opm_common',
+             'get_time'                 : 'opm_common',
+             'kill_job'                 : 'opm_common',
+             'set_gui_options'          : 'opm_common',
+             'opm_popup'                : 'opm_common',
+             'print_dict'               : 'opm_common',
+             'remove_ansii_escape_codes': 'opm_common',
+             'run_command'              : 'opm_common',
+             'tail'                     : 'opm_common',
+             'wsl_path'                 : 'opm_common',
+             'change_directory'         : 'opm_compress',
+             'compress_cmd'             : 'opm_compress',
+             'compress_files'           : 'opm_compress',
+             'uncompress_files'         : 'opm_compress',
+             'grid_read'                : 'opm_grid',
+             'grid_wells'               : 'opm_grid',
+             'keyw_main'                : 'opm_keyw',
+             'flow_job'                 : 'opm_queue',
+             'job_check'                : 'opm_queue',
+             'job_cpus'                 : 'opm_queue',
+             'job_extensions'           : 'opm_queue',
+             'job_kill'                 : 'opm_queue',
+             'job_pack'                 : 'opm_queue',
+             'job_reader'               : 'opm_queue',
+             'job_status'               : 'opm_queue',
+             'queue_read'               : 'opm_queue',
+             'sensitivity_adaptive'     : 'opm_sensitivity',
+             'sensitivity_analyse'      : 'opm_sensitivity',
+             'sensitivity_base_file'    : 'opm_sensitivity',
+             'sensitivity_base_param'   : 'opm_sensitivity',
+             'sensitivity_case'         : 'opm_sensitivity',
+             'sensitivity_check'        : 'opm_sensitivity',
+             'sensitivity_clean'        : 'opm_sensitivity',
+             'sensitivity_coded'        : 'opm_sensitivity',
+             'sensitivity_design'       : 'opm_sensitivity',
+             'sensitivity_designs'      : 'opm_sensitivity',
+             'sensitivity_edit_factor'  : 'opm_sensitivity',
+             'sensitivity_main'         : 'opm_sensitivity',
+             'sensitivity_maximin'      : 'opm_sensitivity',
+             'sensitivity_queue'        : 'opm_sensitivity',
+             'sensitivity_records'      : 'opm_sensitivity',
+             'sensitivity_results'      : 'opm_sensitivity',
+             'sensitivity_run_batch'    : 'opm_sensitivity',
+             'sensitivity_set_factors'  : 'opm_sensitivity',
+             'sensitivity_summary'      : 'opm_sensitivity',
+             'sensitivity_template'     : 'opm_sensitivity',
+             'sensitivity_values'       : 'opm_sensitivity',
+             'sensitivity_write_case'   : 'opm_sensitivity',
+             'sensitivity_write_cases'  : 'opm_sensitivity',
+             'sensitivity_write_data'   : 'opm_sensitivity',
+             'sensitivity_write_design' : 'opm_sensitivity',
+             'sensitivity_write_param'  : 'opm_sensitivity',
+             'sensitivity_write_pool'   : 'opm_sensitivity',
+             'sensitivity_write_queue'  : 'opm_sensitivity',
+             'sensitivity_write_shared' : 'opm_sensitivity',
+             'prodsched_check'          : 'opm_prodsched',
+             'prodsched_columns'        : 'opm_prodsched',
+             'prodsched_cumsum'         : 'opm_prodsched',
+             'prodsched_daily'          : 'opm_prodsched',
+             'prodsched_daily_data'     : 'opm_prodsched',
+             'prodsched_fields'         : 'opm_prodsched',
+             'prodsched_headers'        : 'opm_prodsched',
+             'prodsched_main'           : 'opm_prodsched',
+             'prodsched_monthly'        : 'opm_prodsched',
+             'prodsched_monthly_data'   : 'opm_prodsched',
+             'prodsched_stream'         : 'opm_prodsched',
+             'prodsched_text'           : 'opm_prodsched',
+             'prodsched_wconhist'       : 'opm_prodsched',
+             'prodsched_wconhist_records': 'opm_prodsched',
+             'prodsched_widths'         : 'opm_prodsched',
+             'proxy_eval'               : 'opm_proxy',
+             'proxy_fit'                : 'opm_proxy',
+             'proxy_select'             : 'opm_proxy',
+             'wellspec_main'            : 'opm_wellspec',
+             'welltraj_main'            : 'opm_welltraj',
+             'welltraj_mincurv'         : 'opm_welltraj'}
+
+__all__ = list(_routines)
+
+
+def __getattr__(name):
+    if name in _routines:
+        return getattr(importlib.import_module('opmrun.' + _routines[name]), name)
+    raise AttributeError('module ' + repr(__name__) + ' has no attribute ' + repr(name))
@@ -0,0 +1,710 @@
+# ======================================================================================================================
+#
+"""OPM_ARCHIVE.py - Archive Engine for the Compress and Uncompress Utilities
+
+This module contains the archive engine used by the OPMRUN compress and uncompress utilities. Archives are standard
+ZIP files written and read in process with the zipfile module, rather than by running the zip and unzip commands, with
+the archives processed at the same time on a process pool. The routines do not depend on the GUI, so that they can be
+run in the pool's worker processes.
+
+Compression uses deflate with levels 0 to 9, or Zstandard with levels 1 to 22 if supported by the Python zipfile module
+(Python 3.14 and later), and files that are already compressed (zip, gz, etc.) can be stored without being compressed
+again. Each archive reports the number of bytes read and written together with the throughput.
+
+Uncompression can extract selected members only, for example just the summary files, with each member streamed
+directly to disk and its CRC verified as it is written, so that restoring part of an ensemble does not require every
+member of every archive to be inflated.
+
+Ensemble directories can also be archived in a shared chunk store, where the files are split into chunks that are
+stored once, by the SHA-256 hash of their content, in a store directory shared by all the ensemble archives. As the
+ensemble members normally have identical include files (grids, PVT, relative permeability tables etc.) each of these is
+only stored once. The ensemble archive is then a ZIP file containing a manifest of the files and their chunks, that is
+restored by the uncompress utility from the chunk store, independently of the other archives.
+
+Program Documentation
+---------------------
+Only Python 3 is supported and tested Python2 support has been depreciated.
+
+2026.10.18 - Added the shared chunk store for deduplicating ensemble archives.
+2026.10.18 - Added selective streaming uncompression with CRC verification.
+2026.10.18 - New module initial release.
+
+Copyright Notice
+----------------
+This file is part of the Open Porous Media project (OPM).
+
+OPM is free software: you can redistribute it and/or modify it under the terms of the GNU General Public License as
+published by the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+
+OPM is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the aforementioned GNU General Public Licenses for more
+details.
+
+Copyright (C) 2022-2026 OPM-OP AS
+
+Author  : David Baxendale et al
+          info@opm-op.com
+Version : 2026.10.18
+Date    : 18-Oct-2026
+"""
+# ----------------------------------------------------------------------------------------------------------------------
+# 3456789012345678901234567890123456789012345678901234567890123456789012345678901234567890123456789012345678901234567890
+#        1         2         3         4         5         6         7         8         9         0         1         2
+#        0         0         0         0         0         0         0         0         0         1         1         1
+# ----------------------------------------------------------------------------------------------------------------------
+#
+# ----------------------------------------------------------------------------------------------------------------------
+# Import Modules Section
+# ----------------------------------------------------------------------------------------------------------------------
+import concurrent.futures
+import datetime
+import fnmatch
+import hashlib
+import json
+import os
+import struct
+import time
+import zipfile
+import zlib
+from pathlib import Path
+
+# ----------------------------------------------------------------------------------------------------------------------
+# Define Modules Section
+# ----------------------------------------------------------------------------------------------------------------------
+def archive_compress(jobzip, files, method='deflate', level=6, skip=True, move=False):
+    """Compress Files into a ZIP Archive
+
+    Compresses the files into the ZIP archive. If the archive already exists it is updated, as per 'zip -u', that is
+    members that are not being added are kept, and members are only replaced if the file is newer than the member.
+    If no member is replaced the new files are appended to the existing archive, so an update only costs compressing
+    the new files. Otherwise the archive is rewritten to a temporary file that replaces the archive once complete, so
+    that an existing archive is not lost if the compression fails, with the kept members copied as compressed data by
+    archive_copy, so that the rewrite costs reading and writing the kept members but not recompressing them. With the
+    move option the files are deleted once the archive is complete, as per 'zip -m'.
+
+    Parameters
+    ----------
+    jobzip : str
+        ZIP archive file name
+    files : list
+        Files to be archived, stored in the archive by file name only
+    method : str
+        Compression method, one of 'deflate', 'zstd' or 'store'
+    level : int
+        Compression level for the compression method
+    skip : bool
+        Set to True to store files that are already compressed, rather than compressing them again
+    move : bool
+        Set to True to delete the files once the archive is complete
+
+    Returns
+    -------
+    result : dict
+        Archive name, number of files, bytes read and written, elapsed time, throughput in MB/s, and error message if
+        the compression failed, otherwise None
+    """
+
+    start   = time.perf_counter()
+    jobzip  = Path(jobzip)
+    jobtmp  = jobzip.with_name(jobzip.name + '.tmp')
+    result  = {'archive': str(jobzip), 'files': 0, 'stored': 0, 'bytes_in': 0, 'bytes_out': 0, 'seconds': 0.0,
+               'throughput': 0.0, 'error': None}
+    files   = {Path(file).name: Path(file) for file in files if Path(file).name not in [jobzip.name, jobtmp.name]}
+    try:
+        compression, compresslevel = archive_method(method, level)
+        #
+        # Find Existing Members Being Replaced by Newer Files
+        #
+        keep    = []
+        replace = False
+        if jobzip.is_file():
+            with zipfile.ZipFile(jobzip, 'r') as zin:
+                for info in zin.infolist():
+                    file = files.get(info.filename)
+                    if file is not None and (file.stat().st_mtime >
+                                             datetime.datetime(*info.date_time).timestamp() + 2):
+                        replace = True
+                        continue
+                    files.pop(info.filename, None)
+                    keep.append(info)
+        #
+        # Append to the Existing Archive, or Write a New Archive Keeping the Existing Members
+        #
+        append = jobzip.is_file() and not replace
+        with zipfile.ZipFile(jobzip if append else jobtmp, 'a' if append else 'w', compression=compression,
+                             compresslevel=compresslevel) as zout:
+            if keep and not append:
+                with zipfile.ZipFile(jobzip, 'r') as zin:
+                    for info in keep:
+                        archive_copy(zin, info, zout)
+            #
+            # Add Files
+            #
+            for name, file in sorted(files.items()):
+                if skip and file.suffix.lower() in archive_suffixes():
+                    zout.write(file, arcname=name, compress_type=zipfile.ZIP_STORED)
+                    result['stored'] = result['stored'] + 1
+                else:
+                    zout.write(file, arcname=name)
+                result['files'   ] = result['files'] + 1
+                result['bytes_in'] = result['bytes_in'] + file.stat().st_size
+
+        if not append:
+            os.replace(jobtmp, jobzip)
+        if move:
+            for file in files.values():
+                file.unlink()
+
+    except (OSError, ValueError, zipfile.BadZipFile, RuntimeError) as error:
+        result['error'] = str(error)
+        if jobtmp.is_file():
+            jobtmp.unlink()
+
+    result['bytes_out' ] = jobzip.stat().st_size if jobzip.is_file() else 0
+    result['seconds'   ] = time.perf_counter() - start
+    result['throughput'] = result['bytes_in'] / 1.0e6 / max(result['seconds'], 1.0e-6)
+    return result
+
+
+def archive_copy(zin, info, zout):
+    """Copy a Member of a ZIP Archive to Another Archive Without Recompressing It
+
+    Copies the compressed data of the member as is, with a new local file header that includes the CRC and sizes, and
+    adds the member to the output archive's central directory, so that the data is neither decompressed nor compressed
+    again. The local file header is read with the layout from the ZIP specification, and if it is not a valid local
+    file header, or the member is encrypted, the member is read and written again with writestr instead.
+
+    Parameters
+    ----------
+    zin : zipfile.ZipFile
+        ZIP archive opened for reading
+    info : zipfile.ZipInfo
+        Member to be copied
+    zout : zipfile.ZipFile
+        ZIP archive opened for writing
+
+    Returns
+    -------
+    None
+    """
+
+    zin.fp.seek(info.header_offset)
+    header = zin.fp.read(30)
+    if len(header) != 30 or header[:4] != b'PK\x03\x04' or info.flag_bits & 0x01:
+        zout.writestr(info, zin.read(info))
+        return
+    #
+    # Local File Header: Signature, Version, Flags, Method, Time, Date, CRC, Sizes, Name and Extra Field Lengths
+    #
+    header = struct.unpack('<4s5H3L2H', header)
+    zin.fp.seek(header[9] + header[10], 1)
+    #
+    # Member with the Sizes in the Local Header and Without the Central Directory ZIP64 Extra Field
+    #
+    member = zipfile.ZipInfo(info.filename, info.date_time)
+    member.compress_type = info.compress_type
+    member.external_attr = info.external_attr
+    member.create_system = info.create_system
+    member.flag_bits     = info.flag_bits & ~0x08
+    member.CRC           = info.CRC
+    member.compress_size = info.compress_size
+    member.file_size     = info.file_size
+    member.header_offset = zout.fp.tell()
+    extra = []
+    n     = 0
+    while n + 4 <= len(info.extra):
+        (tag, size) = struct.unpack('<HH', info.extra[n:n + 4])
+        if tag != 0x0001:
+            extra.append(info.extra[n:n + 4 + size])
+        n = n + 4 + size
+    member.extra = b''.join(extra)
+
+    zip64 = max(member.file_size, member.compress_size) > zipfile.ZIP64_LIMIT
+    zout.fp.write(member.FileHeader(zip64))
+    remain = member.compress_size
+    while remain > 0:
+        data = zin.fp.read(min(remain, 1024 * 1024))
+        if not data:
+            raise zipfile.BadZipFile('Truncated data for member ' + info.filename)
+        zout.fp.write(data)
+        remain = remain - len(data)
+
+    zout.filelist.append(member)
+    zout.NameToInfo[member.filename] = member
+    zout.start_dir = zout.fp.tell()
+
+
+def archive_extract(zin, info, filename):
+    """Extract a Member of a ZIP Archive and Verify its CRC
+
+    Streams the member to the file, calculating the CRC as the data is written, and raises BadZipFile if the CRC does
+    not match the archive.
+
+    Parameters
+    ----------
+    zin : zipfile.ZipFile
+        ZIP archive opened for reading
+    info : zipfile.ZipInfo
+        Member to be extracted
+    filename : str
+        File the member is written to
+
+    Returns
+    -------
+    bytes_in : int
+        Compressed size of the member
+    bytes_out : int
+        Number of bytes written
+    timestamp : float
+        Modification time of the member
+    """
+
+    crc = 0
+    with zin.open(info) as src, open(filename, 'wb') as dst:
+        for data in iter(lambda: src.read(1024 * 1024), b''):
+            crc = zlib.crc32(data, crc)
+            dst.write(data)
+    if crc != info.CRC:
+        raise zipfile.BadZipFile('Bad CRC-32 for member ' + info.filename)
+    return info.compress_size, info.file_size, datetime.datetime(*info.date_time).timestamp()
+
+
+def archive_files(jobpath, jobroot=None):
+    """Get the Files to be Archived for a Case or Directory
+
+    Gets the files for a case, that is all the files in the case's directory with the case's base name (CASE.*), as per
+    'zip CASE.zip CASE.*', or if no case is given all the files in the directory with an extension (*.*).
+
+    Parameters
+    ----------
+    jobpath : str
+        Directory of the case or directory to be archived
+    jobroot : str
+        Base name of the case, None to archive the directory
+
+    Returns
+    -------
+    files : list
+        Sorted list of files to be archived
+    """
+
+    if jobroot is None:
+        files = Path(jobpath).glob('*.*')
+    else:
+        files = Path(jobpath).glob(str(jobroot) + '.*')
+    return sorted(file for file in files if file.is_file())
+
+
+def archive_manifest(jobzip):
+    """Read the Manifest of a Chunk Store Archive
+
+    Parameters
+    ----------
+    jobzip : str
+        ZIP archive file name
+
+    Returns
+    -------
+    manifest : dict
+        The chunk store manifest, or None if the archive is a standard ZIP archive
+    """
+
+    with zipfile.ZipFile(jobzip, 'r') as zin:
+        if archive_store_manifest() not in zin.namelist():
+            return None
+        manifest = json.loads(zin.read(archive_store_manifest()))
+    if manifest.get('format') != 'opmrun-chunk-store':
+        raise ValueError('Archive ' + str(jobzip) + ' has an unknown manifest format')
+    return manifest
+
+
+def archive_match(file, info):
+    """Check if a File Matches a Member of an Archive
+
+    Compares the size of the file with the member, and if the sizes are the same the CRC-32 of the file for a ZIP
+    member, or the SHA-256 hash of the file for a chunk store manifest entry.
+
+    Parameters
+    ----------
+    file : Path
+        File to be compared
+    info : zipfile.ZipInfo or dict
+        ZIP archive member or chunk store manifest entry
+
+    Returns
+    -------
+    match : bool
+        True if the file has the same size and CRC-32 or hash as the member, otherwise False
+    """
+
+    size = info.file_size if isinstance(info, zipfile.ZipInfo) else info['size']
+    if file.stat().st_size != size:
+        return False
+
+    crc    = 0
+    digest = hashlib.sha256()
+    with open(file, 'rb') as src:
+        for data in iter(lambda: src.read(1024 * 1024), b''):
+            if isinstance(info, zipfile.ZipInfo):
+                crc = zlib.crc32(data, crc)
+            else:
+                digest.update(data)
+    if isinstance(info, zipfile.ZipInfo):
+        return crc == info.CRC
+    return digest.hexdigest() == info['sha256']
+
+
+def archive_members(names, members=None):
+    """Select the Archive Members Matching the Member Patterns
+
+    Parameters
+    ----------
+    names : list
+        Member names in the archive
+    members : list
+        Member patterns to be selected, for example ['*.SMSPEC', '*.UNSMRY'], with the patterns matched without regard
+        to case. None or an empty list selects all the members
+
+    Returns
+    -------
+    names : list
+        Member names that match the member patterns
+    """
+
+    if not members:
+        return list(names)
+    members = [member.lower() for member in members]
+    return [name for name in names if any(fnmatch.fnmatch(Path(name).name.lower(), member) for member in members)]
+
+
+def archive_method(method, level):
+    """Get the zipfile Compression Method and Level
+
+    Parameters
+    ----------
+    method : str
+        Compression method, one of 'deflate', 'zstd' or 'store'
+    level : int
+        Compression level for the compression method
+
+    Returns
+    -------
+    compression : int
+        zipfile compression method constant
+    compresslevel : int
+        zipfile compression level
+    """
+
+    if method == 'zstd':
+        if 'zstd' not in archive_methods():
+            raise ValueError('Zstandard compression requires Python 3.14 or later')
+        return zipfile.ZIP_ZSTANDARD, min(max(int(level), 1), 22)
+    if method == 'store':
+        return zipfile.ZIP_STORED, None
+    return zipfile.ZIP_DEFLATED, min(max(int(level), 0), 9)
+
+
+def archive_methods():
+    """Get the Available Compression Methods
+
+    Parameters
+    ----------
+
+
+    Returns
+    -------
+    methods : list
+        The compression methods supported by the Python zipfile module
+    """
+
+    if hasattr(zipfile, 'ZIP_ZSTANDARD'):
+        return ['deflate', 'zstd', 'store']
+    return ['deflate', 'store']
+
+
+def archive_pool(jobs, function, workers=None, interval=0.25):
+    """Run Archive Jobs on a Process Pool
+
+    Submits the archive jobs to a process pool and yields the results as each job is completed, so that the calling
+    routine can report the results as they become available. None is yielded if no job has been completed within the
+    interval, so that a GUI can be refreshed while waiting.
+
+    Parameters
+    ----------
+    jobs : list
+        List of (args, kwargs) tuples for each archive job
+    function : function
+        Archive function to be run for each job, archive_compress for example
+    workers : int
+        Number of worker processes, None for the number of CPUs
+    interval : float
+        Maximum time in seconds to wait for a job to be completed before yielding None
+
+    Returns
+    -------
+    result : dict
+        Yields the result of each archive job as it is completed, or None
+    """
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = {pool.submit(function, *args, **kwargs) for args, kwargs in jobs}
+        while pending:
+            done, pending = concurrent.futures.wait(pending, timeout=interval,
+                                                    return_when=concurrent.futures.FIRST_COMPLETED)
+            if not done:
+                yield None
+            for future in done:
+                yield future.result()
+
+
+def archive_restore(store, entry, filename):
+    """Restore a File from a Chunk Store and Verify its Hash
+
+    Streams the file's chunks from the chunk store to the file, checking the SHA-256 hash of each chunk and of the
+    whole file as the data is written, and raises BadZipFile if the hashes or size do not match the manifest.
+
+    Parameters
+    ----------
+    store : str
+        Chunk store directory
+    entry : dict
+        The file's manifest entry
+    filename : str
+        File the restored data is written to
+
+    Returns
+    -------
+    bytes_in : int
+        Number of bytes read from the chunk store
+    bytes_out : int
+        Number of bytes written
+    timestamp : float
+        Modification time of the file
+    """
+
+    bytes_in = 0
+    digest   = hashlib.sha256()
+    with open(filename, 'wb') as dst:
+        for key in entry['chunks']:
+            path     = Path(store) / key[:2] / key
+            data     = path.read_bytes()
+            bytes_in = bytes_in + len(data)
+            data     = zlib.decompress(data)
+            if hashlib.sha256(data).hexdigest() != key:
+                raise zipfile.BadZipFile('Bad SHA-256 for chunk ' + str(path))
+            digest.update(data)
+            dst.write(data)
+        bytes_out = dst.tell()
+    if bytes_out != entry['size'] or digest.hexdigest() != entry['sha256']:
+        raise zipfile.BadZipFile('Bad SHA-256 for member ' + entry['name'])
+    return bytes_in, bytes_out, entry['mtime']
+
+
+def archive_store(jobzip, files, store, level=6, chunk=4194304, move=False):
+    """Archive Files in a Shared Chunk Store
+
+    Splits the files into fixed size chunks and stores each chunk, compressed with deflate, in the chunk store under the
+    SHA-256 hash of its content, so that a chunk is only stored once no matter how many files and archives contain it.
+    The archive is a ZIP file containing a manifest of the files, their sizes, times, SHA-256 hashes and chunks, and the
+    location of the chunk store relative to the archive, that is used by archive_uncompress to restore the files.
+    Chunks are written to a temporary file that is renamed once complete, so that several processes can write to the
+    same chunk store at the same time. If the archive already exists the files that are not being added are kept.
+
+    Parameters
+    ----------
+    jobzip : str
+        ZIP archive file name
+    files : list
+        Files to be archived, stored in the archive by file name only
+    store : str
+        Chunk store directory, normally shared by all the archives of an ensemble
+    level : int
+        Deflate compression level for the chunks
+    chunk : int
+        Chunk size in bytes
+    move : bool
+        Set to True to delete the files once the archive is complete
+
+    Returns
+    -------
+    result : dict
+        Archive name, number of files, number of chunks and new chunks, bytes read and written, elapsed time,
+        throughput in MB/s, and error message if the archiving failed, otherwise None
+    """
+
+    start   = time.perf_counter()
+    jobzip  = Path(jobzip)
+    jobtmp  = jobzip.with_name(jobzip.name + '.tmp')
+    store   = Path(store)
+    result  = {'archive': str(jobzip), 'files': 0, 'chunks': 0, 'stored': 0, 'bytes_in': 0, 'bytes_out': 0,
+               'seconds': 0.0, 'throughput': 0.0, 'error': None}
+    files   = {Path(file).name: Path(file) for file in files if Path(file).name not in [jobzip.name, jobtmp.name]}
+    try:
+        entries = {}
+        if jobzip.is_file():
+            manifest = archive_manifest(jobzip)
+            if manifest is None:
+                raise ValueError('Existing archive ' + str(jobzip) + ' is not a chunk store archive')
+            entries = {entry['name']: entry for entry in manifest['files']}
+
+        for name, file in sorted(files.items()):
+            stat   = file.stat()
+            digest = hashlib.sha256()
+            chunks = []
+            with open(file, 'rb') as src:
+                for data in iter(lambda: src.read(chunk), b''):
+                    digest.update(data)
+                    key  = hashlib.sha256(data).hexdigest()
+                    path = store / key[:2] / key
+                    if not path.is_file():
+                        path.parent.mkdir(parents=True, exist_ok=True)
+                        pathtmp = path.with_name(key + '.' + str(os.getpid()) + '.tmp')
+                        pathtmp.write_bytes(zlib.compress(data, min(max(int(level), 0), 9)))
+                        os.replace(pathtmp, path)
+                        result['stored'   ] = result['stored'] + 1
+                        result['bytes_out'] = result['bytes_out'] + path.stat().st_size
+                    chunks.append(key)
+
+            entries[name] = {'name': name, 'size': stat.st_size, 'mtime': stat.st_mtime,
+                             'sha256': digest.hexdigest(), 'chunks': chunks}
+            result['files'   ] = result['files'] + 1
+            result['chunks'  ] = result['chunks'] + len(chunks)
+            result['bytes_in'] = result['bytes_in'] + stat.st_size
+
+        manifest = {'format': 'opmrun-chunk-store', 'version': 1,
+                    'store': Path(os.path.relpath(store.resolve(), jobzip.parent.resolve())).as_posix(),
+                    'files': [entries[name] for name in sorted(entries)]}
+        with zipfile.ZipFile(jobtmp, 'w', compression=zipfile.ZIP_DEFLATED) as zout:
+            zout.writestr(archive_store_manifest(), json.dumps(manifest, indent=1))
+        os.replace(jobtmp, jobzip)
+        result['bytes_out'] = result['bytes_out'] + jobzip.stat().st_size
+        if move:
+            for file in files.values():
+                file.unlink()
+
+    except (OSError, ValueError, zipfile.BadZipFile, RuntimeError) as error:
+        result['error'] = str(error)
+        if jobtmp.is_file():
+            jobtmp.unlink()
+
+    result['seconds'   ] = time.perf_counter() - start
+    result['throughput'] = result['bytes_in'] / 1.0e6 / max(result['seconds'], 1.0e-6)
+    return result
+
+
+def archive_store_manifest():
+    """Get the Name of the Chunk Store Manifest Member
+
+    Parameters
+    ----------
+
+
+    Returns
+    -------
+    name : str
+        Name of the member containing the chunk store manifest in chunk store archives
+    """
+
+    return 'OPMRUN-MANIFEST.json'
+
+
+def archive_suffixes():
+    """Get the File Extensions of Files that Are Already Compressed
+
+    Parameters
+    ----------
+
+
+    Returns
+    -------
+    suffixes : set
+        Lower case file extensions of files that are already compressed
+    """
+
+    return {'.7z', '.bz2', '.gz', '.jpeg', '.jpg', '.png', '.rar', '.tgz', '.xz', '.zip', '.zst'}
+
+
+def archive_uncompress(jobzip, members=None, overwrite=False, move=False):
+    """Uncompress Selected Members of a ZIP Archive
+
+    Extracts the members of the archive that match the member patterns into the archive's directory. Each member is
+    streamed directly to a temporary file alongside the member, and verified as it is written, before the temporary
+    file replaces the member, so that a corrupt member never overwrites a good file. Existing files are kept, as per
+    'unzip -n', unless overwrite is set, as per 'unzip -o'. With the move option the archive is deleted once all its
+    members have been extracted without errors, but only if all the members were selected and any existing files that
+    were kept match their members, see archive_match, so that a member is never lost. Chunk store archives are restored
+    from their chunk store, which is never deleted as it is shared with other archives.
+
+    Parameters
+    ----------
+    jobzip : str
+        ZIP archive file name
+    members : list
+        Member patterns to be extracted, for example ['*.SMSPEC', '*.UNSMRY'], None to extract all the members
+    overwrite : bool
+        Set to True to overwrite existing files, otherwise existing files are kept
+    move : bool
+        Set to True to delete the archive once all the members have been extracted
+
+    Returns
+    -------
+    result : dict
+        Archive name, number of files extracted and skipped, bytes read and written, elapsed time, throughput in MB/s,
+        and error message if the uncompression failed, otherwise None
+    """
+
+    start   = time.perf_counter()
+    jobzip  = Path(jobzip)
+    jobpath = jobzip.parent.resolve()
+    differ  = 0
+    result  = {'archive': str(jobzip), 'files': 0, 'skipped': 0, 'bytes_in': 0, 'bytes_out': 0, 'seconds': 0.0,
+               'throughput': 0.0, 'error': None}
+    try:
+        manifest = archive_manifest(jobzip)
+        with zipfile.ZipFile(jobzip, 'r') as zin:
+            if manifest is None:
+                infos = {info.filename: info for info in zin.infolist() if not info.is_dir()}
+            else:
+                infos = {entry['name']: entry for entry in manifest['files']}
+                store = jobpath / manifest['store']
+            names = archive_members(infos, members)
+            for name in names:
+                file = (jobpath / name).resolve()
+                if jobpath not in file.parents:
+                    raise ValueError('Member ' + name + ' is outside the archive directory')
+                if file.exists() and not overwrite:
+                    result['skipped'] = result['skipped'] + 1
+                    if move and not archive_match(file, infos[name]):
+                        differ = differ + 1
+                    continue
+
+                file.parent.mkdir(parents=True, exist_ok=True)
+                filetmp = file.with_name(file.name + '.tmp')
+                try:
+                    if manifest is None:
+                        (bytes_in, bytes_out, timestamp) = archive_extract(zin, infos[name], filetmp)
+                    else:
+                        (bytes_in, bytes_out, timestamp) = archive_restore(store, infos[name], filetmp)
+                    os.utime(filetmp, (timestamp, timestamp))
+                    os.replace(filetmp, file)
+                finally:
+                    if filetmp.exists():
+                        filetmp.unlink()
+
+                result['files'    ] = result['files'] + 1
+                result['bytes_in' ] = result['bytes_in'] + bytes_in
+                result['bytes_out'] = result['bytes_out'] + bytes_out
+
+        if move and len(names) == len(infos) and differ == 0:
+            jobzip.unlink()
+
+    except (OSError, ValueError, KeyError, zipfile.BadZipFile, RuntimeError, EOFError, zlib.error) as error:
+        result['error'] = str(error)
+
+    result['seconds'   ] = time.perf_counter() - start
+    result['throughput'] = result['bytes_out'] / 1.0e6 / max(result['seconds'], 1.0e-6)
+    return result
+
+# ======================================================================================================================
+# End of OPM_ARCHIVE.PY
+# ======================================================================================================================
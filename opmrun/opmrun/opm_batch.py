@@ -0,0 +1,350 @@
+# ======================================================================================================================
+#
+"""OPM_BATCH.py - OPMRUN Headless Batch Runner
+
+The module runs the jobs in an OPMRUN queue file (*.que) from the command line without the OPMRUN GUI, for example on
+compute nodes without a display. The jobs are run with the same checks for OPM Flow exceptions, unrecoverable errors
+and segmentation faults as the OPMRUN foreground processing option, and a machine-readable JSON summary of the jobs is
+written once the queue is complete. Jobs can be run one at a time or concurrently packed by the number of CPUs. An
+interrupt (Ctrl-C) or termination signal kills the running jobs and cancels the remaining jobs in the queue. The start
+and end of each job is recorded in the OPMRUN job state database, and with the resume option jobs that have already
+been completed are skipped, for example after a system restart.
+
+The module only uses the standard library, psutil and the OPMRUN queue routines, so that FreeSimpleGUI, tkinter,
+pandas and pyDOE3 are not imported. Usage:
+
+    opmrun-batch [-h] [--nosim] [--concurrent] [--cpus CPUS] [--quiet] [--summary SUMMARY] [--database DATABASE]
+                 [--resume] queue
+
+Program Documentation
+---------------------
+Only Python 3 is supported and tested Python2 support has been depreciated.
+
+2026.10.18 - Added job state database and resume option.
+2026.10.18 - New module initial release.
+
+Copyright Notice
+----------------
+This file is part of the Open Porous Media project (OPM).
+
+OPM is free software: you can redistribute it and/or modify it under the terms of the GNU General Public License as
+published by the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+
+OPM is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the aforementioned GNU General Public Licenses for more
+details.
+
+Copyright (C) 2022-2026 OPM-OP AS
+
+Author  : David Baxendale et al
+          info@opm-op.com
+Version : 2026.10.18
+Date    : 18-Oct-2026
+"""
+# ----------------------------------------------------------------------------------------------------------------------
+# 3456789012345678901234567890123456789012345678901234567890123456789012345678901234567890123456789012345678901234567890
+#        1         2         3         4         5         6         7         8         9         0         1         2
+#        0         0         0         0         0         0         0         0         0         1         1         1
+# ----------------------------------------------------------------------------------------------------------------------
+#
+# ----------------------------------------------------------------------------------------------------------------------
+# Import Modules Section
+# ----------------------------------------------------------------------------------------------------------------------
+import argparse
+import datetime
+import json
+import queue
+import signal
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+import psutil
+#
+# Import OPMRUN Queue Modules
+#
+from opmrun.opm_jobdb import jobdb_completed, jobdb_end, jobdb_open, jobdb_start
+from opmrun.opm_queue import (flow_job, job_cpus, job_extensions, job_kill, job_pack, job_reader, job_status,
+                              queue_read)
+
+# ----------------------------------------------------------------------------------------------------------------------
+# Define Modules Section
+# ----------------------------------------------------------------------------------------------------------------------
+def batch_job(jobrec, nosim, jobext, echo):
+    """Run an OPM Flow Job Without the GUI
+
+    Checks the job's directory, DATA and PARAM files, removes the existing output files and runs the job, with the
+    output written to the job's log file by a background reader thread that checks for OPM Flow exceptions,
+    unrecoverable errors and segmentation faults. The job record is updated with the job's status, and is normally run
+    in its own thread.
+
+    Parameters
+    ----------
+    jobrec : dict
+        Job record for the job to be run, updated with the job's status on completion
+    nosim : bool
+        Set to True to run in no simulation mode, otherwise False
+    jobext : list
+        List of simulation output files to be removed
+    echo : str
+        Prefix for echoing the job's output to standard error, or None for no echo
+
+    Returns
+    -------
+    None
+    """
+
+    (job, jobcmd, jobpath, jobbase, jobroot, joblog) = flow_job(jobrec['command'])
+    jobrec['start'] = batch_time()
+    #
+    # Check Job Directory, DATA and PARAM Files
+    #
+    if not Path(jobpath).is_dir():
+        jobrec['message'] = 'Missing Directory ' + str(jobpath)
+    elif not (Path(jobpath / Path(jobroot).with_suffix('.DATA')).is_file() or
+              Path(jobpath / Path(jobroot).with_suffix('.data')).is_file()):
+        jobrec['message'] = 'Missing DATA File ' + str(Path(jobpath) / jobroot) + '.DATA'
+    elif not Path(jobpath / jobbase).is_file():
+        jobrec['message'] = 'Missing PARAM File ' + str(Path(jobpath) / jobbase)
+
+    if jobrec['message']:
+        jobrec['status'] = 'Aborted'
+        jobrec['end'   ] = batch_time()
+        return
+    #
+    # Remove Existing Output Files
+    #
+    for text in jobext:
+        filename = Path(jobpath / jobbase).with_suffix(text)
+        if filename.is_file():
+            try:
+                filename.unlink()
+            except OSError:
+                continue
+    #
+    # Run Job
+    #
+    jobcase = jobcmd + str(jobbase)
+    if nosim:
+        jobcase = jobcase + ' --enable-dry-run="true"'
+    jobque  = queue.Queue(maxsize=5000)
+    jobstat = {'failjob': False, 'segmjob': False, 'killed': [], 'errors': []}
+    try:
+        if sys.platform.startswith('win'):
+            jobproc = subprocess.Popen(['powershell.exe ', 'wsl', jobcase], shell=True, cwd=jobpath,
+                                       stdout=subprocess.PIPE, stderr=subprocess.STDOUT, bufsize=1,
+                                       universal_newlines=True, errors='replace')
+        else:
+            jobproc = subprocess.Popen(jobcase, shell=True, cwd=jobpath, stdout=subprocess.PIPE,
+                                       stderr=subprocess.STDOUT, bufsize=1, universal_newlines=True,
+                                       errors='replace')
+    except OSError as error:
+        jobrec['status' ] = 'Aborted'
+        jobrec['message'] = str(error)
+        jobrec['end'    ] = batch_time()
+        return
+
+    jobrec['pid'] = jobproc.pid
+    if jobrec['killjob']:
+        job_kill(jobproc.pid)
+    jobread = threading.Thread(target=job_reader, args=(jobproc, jobcase, jobque, jobstat), daemon=True)
+    jobread.start()
+    with open(jobrec['log'], 'w') as file:
+        while True:
+            line = jobque.get()
+            if line is None:
+                break
+            file.write(line + '\n')
+            if echo is not None:
+                print(echo + line, file=sys.stderr, flush=True)
+
+    returncode = jobproc.wait()
+    jobread.join()
+    jobrec['exitcode'] = returncode
+    jobrec['status'  ] = job_status(jobstat['failjob'], jobrec['killjob'], jobstat['segmjob'], returncode)
+    jobrec['message' ] = '\n'.join(jobstat['errors'])
+    jobrec['end'     ] = batch_time()
+
+
+def batch_main(argv=None):
+    """OPMRUN Headless Batch Runner Main Function
+
+    Loads an OPMRUN queue file and runs the jobs without the GUI, either one at a time, or concurrently packed so that
+    the running jobs never require more CPUs than requested. Progress messages are written to standard error and the
+    JSON summary of the jobs to standard output, or the requested summary file. The function returns zero if all the
+    jobs completed, otherwise one.
+
+    Parameters
+    ----------
+    argv : list
+        Command line arguments, if None then the program arguments are used
+
+    Returns
+    -------
+    exitcode : int
+        Zero if all the jobs completed, otherwise one
+    """
+
+    parser = argparse.ArgumentParser(prog='opmrun-batch',
+                                     description='Run an OPMRUN queue file without the OPMRUN GUI.')
+    parser.add_argument('queue', help='OPMRUN queue file (*.que)')
+    parser.add_argument('--nosim', action='store_true', help='Run the jobs in no simulation (dry run) mode')
+    parser.add_argument('--concurrent', action='store_true',
+                        help='Run the jobs concurrently packed by the number of CPUs required by each job')
+    parser.add_argument('--cpus', type=int, default=psutil.cpu_count(),
+                        help='Number of CPUs available for concurrent jobs (default: %(default)s)')
+    parser.add_argument('--quiet', action='store_true', help='Do not echo the OPM Flow output')
+    parser.add_argument('--summary', default='-',
+                        help='JSON summary file name, or "-" for standard output (default: %(default)s)')
+    parser.add_argument('--database', default=str(Path.home() / 'OPM' / 'OPMRUN.db'),
+                        help='Job state database file name (default: %(default)s)')
+    parser.add_argument('--resume', action='store_true',
+                        help='Resume the queue by skipping jobs already completed according to the job state database')
+    args = parser.parse_args(argv)
+
+    if not Path(args.queue).is_file():
+        parser.error('Cannot find queue file ' + str(args.queue))
+    joblist = queue_read(args.queue)
+    jobmode = 'nosim' if args.nosim else 'run'
+    jobfile = str(Path(args.queue).absolute())
+    Path(args.database).parent.mkdir(parents=True, exist_ok=True)
+    jobdb   = jobdb_open(args.database)
+    jobext  = job_extensions(sys.platform.startswith('win'))
+    jobrecs = []
+    for n, cmd in enumerate(joblist):
+        (job, jobcmd, jobpath, jobbase, jobroot, joblog) = flow_job(cmd)
+        jobrecs.append({'job': n + 1, 'command': cmd, 'cpus': job_cpus(cmd), 'status': 'Pending', 'exitcode': None,
+                        'pid': None, 'start': None, 'end': None, 'log': str(Path(jobpath) / joblog), 'message': '',
+                        'killjob': False})
+    batch_print('Queue ' + str(args.queue) + ' Loaded with ' + str(len(jobrecs)) + ' Jobs')
+    #
+    # Resume Queue by Skipping Completed Jobs
+    #
+    if args.resume:
+        jobdone = jobdb_completed(jobdb, joblist, jobmode)
+        for jobrec in jobrecs:
+            if jobrec['command'] in jobdone:
+                jobrec['status'] = 'Skipped'
+        batch_print('Resume Queue Skipping ' + str(len(jobdone)) + ' Completed Jobs')
+    #
+    # Terminate Signals are Processed as a Keyboard Interrupt to Kill the Running Jobs
+    #
+    def batch_signal(signum, frame):
+        raise KeyboardInterrupt
+
+    signal.signal(signal.SIGTERM, batch_signal)
+
+    pending = [jobrec for jobrec in jobrecs if jobrec['status'] == 'Pending']
+    running = []
+    try:
+        while pending or running:
+            if args.concurrent:
+                jobs = job_pack([jobrec['cpus'] for jobrec in pending], sum(job[0]['cpus'] for job in running),
+                                args.cpus)
+            elif not running and pending:
+                jobs = [0]
+            else:
+                jobs = []
+
+            for jobrec in [pending.pop(n) for n in sorted(jobs, reverse=True)][::-1]:
+                if args.quiet:
+                    echo = None
+                elif args.concurrent:
+                    echo = '[' + str(jobrec['job']) + '] '
+                else:
+                    echo = ''
+                jobrec['status'] = 'Running'
+                jobrec['jobid' ] = jobdb_start(jobdb, jobfile, jobrec['command'], jobmode, jobrec['log'])
+                batch_print('Start Job No. ' + str(jobrec['job']) + ' of ' + str(len(jobrecs)) + ': ' +
+                            jobrec['command'])
+                jobthrd = threading.Thread(target=batch_job, args=(jobrec, args.nosim, jobext, echo), daemon=True)
+                jobthrd.start()
+                running.append((jobrec, jobthrd))
+
+            time.sleep(0.25)
+            for job in list(running):
+                if not job[1].is_alive():
+                    running.remove(job)
+                    jobdb_end(jobdb, job[0]['jobid'], job[0]['status'], job[0]['exitcode'])
+                    batch_print('End   Job No. ' + str(job[0]['job']) + ': ' + job[0]['status'] + ' ' +
+                                job[0]['message'])
+
+    except KeyboardInterrupt:
+        batch_print('Job Queue Killed by User')
+        for jobrec, jobthrd in running:
+            jobrec['killjob'] = True
+            if jobrec['pid'] is not None:
+                batch_print('Killed Job No. ' + str(jobrec['job']) + ': ' + str(job_kill(jobrec['pid'])))
+        for jobrec, jobthrd in running:
+            jobthrd.join()
+            jobdb_end(jobdb, jobrec['jobid'], jobrec['status'], jobrec['exitcode'])
+        for jobrec in pending:
+            jobrec['status'] = 'Cancelled'
+    jobdb.close()
+    #
+    # Write Summary
+    #
+    summary = {'queue'     : jobfile,
+               'mode'      : jobmode,
+               'jobs'      : [{key: value for key, value in jobrec.items() if key not in ['jobid', 'killjob']}
+                              for jobrec in jobrecs],
+               'statistics': {status: sum(jobrec['status'] == status for jobrec in jobrecs)
+                              for status in ['Completed', 'Skipped', 'Failed', 'Killed', 'Segmentation', 'Aborted',
+                                             'Cancelled']}}
+    if args.summary == '-':
+        json.dump(summary, sys.stdout, indent=2)
+        sys.stdout.write('\n')
+    else:
+        with open(args.summary, 'w') as file:
+            json.dump(summary, file, indent=2)
+        batch_print('Summary Written to ' + str(args.summary))
+
+    if all(jobrec['status'] in ['Completed', 'Skipped'] for jobrec in jobrecs):
+        return 0
+    return 1
+
+
+def batch_print(text):
+    """Print Batch Progress Message
+
+    Prints a time stamped progress message to standard error, so that standard output only contains the summary.
+
+    Parameters
+    ----------
+    text : str
+        Message to be printed
+
+    Returns
+    -------
+    None
+    """
+
+    print(batch_time() + ': ' + text, file=sys.stderr, flush=True)
+
+
+def batch_time():
+    """Gets the Current Time and Date in ISO 8601 Format
+
+    Parameters
+    ----------
+
+
+    Returns
+    -------
+    time : str
+        The current date and time in ISO 8601 format to the nearest second
+    """
+
+    return datetime.datetime.now().isoformat(sep=' ', timespec='seconds')
+
+# ----------------------------------------------------------------------------------------------------------------------
+# Execute Module
+# ----------------------------------------------------------------------------------------------------------------------
+if __name__ == '__main__':
+    sys.exit(batch_main())
+
+# ======================================================================================================================
+# End of OPM_BATCH.PY
+# ======================================================================================================================
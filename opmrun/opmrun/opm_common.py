@@ -14,6 +14,7 @@ Program Documentation
 ---------------------
 Only Python 3 is supported and tested Python2 support has been depreciated.
 
+2026.10.18 - Moved the process kill and remove ANSI escape code routines to OPM_QUEUE.
 2025.09.19 - Switch from PySimpleGUI to FreeSimpleGUI package
 2021.07.01 - Minor re-factoring and additional routines moved from other modules to here.
 2020.04.04 - Refactored code to be more compact as import checks are done in the main routine.
@@ -53,10 +54,11 @@ import subprocess
 import tkinter as tk
 from pathlib import Path, PureWindowsPath
 import pandas as pd
-import psutil
 
 import FreeSimpleGUI as sg
 
+from opmrun.opm_queue import job_kill, remove_ansii_escape_codes
+
 # ----------------------------------------------------------------------------------------------------------------------
 # Define Modules Section
 # ----------------------------------------------------------------------------------------------------------------------
@@ -271,18 +273,8 @@ def kill_job(mesg, pid):
         killjob = 'Yes'
 
     if killjob == 'Yes':
-        kill = True
-        try:
-            process = psutil.Process(pid)
-            for proc in process.children(recursive=True):
-                killed.append(proc.pid)
-                proc.kill()
-
-            killed.append(process.pid)
-            process.kill()
-
-        except psutil.Error:
-            pass
+        kill   = True
+        killed = job_kill(pid)
 
     return kill, killed
 
@@ -475,29 +467,6 @@ def print_dict(dict_name, dict_var, option='debug'):
     return
 
 
-def remove_ansii_escape_codes(linein):
-    """Remove ASCII Escape Codes
-
-    Removes ascii escape code sequence from a string, based on  Martijn Pieters's answer with Jeff's regexp and
-    Édouard Lopez answer on stack overflow
-    https://stackoverflow.com/questions/14693701/how-can-i-remove-the-ansi-escape-sequences-from-a-string-in-python
-
-    Parameters
-    ----------
-    linein : str
-        String to have the ascii escape sequences removed.
-
-    Returns
-    -------
-    lineout : str
-        Returns line without the ascii escape codes
-    """
-
-    ansi_escape = re.compile(r'(?:\x1B[@-_]|[\x80-\x9F])[0-?]*[ -/]*[@-~]')
-    lineout     = ansi_escape.sub('', linein)
-    return lineout
-
-
 def remove_tree(root):
     """Remove a Directory and All Files Recursively
 
@@ -3,12 +3,19 @@
 """OPM_COMPRESS.py - Compression Utility
 
 This module contains the compress.pt and uncompress.py functions to compress/uncompress simulation cases input and
-output files into a casename.zip file.
+output files into a casename.zip file. Compression is performed in process by the OPM_ARCHIVE engine, with the archives
+compressed at the same time on a process pool, and uncompression can extract selected files only.
 
 Program Documentation
 ---------------------
 Only Python 3 is supported and tested Python2 support has been depreciated.
 
+2026.10.18 - Added the option to archive ensemble directories in a shared chunk store that stores identical files, for
+             example include files, only once across the ensemble.
+2026.10.18 - Uncompression moved from the unzip command to the OPM_ARCHIVE engine run on a process pool, with the
+             option to only extract selected files, for example the summary files.
+2026.10.18 - Compression moved from the zip command to the in process OPM_ARCHIVE engine run on a process pool, with
+             deflate or Zstandard levels, storing of already compressed files, and bytes and throughput per archive.
 2025.09.19 - Switch from PySimpleGUI to FreeSimpleGUI package
 2022.04.01 - Add compression option to add Ensemble directories recursively and updated help information.
 2022.04.01 - Add compression/uncompression option to add files recursively and also added help information.
@@ -44,9 +51,14 @@ Date    : 14-Jul-2021
 # ----------------------------------------------------------------------------------------------------------------------
 # Import Modules Section
 # ----------------------------------------------------------------------------------------------------------------------
+import os
+
 import FreeSimpleGUI as sg
 from pathlib import Path
+from psutil import cpu_count
 
+from opmrun.opm_archive import (archive_compress, archive_files, archive_methods, archive_pool, archive_store,
+                                archive_uncompress)
 from opmrun.opm_common import (change_directory, copy_to_clipboard, opm_popup, run_command)
 
 # ----------------------------------------------------------------------------------------------------------------------
@@ -123,8 +135,8 @@ def compress_files(opmoptn):
     """Compress All Jobs Input and Output into a Zip File Using the Base Name
 
     The function allows the use to select a group of DATA files for compression of all files associated with the case
-    name (*.DATA), using the standard zip utility on Linux systems. In addition, files can be added recursively by
-    selecting the "top" directory.
+    name (*.DATA), using the OPM_ARCHIVE engine to compress the cases at the same time on a process pool. In addition,
+    files can be added recursively by selecting the "top" directory.
 
     Parameters
     ----------
@@ -136,10 +148,6 @@ def compress_files(opmoptn):
     None
     """
 
-    if sg.running_windows():
-        wsl = 'wsl '
-    else:
-        wsl = ''
     joblist1 = []
 
     outlog   = '_outlog1_'+sg.WRITE_ONLY_KEY
@@ -152,6 +160,14 @@ def compress_files(opmoptn):
                 [sg.Text('Compression Options'                                                    )],
                 [sg.Radio('Compress Job' , "bRadio", default=True                                 )],
                 [sg.Radio('Compress Job and then Remove Job Files', "bRadio"                      )],
+                [sg.Text('Method'), sg.Combo(archive_methods(), default_value='deflate', key='_method_',
+                                             readonly=True, size=(8, 1)),
+                 sg.Text('Level'), sg.Spin(list(range(0, 23)), initial_value=6, key='_level_', size=(3, 1)),
+                 sg.Text('Processes'), sg.Spin(list(range(1, cpu_count() + 1)), initial_value=cpu_count(),
+                                               key='_workers_', size=(4, 1)),
+                 sg.Checkbox('Store Already Compressed Files', default=True, key='_skip_'                 )],
+                [sg.Checkbox('Archive Ensembles in a Shared Chunk Store (Identical Files Stored Once)', default=False,
+                             key='_store_', tooltip='Chunk Store OPMRUN-STORE is Created in the Ensemble Directory')],
                 [sg.Button('Add'), sg.Button('Add Recursively', tooltip='Add *.DATA Files Recursively'),
                  sg.Button('Add Ensembles', tooltip='Add Ensemble Directories Recursively'),
                  sg.Button('Clear', tooltip='Clear Output'),
@@ -159,10 +175,9 @@ def compress_files(opmoptn):
                  sg.Button('Remove', tooltip='Remove Data Files'), sg.Submit(), sg.Button('Help'), sg.Exit()]]
     window1 = sg.Window('Compress Job Files', layout=layout1, finalize=True)
     #
-    #   Set Output Multiline Window for CPRINT and Check If ZIP Package is Available
+    #   Set Output Multiline Window for CPRINT
     #
     sg.cprint_set_output_destination(window1, outlog)
-    compress_chk('zip', window1)
     #
     #   Define GUI Event Loop, Read Buttons, and Make Callbacks etc. Section
     #
@@ -214,7 +229,7 @@ def compress_files(opmoptn):
             jobdir = sg.popup_get_folder('Select Main Ensemble Directory for Directory Compression Recursively',
                                          default_path=str(Path().absolute()), initial_folder=Path().absolute())
             jobs   = [job for job in Path(jobdir).glob('**/')]
-            jobs   = jobs[1:]
+            jobs   = [job for job in jobs[1:] if 'OPMRUN-STORE' not in job.parts]
             if len(jobs) == 0:
                 sg.popup_ok('No Ensemble Directories Found', title='OPMRUN Add Ensembles',
                             no_titlebar=False, grab_anywhere=False, keep_on_top=True)
@@ -283,32 +298,31 @@ def compress_files(opmoptn):
         # Compress Files
         #
         if event == 'Submit':
-            if jobopt:
-                zipcmd = 'zip -uv '
-            else:
-                zipcmd = 'zip -mv '
+            jobargs = {'method': values['_method_'], 'level': int(values['_level_']), 'skip': values['_skip_'],
+                       'move': not jobopt}
+            jobs    = []
+            jobdirs = [Path(cmd).parent for cmd in joblist1 if not Path(cmd).is_file()]
+            if values['_store_'] and jobdirs:
+                jobstore  = Path(os.path.commonpath(jobdirs)) / 'OPMRUN-STORE'
+                storeargs = {'store': jobstore, 'level': min(int(values['_level_']), 9), 'move': not jobopt}
+                sg.cprint('\nEnsemble Chunk Store ' + str(jobstore))
 
-            jobnum = -1
             for cmd in joblist1:
-                jobnum = jobnum + 1
-                window1['_joblist1_'].update(set_to_index=jobnum, scroll_to_index=jobnum)
-                sg.cprint('\nStart Compression')
                 (job, jobcmd, jobpath, jobbase, jobroot, jobfile, jobzip) = compress_cmd(cmd)
                 #
                 # File or Ensemble Compression
                 #
                 if Path(cmd).is_file():
-                    error  = change_directory(jobpath, popup=True, outprt=True)
-                    jobcmd = wsl + zipcmd + str(jobzip) + ' ' + str(jobfile)
+                    jobs.append(((Path(jobpath) / jobzip, archive_files(jobpath, jobroot)), jobargs))
+                elif values['_store_']:
+                    jobs.append(((Path(jobcmd) / jobzip, archive_files(jobcmd)), storeargs))
                 else:
-                    error  = change_directory(jobcmd, popup=True, outprt=True)
-                    jobcmd = wsl + zipcmd + str(jobzip) + ' ' + '*.*'
-                if not error:
-                    sg.cprint('   ' + jobcmd)
-                    run_command(jobcmd, timeout=None, window=window1)
-                    sg.cprint('End Compression')
-                    window1.refresh()
+                    jobs.append(((Path(jobcmd) / jobzip, archive_files(jobcmd)), jobargs))
 
+            sg.cprint('\nStart Compression of ' + str(len(jobs)) + ' Archives Using ' + str(values['_workers_']) +
+                      ' Processes')
+            compress_results(archive_pool(jobs, compress_job, int(values['_workers_'])), window1)
+            sg.cprint('End Compression')
             window1['_joblist1_'].update(joblist1)
             continue
 
@@ -346,7 +360,8 @@ def compress_help(opmoptn):
                 '                  within and below will be selected. All files within a \n' +
                 '                  a directory will be compressed into one zip file. Use the \n' +
                 '                  Add Recursively uncompression (*.ZIP) option to unzip the \n' +
-                '                  files.\n' +
+                '                  files. Optionally the ensemble directories can be archived\n' +
+                '                  in a shared chunk store, see below.\n' +
                 'Clear           - Clears the Output window.\n' +
                 'List            - Allows one to select a directory and display all the *.DATA\n' +
                 '                  or *.ZIP files.\n' +
@@ -355,20 +370,98 @@ def compress_help(opmoptn):
                 'Exit            - Exit the utility.\n' +
                 '\n' +
                 'For the compression option one also has the option to remove the files once they have been ' +
-                'compressed in order to save space.\n\n' +
+                'compressed in order to save space. The compression method (deflate, or zstd with Python 3.14 and ' +
+                'later), the compression level, and the number of processes used to compress the archives at the ' +
+                'same time can also be selected, as well as storing already compressed files without compressing ' +
+                'them again.\n\n' +
+                'The shared chunk store option for ensembles splits the files in each ensemble directory into ' +
+                'chunks that are stored once, under the hash of their content, in the OPMRUN-STORE directory of the ' +
+                'main ensemble directory. Files that are the same in all the ensemble members, for example grid, ' +
+                'PVT and relative permeability include files, are therefore only stored once. Each ensemble zip ' +
+                'file then contains a list of its files and chunks, and is uncompressed from the chunk store by the ' +
+                'uncompress utility in the normal way, independently of the other ensemble zip files. The ' +
+                'OPMRUN-STORE directory must therefore be kept with the ensemble zip files.\n\n' +
                 'The uncompressing options include being able or not able to over write existing files, as well as ' +
                 'the option to remove the zip files or to keep the zip files once all the files have been ' +
-                'uncompressed. \n\n' +
+                'uncompressed. All the files can be extracted, or only selected files, for example just the summary ' +
+                'files or the input files needed to re-run a case, or the files matching the Selected Files ' +
+                'patterns. The zip files are only deleted if all the files have been extracted.\n\n' +
                 'See the OPM Flow manual for further information. \n')
 
     opm_popup('Compression Utility Help', helptext, 25, font= (opmoptn['output-font'],opmoptn['output-font-size']))
 
 
+def compress_job(jobzip, files, **kwargs):
+    """Compress a Job into a Standard or Chunk Store Archive
+
+    Runs archive_store for jobs with a chunk store, otherwise archive_compress, so that both types of archive can be
+    compressed on the same process pool.
+
+    Parameters
+    ----------
+    jobzip : str
+        ZIP archive file name
+    files : list
+        Files to be archived
+    kwargs : dict
+        Keyword arguments for archive_store if 'store' is given, otherwise for archive_compress
+
+    Returns
+    -------
+    result : dict
+        Archive job result
+    """
+
+    if 'store' in kwargs:
+        return archive_store(jobzip, files, **kwargs)
+    return archive_compress(jobzip, files, **kwargs)
+
+
+def compress_results(results, window):
+    """Display the Compress and Uncompress Results
+
+    Displays the result of each archive job as it is completed, followed by the totals for all the jobs, refreshing the
+    window while waiting for the jobs to be completed.
+
+    Parameters
+    ----------
+    results : generator
+        Archive job results from archive_pool
+    window : FreeSimpleGUI window
+        The FreeSimpleGUI window that the output is going to (needed to do refresh on)
+
+    Returns
+    ------
+    None
+    """
+
+    total = {'archives': 0, 'files': 0, 'bytes_in': 0, 'bytes_out': 0, 'seconds': 0.0}
+    for result in results:
+        if result is not None:
+            if result['error']:
+                sg.cprint('   ' + result['archive'] + ' Failed: ' + result['error'], text_color='red')
+            else:
+                sg.cprint('   {}: {} files, {:,} bytes to {:,} bytes, {:.1f} s, {:.1f} MB/s'.format(
+                          result['archive'], result['files'], result['bytes_in'], result['bytes_out'],
+                          result['seconds'], result['throughput']) +
+                          (', {} existing files kept'.format(result['skipped']) if result.get('skipped') else '') +
+                          (', {} of {} chunks new'.format(result['stored'], result['chunks']) if 'chunks' in result
+                           else ''))
+                total['archives'] = total['archives'] + 1
+                for key in ['files', 'bytes_in', 'bytes_out', 'seconds']:
+                    total[key] = total[key] + result[key]
+        window.refresh()
+
+    sg.cprint('   Total: {} archives, {} files, {:,} bytes to {:,} bytes, {:.1f} s processing time'.format(
+              total['archives'], total['files'], total['bytes_in'], total['bytes_out'], total['seconds']))
+
+
 def uncompress_files(opmoptn):
     """Uncompress All Jobs that Have Been Compressed in a Zip File Using the Base Name
 
      The function allows the use to select a group of ZIP files for unzipping of all files associated with the case
-     name (*.DATA), using the standard unzip utility on Linux systems
+     name (*.DATA), using the OPM_ARCHIVE engine to uncompress the archives at the same time on a process pool. Either
+     all the files or selected files can be extracted, for example just the summary files to load the results.
 
      Parameters
      ----------
@@ -380,11 +473,13 @@ def uncompress_files(opmoptn):
      None
      """
 
-    if sg.running_windows():
-        wsl = 'wsl '
-    else:
-        wsl = ''
     joblist1 = []
+    members  = {'All Files'                      : None,
+                'Summary Files (SMSPEC, UNSMRY)' : ['*.SMSPEC', '*.UNSMRY'],
+                'Input Files (DATA, param)'      : ['*.DATA', '*.param'],
+                'Input and Summary Files'        : ['*.DATA', '*.param', '*.SMSPEC', '*.UNSMRY'],
+                'Print and Log Files (PRT, LOG)' : ['*.PRT', '*.LOG', '*.DBG'],
+                'Selected Files'                 : []}
 
     outlog   = '_outlog1_'+sg.WRITE_ONLY_KEY
     layout1  = [[sg.Text('Select Multiple Archive Files to Uncompress')],
@@ -398,16 +493,21 @@ def uncompress_files(opmoptn):
                  sg.Radio('Keep Compressed File After Uncompressing', "bRadio2", default=True, key='_bRadio2_')],
                 [sg.Radio('Uncompress and Overwrite Existing Files', "bRadio1", size=(40,1)),
                  sg.Radio('Delete Compressed File After Uncompressing', "bRadio2")],
+                [sg.Text('Extract'), sg.Combo(list(members), default_value='All Files', key='_members_',
+                                              readonly=True, size=(30, 1)),
+                 sg.Text('Selected Files'), sg.Input('', key='_selected_', size=(30, 1),
+                                                     tooltip='Space Separated File Patterns, e.g. *.SMSPEC *.UNSMRY'),
+                 sg.Text('Processes'), sg.Spin(list(range(1, cpu_count() + 1)), initial_value=cpu_count(),
+                                               key='_workers_', size=(4, 1))],
                 [sg.Button('Add'), sg.Button('Add Recursively'), sg.Button('Clear',  tooltip='Clear Output'),
                  sg.Button('Copy', tooltip='Copy Output to Clipboard'), sg.Button('List'),
                  sg.Button('Remove', tooltip='Remove Zip Files'), sg.Submit(), sg.Button('Help'),
                  sg.Exit()]]
     window1 = sg.Window('Uncompress Job Files', layout=layout1, finalize=True)
     #
-    #   Set Output Multiline Window for CPRINT and Check If ZIP Package is Available
+    #   Set Output Multiline Window for CPRINT
     #
     sg.cprint_set_output_destination(window1, outlog)
-    compress_chk('unzip', window1)
     #
     #   Define GUI Event Loop, Read Buttons, and Make Callbacks etc. Section
     #
@@ -505,31 +605,26 @@ def uncompress_files(opmoptn):
         # Uncompress Files
         #
         if event == 'Submit':
-            if values['_bRadio1_']:
-                zipcmd = 'unzip -u -n '
-            else:
-                zipcmd = 'unzip -u -o '
-
-            jobnum = -1
+            jobsel = members[values['_members_']]
+            if jobsel is not None and not jobsel:
+                jobsel = values['_selected_'].split()
+                if not jobsel:
+                    sg.popup_ok('No Selected Files Patterns Entered', title='OPMRUN Uncompress',
+                                no_titlebar=False, grab_anywhere=False, keep_on_top=True)
+                    continue
+
+            jobargs = {'members': jobsel, 'overwrite': not values['_bRadio1_'], 'move': not values['_bRadio2_']}
+            jobs    = []
             for cmd in joblist1:
-                jobnum = jobnum + 1
-                window1['_joblist1_'].update(set_to_index=jobnum , scroll_to_index=jobnum)
-                sg.cprint('Start Uncompression')
                 (job, jobcmd, jobpath, jobbase, jobroot, jobfile, jobzip) = compress_cmd(cmd)
-
-                error = change_directory(jobpath, popup=True, outprt=True)
-                if not error:
-                    jobcmd = wsl + zipcmd + str(jobzip)
-                    sg.cprint('   ' + jobcmd)
-                    sg.cprint(str(jobpath))
-                    run_command(jobcmd, timeout=None, window=window1)
-                    if not values['_bRadio2_']:
-                        jobcmd = wsl + 'rm -v ' + str(jobzip)
-                        sg.cprint('   ' + jobcmd)
-                    run_command(jobcmd, timeout=None, window=window1)
-                    sg.cprint('End Uncompressing')
-                    window1.refresh()
-
+                jobs.append(((Path(jobpath) / jobzip,), jobargs))
+
+            sg.cprint('\nStart Uncompression of ' + str(len(jobs)) + ' Archives Using ' + str(values['_workers_']) +
+                      ' Processes')
+            if jobsel is not None:
+                sg.cprint('   Extracting ' + ' '.join(jobsel))
+            compress_results(archive_pool(jobs, archive_uncompress, int(values['_workers_'])), window1)
+            sg.cprint('End Uncompressing')
             window1['_joblist1_'].update(joblist1)
             continue
 
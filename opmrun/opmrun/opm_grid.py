@@ -0,0 +1,555 @@
+# ======================================================================================================================
+#
+"""OPM_GRID.py - Corner Point Grid and Well Trajectory Intersection Engine
+
+This module reads OPM Flow corner point grids, from either a GRDECL grid include file (SPECGRID or DIMENS, COORD, ZCORN
+and ACTNUM keywords) or a binary EGRID file, and intersects well trajectories with the grid to generate the well
+connections, that is the I, J and K of each cell penetrated by the well together with the entry and exit measured
+depths and the length of the trajectory in the cell. The connections are used by the well specification utility to
+write the COMPDAT keyword directly from the well trajectories, without having to export the completions from an
+interactive OPM ResInsight session.
+
+A spatial index is built over the bounding boxes of the active cells, by assigning each cell to the bins of a uniform
+bin grid that its bounding box overlaps, so that each trajectory segment is only tested against the cells in the bins
+that it passes through. The cell faces are split into triangles, with the same diagonals for the shared faces of
+neighbouring cells, and the trajectory segments are intersected with the triangles to find the points where the
+trajectory crosses a cell face. The cell containing each part of the trajectory between the crossing points is then
+found with a ray crossing (parity) test. The routines do not depend on the GUI.
+
+The grid coordinates are used as is, that is any MAPAXES transformation is not applied, and the well trajectories
+should be in the same coordinate system and units as the grid, with the depths positive downwards.
+
+Program Documentation
+---------------------
+Only Python 3 is supported and tested Python2 support has been depreciated.
+
+2026.10.18 - New module initial release.
+
+Copyright Notice
+----------------
+This file is part of the Open Porous Media project (OPM).
+
+OPM is free software: you can redistribute it and/or modify it under the terms of the GNU General Public License as
+published by the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+
+OPM is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the aforementioned GNU General Public Licenses for more
+details.
+
+Copyright (C) 2022-2026 OPM-OP AS
+
+Author  : David Baxendale et al
+          info@opm-op.com
+Version : 2026.10.18
+Date    : 18-Oct-2026
+"""
+# ----------------------------------------------------------------------------------------------------------------------
+# 3456789012345678901234567890123456789012345678901234567890123456789012345678901234567890123456789012345678901234567890
+#        1         2         3         4         5         6         7         8         9         0         1         2
+#        0         0         0         0         0         0         0         0         0         1         1         1
+# ----------------------------------------------------------------------------------------------------------------------
+#
+# ----------------------------------------------------------------------------------------------------------------------
+# Import Modules Section
+# ----------------------------------------------------------------------------------------------------------------------
+import re
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# ----------------------------------------------------------------------------------------------------------------------
+# Define Modules Section
+# ----------------------------------------------------------------------------------------------------------------------
+def grid_bins(index, lower, upper):
+    """Get the Index Bins Overlapped by Bounding Boxes
+
+    Parameters
+    ----------
+    index : dict
+        Spatial index from grid_index, only the bin grid origin, size and number of bins are used
+    lower : array
+        Minimum X, Y and Z of each bounding box
+    upper : array
+        Maximum X, Y and Z of each bounding box
+
+    Returns
+    -------
+    keys : array
+        Bin number of each bin overlapped by the bounding boxes
+    entry : array
+        The bounding box of each bin number
+    """
+
+    bins  = index['bins']
+    first = np.clip(np.floor((lower - index['origin']) / index['size']), 0, bins - 1).astype(np.int64)
+    last  = np.clip(np.floor((upper - index['origin']) / index['size']), 0, bins - 1).astype(np.int64)
+    span  = last - first + 1
+    count = span.prod(axis=1)
+    entry = np.repeat(np.arange(len(count)), count)
+    local = np.arange(count.sum()) - np.repeat(np.cumsum(count) - count, count)
+    span  = span[entry]
+    bx    = first[entry, 0] + local % span[:, 0]
+    by    = first[entry, 1] + local // span[:, 0] % span[:, 1]
+    bz    = first[entry, 2] + local // (span[:, 0] * span[:, 1])
+    return ((bz * bins[1] + by) * bins[0] + bx, entry)
+
+
+def grid_bounds(grid):
+    """Calculate the Bounding Box of Every Cell in a Grid
+
+    The bounding boxes are calculated one layer at a time, so that the corners of all the cells in the grid are not
+    held in memory at the same time.
+
+    Parameters
+    ----------
+    grid : dict
+        Corner point grid from grid_read
+
+    Returns
+    -------
+    lower : array
+        Minimum X, Y and Z of each cell in natural (I fastest) order
+    upper : array
+        Maximum X, Y and Z of each cell in natural (I fastest) order
+    """
+
+    nx, ny, nz = grid['dims']
+    lower = np.empty((nx * ny * nz, 3))
+    upper = np.empty((nx * ny * nz, 3))
+    for k in range(nz):
+        cells   = np.arange(k * nx * ny, (k + 1) * nx * ny)
+        corners = grid_corners(grid, cells)
+        lower[cells] = corners.min(axis=1)
+        upper[cells] = corners.max(axis=1)
+    return (lower, upper)
+
+
+def grid_connections(grid, index, traj, well='', chunk=20000):
+    """Intersect a Well Trajectory with a Grid and Get the Well Connections
+
+    Splits the trajectory into segments no longer than the index bin size, finds the cell faces crossed by each segment
+    using the spatial index, and gets the cell containing the mid-point of each part of the trajectory between the
+    crossing points. Consecutive parts of the trajectory in the same cell are merged into a single connection, and parts
+    of the trajectory outside the grid or in inactive cells do not have a connection.
+
+    Parameters
+    ----------
+    grid : dict
+        Corner point grid from grid_read
+    index : dict
+        Spatial index from grid_index
+    traj : array
+        Trajectory X, Y, TVDSS and MD columns, with the TVDSS positive downwards
+    well : str
+        Well name
+    chunk : int
+        Maximum number of segment and cell pairs intersected at the same time
+
+    Returns
+    -------
+    conn : df
+        Dataframe with the well name, I, J, K (one based), entry and exit measured depths, length and penetration
+        direction ('X', 'Y' or 'Z') of each connection in measured depth order
+    """
+
+    columns = ['wname', 'i', 'j', 'k', 'mdin', 'mdout', 'length', 'pen']
+    traj    = np.asarray(traj, dtype=float)
+    traj    = traj[np.r_[True, np.diff(traj[:, 3]) > 0]]
+    if len(traj) < 2:
+        return (pd.DataFrame(columns=columns))
+    #
+    # Split the Trajectory into Segments No Longer than the Bin Size
+    #
+    xyz, md = traj[:, :3], traj[:, 3]
+    nsub    = np.maximum(np.ceil((np.abs(np.diff(xyz, axis=0)) / index['size']).max(axis=1)), 1).astype(int)
+    seg     = np.repeat(np.arange(len(nsub)), nsub)
+    frac    = (np.arange(nsub.sum()) - np.repeat(np.cumsum(nsub) - nsub, nsub)) / np.repeat(nsub, nsub)
+    md0     = md[seg] + frac * (md[seg + 1] - md[seg])
+    md1     = md[seg] + (frac + 1.0 / np.repeat(nsub, nsub)) * (md[seg + 1] - md[seg])
+    p0      = xyz[seg] + frac[:, None] * (xyz[seg + 1] - xyz[seg])
+    p1      = xyz[seg] + (frac + 1.0 / np.repeat(nsub, nsub))[:, None] * (xyz[seg + 1] - xyz[seg])
+    #
+    # Find the Measured Depths Where the Trajectory Crosses the Cell Faces
+    #
+    query, cells = grid_query(index, np.minimum(p0, p1), np.maximum(p0, p1))
+    breaks = [md[:1], md[-1:]]
+    for n in range(0, len(query), chunk):
+        q, c  = query[n:n + chunk], cells[n:n + chunk]
+        hits  = grid_hits(p0[q], p1[q] - p0[q], grid_triangles(grid_corners(grid, c)), segment=True)
+        found = ~np.isnan(hits)
+        breaks.append((md0[q][:, None] + hits * (md1[q] - md0[q])[:, None])[found])
+
+    breaks = np.sort(np.concatenate(breaks))
+    breaks = breaks[np.r_[True, np.diff(breaks) > 1.0e-6]]
+    #
+    # Find the Cell Containing the Mid-Point of Each Part of the Trajectory Between the Crossing Points
+    #
+    mids  = (breaks[:-1] + breaks[1:]) / 2.0
+    point = np.column_stack([np.interp(mids, md, xyz[:, n]) for n in range(3)])
+    cell  = np.full(len(mids), -1)
+    query, cells = grid_query(index, point, point)
+    for n in range(0, len(query), chunk):
+        q, c   = query[n:n + chunk], cells[n:n + chunk]
+        inside = grid_inside(point[q], grid_corners(grid, c)) & (cell[q] < 0)
+        cell[q[inside]] = c[inside]
+    #
+    # Merge Consecutive Parts of the Trajectory in the Same Cell into Connections
+    #
+    start = np.flatnonzero(np.r_[True, cell[1:] != cell[:-1]])
+    end   = np.r_[start[1:], len(cell)] - 1
+    keep  = cell[start] >= 0
+    start, end, cell = start[keep], end[keep], cell[start[keep]]
+    mdin, mdout = breaks[start], breaks[end + 1]
+    delta = np.column_stack([np.interp(mdout, md, xyz[:, n]) - np.interp(mdin, md, xyz[:, n]) for n in range(3)])
+    nx, ny, nz = grid['dims']
+    return (pd.DataFrame({'wname' : well,
+                          'i'     : cell % nx + 1,
+                          'j'     : cell // nx % ny + 1,
+                          'k'     : cell // (nx * ny) + 1,
+                          'mdin'  : mdin,
+                          'mdout' : mdout,
+                          'length': mdout - mdin,
+                          'pen'   : np.array(['X', 'Y', 'Z'])[np.abs(delta).argmax(axis=1)]}, columns=columns))
+
+
+def grid_corners(grid, cells):
+    """Calculate the Corner Coordinates of Grid Cells
+
+    The corner depths are taken from ZCORN and the X and Y coordinates are interpolated along the cell's pillars from
+    COORD. The corners are numbered in the natural order, that is corner di + 2 * dj + 4 * dk for the I, J and K
+    offsets di, dj and dk of zero or one.
+
+    Parameters
+    ----------
+    grid : dict
+        Corner point grid from grid_read
+    cells : array
+        Cell indices in natural (I fastest) order
+
+    Returns
+    -------
+    corners : array
+        The X, Y and Z coordinates of the eight corners of each cell
+    """
+
+    nx, ny, nz = grid['dims']
+    cells = np.asarray(cells)
+    i, j, k = cells % nx, cells // nx % ny, cells // (nx * ny)
+    di = np.array([0, 1, 0, 1, 0, 1, 0, 1])
+    dj = np.array([0, 0, 1, 1, 0, 0, 1, 1])
+    dk = np.array([0, 0, 0, 0, 1, 1, 1, 1])
+    z  = grid['zcorn'][2 * k[:, None] + dk, 2 * j[:, None] + dj, 2 * i[:, None] + di]
+    p  = grid['coord'][j[:, None] + dj, i[:, None] + di]
+    dz = p[..., 5] - p[..., 2]
+    f  = np.divide(z - p[..., 2], dz, out=np.zeros_like(z), where=dz != 0.0)
+    return (np.stack((p[..., 0] + f * (p[..., 3] - p[..., 0]), p[..., 1] + f * (p[..., 4] - p[..., 1]), z), axis=-1))
+
+
+def grid_hits(origin, direction, triangles, segment=False):
+    """Intersect Rays or Segments with the Triangles of Each Cell
+
+    Uses the Moller-Trumbore ray triangle intersection algorithm for all the triangles at the same time.
+
+    Parameters
+    ----------
+    origin : array
+        Origin of each ray or segment
+    direction : array
+        Direction of each ray, or the vector from the start to the end of each segment
+    triangles : array
+        The twelve triangles of each cell from grid_triangles
+    segment : boolean
+        Set to True for segments, where only intersections between the start and end of the segment are returned,
+        otherwise False for rays
+
+    Returns
+    -------
+    hits : array
+        The ray or segment parameter of the intersection with each triangle, or NaN if the triangle is not intersected
+    """
+
+    origin    = origin[:, None, :]
+    direction = direction[:, None, :]
+    vert0     = triangles[:, :, 0]
+    edge1     = triangles[:, :, 1] - vert0
+    edge2     = triangles[:, :, 2] - vert0
+    pvec      = np.cross(direction, edge2)
+    det       = np.sum(edge1 * pvec, axis=-1)
+    scale     = np.linalg.norm(edge1, axis=-1) * np.linalg.norm(edge2, axis=-1) * np.linalg.norm(direction, axis=-1)
+    valid     = np.abs(det) > 1.0e-12 * scale
+    det       = np.where(valid, det, 1.0)
+    tvec      = origin - vert0
+    u         = np.sum(tvec * pvec, axis=-1) / det
+    qvec      = np.cross(tvec, edge1)
+    v         = np.sum(direction * qvec, axis=-1) / det
+    t         = np.sum(edge2 * qvec, axis=-1) / det
+    valid     = valid & (u >= 0.0) & (v >= 0.0) & (u + v <= 1.0) & (t >= 0.0)
+    if segment:
+        valid = valid & (t <= 1.0)
+    return (np.where(valid, t, np.nan))
+
+
+def grid_index(grid):
+    """Build a Spatial Index Over the Bounding Boxes of the Active Cells
+
+    The bin size of the uniform bin grid is the median size of the active cells in each direction, and each active cell
+    is assigned to all the bins that its bounding box overlaps. The index entries are sorted by bin number, so that the
+    cells in a bin are found with a binary search. Cells with no thickness are not included in the index.
+
+    Parameters
+    ----------
+    grid : dict
+        Corner point grid from grid_read
+
+    Returns
+    -------
+    index : dict
+        Dictionary with the cell bounding boxes ('lower', 'upper'), the bin grid origin ('origin'), bin size
+        ('size') and number of bins ('bins'), and the sorted bin numbers ('keys') and cells ('cells') of the index
+        entries
+    """
+
+    lower, upper = grid_bounds(grid)
+    active = np.flatnonzero((grid['actnum'].ravel() > 0) & (upper[:, 2] > lower[:, 2]))
+    if len(active) == 0:
+        raise ValueError('Grid Has No Active Cells')
+
+    extent = upper[active].max(axis=0) - lower[active].min(axis=0)
+    size   = np.median(upper[active] - lower[active], axis=0)
+    size   = np.where(size > 0.0, size, np.maximum(extent, 1.0))
+    origin = lower[active].min(axis=0)
+    bins   = np.floor(extent / size).astype(np.int64) + 1
+    index  = {'lower': lower, 'upper': upper, 'origin': origin, 'size': size, 'bins': bins}
+    keys, entry = grid_bins(index, lower[active], upper[active])
+    order  = np.argsort(keys, kind='stable')
+    index['keys' ] = keys[order]
+    index['cells'] = active[entry[order]]
+    return (index)
+
+
+def grid_inside(points, corners):
+    """Test if Points are Inside Cells
+
+    Counts the crossings of a ray from each point with the cell's triangles, where an odd number of crossings means the
+    point is inside the cell. The ray direction is tilted from the vertical, so that the rays do not pass along the
+    pillars or through the shared diagonals of the cell faces of regular grids.
+
+    Parameters
+    ----------
+    points : array
+        X, Y and Z of each point
+    corners : array
+        The corners of the cell to be tested for each point from grid_corners
+
+    Returns
+    -------
+    inside : array
+        Boolean array set to True for the points inside their cell
+    """
+
+    ray  = np.broadcast_to(np.array([0.1234, 0.2718, 0.9545]), points.shape)
+    hits = grid_hits(points, ray, grid_triangles(corners))
+    return (np.sum(hits > 0.0, axis=1) % 2 == 1)
+
+
+def grid_query(index, lower, upper):
+    """Find the Cells Whose Bounding Boxes Overlap Query Boxes
+
+    Parameters
+    ----------
+    index : dict
+        Spatial index from grid_index
+    lower : array
+        Minimum X, Y and Z of each query box
+    upper : array
+        Maximum X, Y and Z of each query box
+
+    Returns
+    -------
+    query : array
+        Query box of each query box and cell pair
+    cells : array
+        Cell of each query box and cell pair
+    """
+
+    keys, entry = grid_bins(index, lower, upper)
+    first = np.searchsorted(index['keys'], keys, side='left')
+    count = np.searchsorted(index['keys'], keys, side='right') - first
+    query = np.repeat(entry, count)
+    cells = index['cells'][np.repeat(first, count) + np.arange(count.sum())
+                           - np.repeat(np.cumsum(count) - count, count)]
+    pairs = np.unique(query.astype(np.int64) * len(index['lower']) + cells)
+    query, cells = pairs // len(index['lower']), pairs % len(index['lower'])
+    overlap = np.all((index['lower'][cells] <= upper[query]) & (index['upper'][cells] >= lower[query]), axis=1)
+    return (query[overlap], cells[overlap])
+
+
+def grid_read(filename):
+    """Read a Corner Point Grid from a GRDECL or EGRID File
+
+    Parameters
+    ----------
+    filename : str
+        Grid file name, files with an EGRID extension are read as binary EGRID files, otherwise the file is read as a
+        GRDECL grid include file
+
+    Returns
+    -------
+    grid : dict
+        Dictionary with the grid dimensions ('dims'), the pillar coordinates ('coord') with shape (ny + 1, nx + 1, 6),
+        the corner depths ('zcorn') with shape (2 * nz, 2 * ny, 2 * nx), and the active cell flags ('actnum') with
+        shape (nz, ny, nx)
+    """
+
+    if Path(filename).suffix.upper() == '.EGRID':
+        data = grid_read_egrid(filename)
+    else:
+        data = grid_read_grdecl(filename)
+
+    nx, ny, nz = data['dims']
+    if 'COORD' not in data or 'ZCORN' not in data:
+        raise ValueError('COORD and ZCORN Keywords Not Found in ' + str(filename))
+    if data['COORD'].size != (nx + 1) * (ny + 1) * 6 or data['ZCORN'].size != 8 * nx * ny * nz:
+        raise ValueError('COORD or ZCORN Size Does Not Match the Grid Dimensions in ' + str(filename))
+
+    actnum = data.get('ACTNUM', np.ones(nx * ny * nz, dtype=int))
+    return ({'dims'  : (nx, ny, nz),
+             'coord' : np.asarray(data['COORD'], dtype=float).reshape(ny + 1, nx + 1, 6),
+             'zcorn' : np.asarray(data['ZCORN'], dtype=float).reshape(2 * nz, 2 * ny, 2 * nx),
+             'actnum': np.asarray(actnum, dtype=int).reshape(nz, ny, nx)})
+
+
+def grid_read_egrid(filename):
+    """Read the Global Grid from a Binary EGRID File
+
+    Reads the GRIDHEAD, COORD, ZCORN and ACTNUM arrays of the global grid from a big endian Fortran unformatted EGRID
+    file, stopping at the ENDGRID keyword so that local grids are not read.
+
+    Parameters
+    ----------
+    filename : str
+        EGRID file name
+
+    Returns
+    -------
+    data : dict
+        Dictionary with the grid dimensions ('dims') and the COORD, ZCORN and ACTNUM arrays
+    """
+
+    dtypes = {'INTE': '>i4', 'REAL': '>f4', 'DOUB': '>f8', 'LOGI': '>i4', 'CHAR': 'S8'}
+    buffer = Path(filename).read_bytes()
+    data   = dict()
+    pos    = 0
+    while pos < len(buffer):
+        keyword = buffer[pos + 4:pos + 12].decode('ascii', 'replace').strip()
+        count   = int(np.frombuffer(buffer, '>i4', 1, pos + 12)[0])
+        dtype   = buffer[pos + 16:pos + 20].decode('ascii', 'replace')
+        pos     = pos + 24
+        if keyword == 'ENDGRID':
+            break
+        size    = int(dtype[1:]) if dtype.startswith('C0') else np.dtype(dtypes.get(dtype, '>i4')).itemsize
+        blocks  = []
+        read    = 0
+        while read < count:
+            length = int(np.frombuffer(buffer, '>i4', 1, pos)[0])
+            if keyword in ['GRIDHEAD', 'COORD', 'ZCORN', 'ACTNUM']:
+                blocks.append(np.frombuffer(buffer, dtypes[dtype], length // size, pos + 4))
+            read = read + length // size
+            pos  = pos + length + 8
+        if blocks:
+            data[keyword] = np.concatenate(blocks)
+
+    if 'GRIDHEAD' not in data:
+        raise ValueError('GRIDHEAD Keyword Not Found in ' + str(filename))
+    data['dims'] = tuple(int(value) for value in data.pop('GRIDHEAD')[1:4])
+    return (data)
+
+
+def grid_read_grdecl(filename):
+    """Read a Corner Point Grid from a GRDECL Grid Include File
+
+    Reads the SPECGRID (or DIMENS), COORD, ZCORN and ACTNUM keywords, with comments removed and repeat counts (n*value)
+    expanded. INCLUDE keywords are not followed.
+
+    Parameters
+    ----------
+    filename : str
+        GRDECL file name
+
+    Returns
+    -------
+    data : dict
+        Dictionary with the grid dimensions ('dims') and the COORD, ZCORN and ACTNUM arrays
+    """
+
+    with open(filename, 'r') as file:
+        text = re.sub(r'--.*', '', file.read())
+
+    data = dict()
+    for match in re.finditer(r'^\s*(SPECGRID|DIMENS|COORD|ZCORN|ACTNUM)\b(.*?)/', text, re.MULTILINE | re.DOTALL):
+        keyword, body = match.group(1), match.group(2)
+        if keyword in ['SPECGRID', 'DIMENS']:
+            data['dims'] = tuple(int(value) for value in body.split()[:3])
+        elif '*' not in body:
+            data[keyword] = np.array(body.split(), dtype=float)
+        else:
+            items  = [item.split('*') if '*' in item else ['1', item] for item in body.split()]
+            data[keyword] = np.repeat(np.array([item[1] for item in items], dtype=float),
+                                      np.array([item[0] for item in items], dtype=int))
+
+    if 'dims' not in data:
+        raise ValueError('SPECGRID or DIMENS Keyword Not Found in ' + str(filename))
+    return (data)
+
+
+def grid_triangles(corners):
+    """Split the Faces of Cells into Triangles
+
+    Each of the six faces of a cell is split into two triangles, using the diagonal from the face's lowest numbered
+    corner, so that the shared faces of neighbouring cells are split along the same diagonal.
+
+    Parameters
+    ----------
+    corners : array
+        The corners of each cell from grid_corners
+
+    Returns
+    -------
+    triangles : array
+        The three corners of each of the twelve triangles of each cell
+    """
+
+    faces = np.array([[0, 1, 3, 2], [4, 5, 7, 6], [0, 2, 6, 4], [1, 3, 7, 5], [0, 1, 5, 4], [2, 3, 7, 6]])
+    split = np.concatenate((faces[:, [0, 1, 2]], faces[:, [0, 2, 3]]))
+    return (corners[:, split])
+
+
+def grid_wells(grid, trajs, index=None):
+    """Intersect Well Trajectories with a Grid and Get the Well Connections
+
+    Parameters
+    ----------
+    grid : dict
+        Corner point grid from grid_read
+    trajs : dict
+        Dictionary of well names and their trajectory X, Y, TVDSS and MD columns
+    index : dict
+        Spatial index from grid_index, None to build the index
+
+    Returns
+    -------
+    conn : df
+        Dataframe with the connections of all the wells from grid_connections, in well order
+    """
+
+    index = grid_index(grid) if index is None else index
+    conns = [grid_connections(grid, index, traj, well) for well, traj in trajs.items()]
+    conns = [conn for conn in conns if not conn.empty]
+    if not conns:
+        return (pd.DataFrame(columns=['wname', 'i', 'j', 'k', 'mdin', 'mdout', 'length', 'pen']))
+    return (pd.concat(conns, ignore_index=True))
+
+# ======================================================================================================================
+# End of OPM_GRID.PY
+# ======================================================================================================================
@@ -0,0 +1,185 @@
+# ======================================================================================================================
+#
+"""OPM_JOBDB.py - Job State Database
+
+This module records the state of the jobs run by OPMRUN in a SQLite database, by default OPMRUN.db in the user's OPM
+home directory, so that there is a record of which jobs in a queue have been completed if OPMRUN or the system stops
+part way through a queue. Each job run has a record with the queue file, command, run mode (run or nosim), start and
+end times, exit code, status and log file. The status is 'Running' until the job ends, when it is set to one of
+'Completed', 'Failed', 'Killed' or 'Segmentation', so that jobs still 'Running' in the database were interrupted. The
+"resume queue" options use the database to skip jobs whose last run with the same command and run mode completed.
+
+Program Documentation
+---------------------
+Only Python 3 is supported and tested Python2 support has been depreciated.
+
+2026.10.18 - New module initial release.
+
+Copyright Notice
+----------------
+This file is part of the Open Porous Media project (OPM).
+
+OPM is free software: you can redistribute it and/or modify it under the terms of the GNU General Public License as
+published by the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+
+OPM is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the aforementioned GNU General Public Licenses for more
+details.
+
+Copyright (C) 2022-2026 OPM-OP AS
+
+Author  : David Baxendale et al
+          info@opm-op.com
+Version : 2026.10.18
+Date    : 18-Oct-2026
+"""
+# ----------------------------------------------------------------------------------------------------------------------
+# 3456789012345678901234567890123456789012345678901234567890123456789012345678901234567890123456789012345678901234567890
+#        1         2         3         4         5         6         7         8         9         0         1         2
+#        0         0         0         0         0         0         0         0         0         1         1         1
+# ----------------------------------------------------------------------------------------------------------------------
+#
+# ----------------------------------------------------------------------------------------------------------------------
+# Import Modules Section
+# ----------------------------------------------------------------------------------------------------------------------
+import datetime
+import platform
+import sqlite3
+
+# ----------------------------------------------------------------------------------------------------------------------
+# Define Modules Section
+# ----------------------------------------------------------------------------------------------------------------------
+def jobdb_completed(jobdb, joblist, mode):
+    """Get the Jobs in a Queue that Have Been Completed
+
+    Gets the jobs in the job list whose last recorded run, with the same run mode, was completed. Jobs that failed,
+    were killed, or were still running when OPMRUN or the system stopped are not included.
+
+    Parameters
+    ----------
+    jobdb : sqlite3.Connection
+        Job state database connection
+    joblist : list
+        Job list for the queue
+    mode : str
+        Run mode, 'run' or 'nosim'
+
+    Returns
+    -------
+    jobs : set
+        The commands in the job list that have been completed
+    """
+
+    jobs = set()
+    for cmd in set(joblist):
+        row = jobdb.execute('SELECT status FROM jobs WHERE command = ? AND mode = ? ORDER BY id DESC LIMIT 1',
+                            (cmd, mode)).fetchone()
+        if row is not None and row[0] == 'Completed':
+            jobs.add(cmd)
+    return jobs
+
+
+def jobdb_end(jobdb, jobid, status, exitcode=None):
+    """Record the End of a Job
+
+    Parameters
+    ----------
+    jobdb : sqlite3.Connection
+        Job state database connection
+    jobid : int
+        Job record identifier returned by jobdb_start
+    status : str
+        Job status, one of 'Completed', 'Failed', 'Killed', 'Segmentation' or 'Aborted'
+    exitcode : int
+        Exit code of the job process, None if not available
+
+    Returns
+    -------
+    None
+    """
+
+    with jobdb:
+        jobdb.execute('UPDATE jobs SET end = ?, status = ?, exitcode = ? WHERE id = ?',
+                      (jobdb_time(), status, exitcode, jobid))
+
+
+def jobdb_open(filename):
+    """Open the Job State Database
+
+    Opens the job state database, creating the database and the jobs table if they do not exist.
+
+    Parameters
+    ----------
+    filename : str
+        Job state database file name
+
+    Returns
+    -------
+    jobdb : sqlite3.Connection
+        Job state database connection
+    """
+
+    jobdb = sqlite3.connect(str(filename), timeout=30)
+    with jobdb:
+        jobdb.execute('CREATE TABLE IF NOT EXISTS jobs ('
+                      'id INTEGER PRIMARY KEY AUTOINCREMENT, '
+                      'queue TEXT, '
+                      'command TEXT NOT NULL, '
+                      'mode TEXT NOT NULL, '
+                      'host TEXT, '
+                      'start TEXT, '
+                      'end TEXT, '
+                      'exitcode INTEGER, '
+                      'status TEXT, '
+                      'log TEXT)')
+        jobdb.execute('CREATE INDEX IF NOT EXISTS jobs_command ON jobs (command, mode)')
+    return jobdb
+
+
+def jobdb_start(jobdb, queue, command, mode, log):
+    """Record the Start of a Job
+
+    Parameters
+    ----------
+    jobdb : sqlite3.Connection
+        Job state database connection
+    queue : str
+        Queue file name, or None if the queue has not been saved
+    command : str
+        The job command from the queue
+    mode : str
+        Run mode, 'run' or 'nosim'
+    log : str
+        The job's log file name
+
+    Returns
+    -------
+    jobid : int
+        Job record identifier
+    """
+
+    with jobdb:
+        cursor = jobdb.execute('INSERT INTO jobs (queue, command, mode, host, start, status, log) '
+                               'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                               (queue, command, mode, platform.node(), jobdb_time(), 'Running', str(log)))
+    return cursor.lastrowid
+
+
+def jobdb_time():
+    """Gets the Current Time and Date in ISO 8601 Format
+
+    Parameters
+    ----------
+
+
+    Returns
+    -------
+    time : str
+        The current date and time in ISO 8601 format to the nearest second
+    """
+
+    return datetime.datetime.now().isoformat(sep=' ', timespec='seconds')
+
+# ======================================================================================================================
+# End of OPM_JOBDB.PY
+# ======================================================================================================================
@@ -11,6 +11,11 @@ Program Documentation
 --------------------
 Only Python 3 is supported and tested Python2 support has been depreciated.
 
+2026.10.18 - Daily production monthly cumulative, average and effective rate variables calculated in two grouped
+             passes, rather than a separate groupby for each variable.
+2026.10.18 - Added the option to read and process large input files by well, with the well schedules merged by date.
+2026.10.18 - WCONHIST keywords written by a direct formatter in a single pass, without formatting a dataframe for
+             each date and then re-writing the file to remove the leading blanks.
 2025.09.19 - Switch from PySimpleGUI to FreeSimpleGUI package
 2021.07.01 - New module initial release.
 
@@ -41,6 +46,9 @@ Date    : 15-Jul-2021
 # Import Modules and Start Up Section
 # -----------------------------------------------------------------------------------------------------------------------
 import datetime
+import itertools
+import shutil
+import tempfile
 from pathlib import Path
 import pandas as pd
 import numpy as np
@@ -51,7 +59,7 @@ import FreeSimpleGUI as sg
 #
 # Import OPM Common Modules
 #
-from opmrun.opm_common import file_lstrip , opm_popup, opm_header_file, opm_view, window_debug
+from opmrun.opm_common import opm_popup, opm_header_file, opm_view, window_debug
 
 # ----------------------------------------------------------------------------------------------------------------------
 # Define Modules Section
@@ -105,6 +113,69 @@ def prodsched_check(df, list, name, default, text, window):
     return (df, 1)
 
 
+def prodsched_columns(df, checks, window):
+    """Checks and Renames the Dataframe Columns
+
+    The function checks the dataframe columns with prodsched_check for each of the required variables, renaming the
+    columns found and setting the missing columns with default values.
+
+    Parameters
+    ----------
+    df : df
+       Input dataframe.
+    checks : list
+        List of (list, name, default, text) tuples, with the prodsched_check parameters for each variable.
+    window : window object
+        Window for display output.
+
+    Returns
+    -------
+    df : df
+       Output dataframe.
+    error : int
+        Error return code
+    """
+
+    err_count = 0
+    for (names, name, default, text) in checks:
+        df, err = prodsched_check(df, names, name, default, text, window)
+        err_count = err_count + err
+    return (df, err_count)
+
+
+def prodsched_cumsum(data, keys):
+    """Cumulative Sums and Counts of a Dataframe by Group in Date Order
+
+    The function calculates the cumulative sums of all the columns of a dataframe indexed by date, together with the
+    cumulative count, for the groups defined by the keys in a single grouped pass, rather than one groupby per column.
+    The rows are processed in date order, as per a pd.Grouper(freq='M') on the date index, with the results returned in
+    the original row order. Rows with missing keys are excluded from the groups and set to NaN.
+
+    Parameters
+    ----------
+    data : df
+        Dataframe indexed by date containing the columns to be summed.
+    keys : list
+        List of arrays defining the groups, for example the well names and months.
+
+    Returns
+    -------
+    sums : df
+        The cumulative sums of the columns by group in the original row order.
+    count : array
+        The cumulative count by group (starting from zero) in the original row order.
+    """
+
+    order   = np.argsort(data.index.values, kind='mergesort')
+    inverse = np.empty_like(order)
+    inverse[order] = np.arange(len(order))
+    group   = data.iloc[order].groupby([key[order] for key in keys], sort=False)
+    sums    = group.cumsum().iloc[inverse]
+    count   = group.cumcount().values[inverse]
+    sums.index = data.index
+    return (sums, count)
+
+
 def prodsched_daily(file_in, file_inc, options, window, opmsys):
     """Reads a CSV File Containing Production Data
 
@@ -124,6 +195,7 @@ def prodsched_daily(file_in, file_inc, options, window, opmsys):
         options[1] : THP and BHP conversion from gauge to absolute conversion factor etc.
         options[2] : THP and BHP conversion kPa to bars and MPa to bars.
         options[3] : Control mode (ORAT,GRAT etc.)
+        options[4] : Set to True to read and process the input file by well, for files too large for memory.
     window : window object
         Window for display output.
     opmsys : dict
@@ -142,10 +214,6 @@ def prodsched_daily(file_in, file_inc, options, window, opmsys):
     if Path(file_in).is_file():
         file_dbg = Path(file_inc).with_suffix('.dbg')  # OPM Flow Debug File
 
-    cols_in = ['oil', 'wat', 'gas', 'vfp', 'alfq', 'thp', 'bhp']
-    cols_out = ['wname', 'status', 'cntl', 'oil', 'wat', 'gas', 'vfp', 'alfq', 'thp', 'bhp', 'end', 'date']
-    data = pd.DataFrame()
-    df = pd.DataFrame(columns=cols_out)
     df_in = pd.DataFrame()
     alfq_lst = ['alfq', 'vfp alfq', 'gas lift', 'pump speed', 'ALFQ', 'VFP ALFQ', 'GAS LIFT', 'PUMP SPEED']
     bhp_lst  = ['bhp', 'bottom-hole pressure', 'BHP', 'BOTTOM-HOLE PRESSURE']
@@ -156,6 +224,17 @@ def prodsched_daily(file_in, file_inc, options, window, opmsys):
     gas_lst = ['gas', 'gas rate', 'grat', 'GAS', 'GAS RATE', 'GRAT', 'Prd_dly.Gas']
     vfp_lst = ['vfp', 'vfp table', 'vfp number', 'VFP', 'VFP TABLE', 'VFP NUMBER']
     wname_lst = ['wname', 'well', 'wells', 'wellname', 'WNAME', 'WELL', 'WELLS', 'WELLNAME', 'Xy.Wellcompl']
+    checks = [(wname_lst, 'wname', False, 'Well'),
+              (date_lst, 'date', False, 'Date'),
+              (oil_lst, 'oil', False, 'Oil Rate'),
+              (wat_lst, 'wat', False, 'Water Rate'),
+              (gas_lst, 'gas', False, 'Gas Rate'),
+              # VFP and VFP ALQ Data Set to Default Vales if Missing
+              (vfp_lst, 'vfp', True, 'VFP Tables'),
+              (alfq_lst, 'alfq', True, 'VFP Artificial Lift'),
+              # THP and BHP Data Set to Default Vales if Missing
+              (thp_lst, 'thp', True, 'THP'),
+              (bhp_lst, 'bhp', True, 'BHP')]
     #
     # List Vector Names
     #
@@ -172,6 +251,11 @@ def prodsched_daily(file_in, file_inc, options, window, opmsys):
         sg.cprint('Well Name              = ' + str(wname_lst) + '\n')
         return(0)
     #
+    # Read In and Process Data by Well for Large Files
+    #
+    if len(options) > 4 and options[4]:
+        return prodsched_stream(file_in, file_inc, options, checks, prodsched_daily_data, window, opmsys)
+    #
     # Read In Data
     #
     sg.cprint('Reading Production Data CSV File: \n' + str(file_in))
@@ -190,48 +274,20 @@ def prodsched_daily(file_in, file_inc, options, window, opmsys):
     # Check Column Headers, Rename Vols, and Drop Unused Cols
     #
     sg.cprint('Checking Data:')
-    err_count = 0
-    df_in, err = prodsched_check(df_in, wname_lst, 'wname', False, 'Well', window)
-    err_count = err_count + err
-    df_in, err = prodsched_check(df_in, date_lst, 'date', False, 'Date', window)
-    err_count = err_count + err
-    df_in, err = prodsched_check(df_in, oil_lst, 'oil', False, 'Oil Rate', window)
-    err_count = err_count + err
-    df_in, err = prodsched_check(df_in, wat_lst, 'wat', False, 'Water Rate', window)
-    err_count = err_count + err
-    df_in, err = prodsched_check(df_in, gas_lst, 'gas', False, 'Gas Rate', window)
-    err_count = err_count + err
-    # VFP and VFP ALQ Data Set to Default Vales if Missing
-    df_in, err = prodsched_check(df_in, vfp_lst, 'vfp', True, 'VFP Tables', window)
-    df_in, err = prodsched_check(df_in, alfq_lst, 'alfq', True, 'VFP Artificial Lift', window)
-    # THP and BHP Data Set to Default Vales if Missing
-    df_in, err = prodsched_check(df_in, thp_lst, 'thp', True, 'THP', window)
-    df_in, err = prodsched_check(df_in, bhp_lst, 'bhp', True, 'BHP', window)
+    df_in, err_count = prodsched_columns(df_in, checks, window)
     sg.cprint('Checking Data: Complete \n')
     if err_count > 0:
         sg.cprint('Stopping Due to Errors')
         return (err_count)
     #
-    # Replace Default Pressure Values with Zero, and Replace Spaces in Well Names with Underscores
+    # Process Data
     #
-    df_in['bhp'].replace('1*', 0.0, inplace=True)
-    df_in['thp'].replace('1*', 0.0, inplace=True)
-    df_in['wname'] = df_in['wname'].str.replace(' ', '_')
     sg.cprint('Processing Data')
     sg.cprint(df_in.head().to_string() + '\n')
-
-    # ------------------------------------------------------------------------------------------------------------------
-    # Process Data and Setup Variables for Daily and Monthly Average Options
-    # ------------------------------------------------------------------------------------------------------------------
-    data['wname'] = df_in['wname']
     try:
-        data['date'] = pd.to_datetime(df_in['date'])
-        data[cols_in] = df_in[cols_in]
-        data.sort_values(['date', 'wname'], ascending=[True, True])
-        start_date = data['date'].min().strftime('%d %b %Y')
-        end_date = data['date'].max().strftime('%d %b %Y')
-        data['index'] = data['date']
-        data.set_index('index', inplace=True)
+        data, df = prodsched_daily_data(df_in, options)
+        start_date = data['date'].min()
+        end_date = data['date'].max()
     except ValueError as error:
         sg.popup_error('Error on Date Variable in File: ' + '\n  \n' + str(file_inc) + '\n \n' +
                        str(error) + ': ' + str(type(error)),
@@ -240,6 +296,102 @@ def prodsched_daily(file_in, file_inc, options, window, opmsys):
         err_count = 1
         return (err_count)
 
+    # File Output Text
+    text = prodsched_text(options, start_date, end_date)
+    #
+    # Debug and Debug File Output
+    #
+    if debug:
+        sg.Print(data.columns.ravel())
+        sg.Print(data)
+
+    file = open(file_dbg, 'w')
+    opm_header_file(file, file_in, file_inc, ['start', ''], text, opmsys)
+    opm_header_file(file, file_in, file_inc, ['', ''], ['DEBUG START: DATA DATAFRAME POST PROCESSING '], opmsys)
+    file.write(data.to_string())
+    opm_header_file(file, file_in, file_inc, ['', ''], ['DEBUG END: DATA DATAFRAME POST PROCESSING '], opmsys)
+    file.close()
+    sg.cprint('Debug Data Written to Debug File')
+
+    sg.cprint('Creating Output')
+    sg.cprint(df.head().to_string() + '\n')
+    #
+    # Debug File Output
+    #
+    file = open(file_dbg, 'a')
+    opm_header_file(file, file_in, file_inc, ['', ''], ['DEBUG START: DATA DATAFRAME POST PROCESSING '], opmsys)
+    file.write(df.to_string())
+    opm_header_file(file, file_in, file_inc, ['', ''], ['DEBUG END: DATA DATAFRAME POST PROCESSING '], opmsys)
+    file.close()
+    sg.cprint('Summary Data Written to Debug File')
+    #
+    # Write Out WCONHIST Keywords per Time Step
+    #
+    try:
+        file = open(file_inc, 'w')
+        opm_header_file(file, file_in, file_inc, ['start', 'NOECHO'], text, opmsys)
+        if options[0] == 'monthly':
+            prodsched_wconhist(file, df, '01 %b %Y')
+        else:
+            prodsched_wconhist(file, df, '%d %b %Y')
+
+        opm_header_file(file, file_in, file_inc, ['end', 'ECHO'], [' '], opmsys)
+        file.close()
+        sg.cprint('Schedule Data Written to Include File')
+
+    except Exception as error:
+        sg.popup_error('Error Writing: ' + '\n  \n' + str(file_inc) + '\n \n' + str(error) + ': ' + str(type(error)),
+                       no_titlebar=False, grab_anywhere=False, keep_on_top=True)
+        return(1)
+
+    sg.cprint('Process Complete')
+    return(0)
+
+
+def prodsched_daily_data(df_in, options):
+    """Process Daily Production Data and Setup the Output Dataframe
+
+    The function processes the daily production data, with the columns already renamed by prodsched_columns, and
+    creates the various variables required to generate the SCHEDULE section production data, and the output dataframe
+    for the selected option. The function is used for both the complete data and for each well's data when the input
+    file is processed by well.
+
+    Parameters
+    ----------
+    df_in : df
+        Input dataframe.
+    options : list
+        Options as per prodsched_daily.
+
+    Returns
+    -------
+    data : df
+        Processed data dataframe.
+    df : df
+        Output dataframe.
+    """
+
+    cols_in = ['oil', 'wat', 'gas', 'vfp', 'alfq', 'thp', 'bhp']
+    cols_out = ['wname', 'status', 'cntl', 'oil', 'wat', 'gas', 'vfp', 'alfq', 'thp', 'bhp', 'end', 'date']
+    data = pd.DataFrame()
+    df = pd.DataFrame(columns=cols_out)
+    #
+    # Replace Default Pressure Values with Zero, and Replace Spaces in Well Names with Underscores
+    #
+    df_in['bhp'].replace('1*', 0.0, inplace=True)
+    df_in['thp'].replace('1*', 0.0, inplace=True)
+    df_in['wname'] = df_in['wname'].str.replace(' ', '_')
+
+    # ------------------------------------------------------------------------------------------------------------------
+    # Process Data and Setup Variables for Daily and Monthly Average Options
+    # ------------------------------------------------------------------------------------------------------------------
+    data['wname'] = df_in['wname']
+    data['date'] = pd.to_datetime(df_in['date'])
+    data[cols_in] = df_in[cols_in]
+    data.sort_values(['date', 'wname'], ascending=[True, True])
+    data['index'] = data['date']
+    data.set_index('index', inplace=True)
+
     # Calculate Liquid Rates, and Convert THP and BHP if Requested
     data['rate'] = data['oil'] + data['wat'] + data['gas']
     data['bhp_cor'] = (pd.to_numeric(data['bhp']    , errors='ignore') + options[1]).round(1)
@@ -251,11 +403,19 @@ def prodsched_daily(file_in, file_inc, options, window, opmsys):
     data['status'] = np.where(data['rate'] > 0, 'OPEN', 'SHUT')
     data['cflag'] = np.where(data['status'].ne(data['status'].shift(1)), 1, 0)
 
-    # Sum Monthly Volumes and Days by Well
-    data['Np'] = data.groupby(['wname', pd.Grouper(freq='M')])['oil'].cumsum()
-    data['Wp'] = data.groupby(['wname', pd.Grouper(freq='M')])['wat'].cumsum()
-    data['Gp'] = data.groupby(['wname', pd.Grouper(freq='M')])['gas'].cumsum()
-    data['days'] = data.groupby(['wname', pd.Grouper(freq='M')]).cumcount() + 1
+    # Sum Monthly Volumes, Days, Days on Production, Shut-In Days and Status Changes by Well in One Grouped Pass
+    month = data.index.year * 12 + data.index.month
+    flags = pd.DataFrame({'oil'    : data['oil'],
+                          'wat'    : data['wat'],
+                          'gas'    : data['gas'],
+                          'day_opn': np.where(data['status'] == 'OPEN', 1.0, 0.0),
+                          'day_cls': np.where(data['status'] == 'SHUT', 1.0, 0.0),
+                          'ops_eff': data['cflag']}, index=data.index)
+    sums, count = prodsched_cumsum(flags, [data['wname'].values, month.values])
+    data['Np'] = sums['oil']
+    data['Wp'] = sums['wat']
+    data['Gp'] = sums['gas']
+    data['days'] = count + 1
 
     # Calculate Average Monthly Rates
     data['oil_avg'] = (data['Np'] / data['days']).round(1)
@@ -263,14 +423,10 @@ def prodsched_daily(file_in, file_inc, options, window, opmsys):
     data['gas_avg'] = (data['Gp'] / data['days']).round(1)
 
     # Calculate Days on Production in a Month
-    data['day_opn'] = 1.0
-    data['day_opn'] = np.where(data['status'] == 'OPEN', 1.0, 0.0)
-    data['day_opn'] = data.groupby(['wname', pd.Grouper(freq='M'), 'day_opn'])['day_opn'].cumsum()
+    data['day_opn'] = np.where(flags['day_opn'] == 1.0, sums['day_opn'], 0.0)
 
     # Calculate Shut-In Days in a Month
-    data['day_cls'] = 1.0
-    data['day_cls'] = np.where(data['status'] == 'SHUT', 1.0, 0.0)
-    data['day_cls'] = data.groupby(['wname', pd.Grouper(freq='M'), 'day_cls'])['day_cls'].cumsum()
+    data['day_cls'] = np.where(flags['day_cls'] == 1.0, sums['day_cls'], 0.0)
     # Replace Missing Values by Previous Value by Well and by Month
     data.replace([np.inf, -np.inf], np.nan, inplace=True)
     data = data.fillna(0)
@@ -288,15 +444,16 @@ def prodsched_daily(file_in, file_inc, options, window, opmsys):
     #
     # Define Producing and Shut-in Intervals for Effective Monthly Rates
     #
-    data['ops_eff'] = data['cflag']
-    data['ops_eff'] = data.groupby(['wname', pd.Grouper(freq='M')])['ops_eff'].cumsum()
+    data['ops_eff'] = sums['ops_eff']
 
-    # Calculate Effective Monthly Rates Based and Pressures over Producing Interval
-    data['oil_eff'] = data.groupby(['wname', pd.Grouper(freq='M'), 'ops_eff'])['oil'].cumsum() / data['day_eff']
-    data['wat_eff'] = data.groupby(['wname', pd.Grouper(freq='M'), 'ops_eff'])['wat'].cumsum() / data['day_eff']
-    data['gas_eff'] = data.groupby(['wname', pd.Grouper(freq='M'), 'ops_eff'])['gas'].cumsum() / data['day_eff']
-    data['thp_eff'] = data.groupby(['wname', pd.Grouper(freq='M'), 'ops_eff'])['thp_cor'].cumsum() / data['day_eff']
-    data['bhp_eff'] = data.groupby(['wname', pd.Grouper(freq='M'), 'ops_eff'])['bhp_cor'].cumsum() / data['day_eff']
+    # Calculate Effective Monthly Rates Based and Pressures over Producing Interval in One Grouped Pass
+    sums, count = prodsched_cumsum(data[['oil', 'wat', 'gas', 'thp_cor', 'bhp_cor']],
+                                   [data['wname'].values, month.values, data['ops_eff'].values])
+    data['oil_eff'] = sums['oil'] / data['day_eff']
+    data['wat_eff'] = sums['wat'] / data['day_eff']
+    data['gas_eff'] = sums['gas'] / data['day_eff']
+    data['thp_eff'] = sums['thp_cor'] / data['day_eff']
+    data['bhp_eff'] = sums['bhp_cor'] / data['day_eff']
 
     # Round Values
     data['oil_eff'] = data['oil_eff'].round(1)
@@ -306,35 +463,9 @@ def prodsched_daily(file_in, file_inc, options, window, opmsys):
     data['thp_eff'] = data['thp_eff'].round(1)
     data['bhp_eff'] = data['bhp_eff'].round(1)
 
-    # File Output Text
-    text = ['OPM Flow Production and Injection Schedule keywords via OPMRUN(PRODSCHED) option:', '',
-            '  1) Production Schedule Option: ' + str(options[0]).upper(),
-            '  2) Pressure Conversion Factor: ' + str(options[1]).upper(),
-            '  2) Pressure Scale Factor     : ' + str(options[2]).upper(),
-            '  2) Well Control Mode         : ' + options[3],
-            '  3) Start Date                : ' + str(start_date),
-            '  4) End Date                  : ' + str(end_date), '',
-            'Data generated from CSV file containing well names dates and production data. The current implementation '+
-            'only considers CSV \n-- files as input.',
-            'Only production data is currently used, injection data not implemented.']
-    #
-    # Debug and Debug File Output
     #
-    if debug:
-        sg.Print(data.columns.ravel())
-        sg.Print(data)
-
-    file = open(file_dbg, 'w')
-    opm_header_file(file, file_in, file_inc, ['start', ''], text, opmsys)
-    opm_header_file(file, file_in, file_inc, ['', ''], ['DEBUG START: DATA DATAFRAME POST PROCESSING '], opmsys)
-    file.write(data.to_string())
-    opm_header_file(file, file_in, file_inc, ['', ''], ['DEBUG END: DATA DATAFRAME POST PROCESSING '], opmsys)
-    file.close()
-    sg.cprint('Debug Data Written to Debug File')
-
-    # ------------------------------------------------------------------------------------------------------------------
     # Setup Output Dataframe Based on Selected Option
-    # ------------------------------------------------------------------------------------------------------------------
+    #
     if options[0] == 'daily':
         df['wname'] = data['wname']
         df['status'] = data['status']
@@ -380,96 +511,53 @@ def prodsched_daily(file_in, file_inc, options, window, opmsys):
         df['date'] = data['date_eff']
         df = df.groupby(['wname', df.date]).tail(1)
 
-    sg.cprint('Creating Output')
-    sg.cprint(df.head().to_string() + '\n')
-    #
-    # Debug File Output
-    #
-    file = open(file_dbg, 'a')
-    opm_header_file(file, file_in, file_inc, ['', ''], ['DEBUG START: DATA DATAFRAME POST PROCESSING '], opmsys)
-    file.write(df.to_string())
-    opm_header_file(file, file_in, file_inc, ['', ''], ['DEBUG END: DATA DATAFRAME POST PROCESSING '], opmsys)
-    file.close()
-    sg.cprint('Summary Data Written to Debug File')
-    #
-    # Write Out WCONHIST Keywords per Time Step
-    #
-    try:
-        file = open(file_inc, 'w')
-        opm_header_file(file, file_in, file_inc, ['start', 'NOECHO'], text, opmsys)
-        sched = df.groupby('date')
+    return (data, df)
 
-        for key, item in sched:
-            if options[0] == 'daily':
-                file.write('DATES \n' + str(key.strftime('%d %b %Y')) + '  /\n/\n\n')
-            if options[0] == 'monthly':
-                file.write('DATES \n' + str(key.strftime('01 %b %Y')) + '  /\n/\n\n')
-            if options[0] == 'monthly_eff':
-                file.write('DATES \n' + str(key.strftime('%d %b %Y')) + '  /\n/\n\n')
 
-            out = sched.get_group(key)
-            prodsched_keyword(file, 'WCONHIST', '', out)
+def prodsched_fields(data):
+    """Format the Schedule Data Fields for the WCONHIST Keyword
 
-        opm_header_file(file, file_in, file_inc, ['end', 'ECHO'], [' '], opmsys)
-        file.close()
-        sg.cprint('Schedule Data Written to Include File')
+    Formats the schedule data columns used by the WCONHIST keyword as strings, in date order, with the record date in
+    ISO format as the last field. Rows without a date are excluded.
 
-    except Exception as error:
-        sg.popup_error('Error Writing: ' + '\n  \n' + str(file_inc) + '\n \n' + str(error) + ': ' + str(type(error)),
-                       no_titlebar=False, grab_anywhere=False, keep_on_top=True)
-        return(1)
-    #
-    # Read and Write Out Schedule File to Remove Blanks in First Column (work around for df.to_string() issue)
-    #
-    file_lstrip(file_inc)
-    sg.cprint('Process Complete')
-    return(0)
+    Parameters
+    ----------
+    data : df
+        Schedule data with the wname, status, cntl, oil, wat, gas, vfp, alfq, thp, bhp and date columns.
 
+    Returns
+    -------
+    fields : list
+        List of the formatted values for each column, with the record dates as the last column.
+    """
 
-def prodsched_keyword(file, keyword, unit='', data=None):
-    """Write Keyword Header, Keyword and Data to File
+    cols  = ['wname', 'status', 'cntl', 'oil', 'wat', 'gas', 'vfp', 'alfq', 'thp', 'bhp']
+    data  = data[data['date'].notna()]
+    dates = data['date'].values
+    order = np.argsort(dates, kind='mergesort')
+    fields = [data[col].astype(str).values[order].tolist() for col in cols]
+    fields.append(np.datetime_as_string(dates[order], unit='D').tolist())
+    return fields
 
-    Writes out keyword header and data to a file.
+
+def prodsched_headers():
+    """Get the WCONHIST Keyword Column Headers
 
     Parameters
     ----------
-    file : file
-        File object that was used to writing data to.
-    keyword : keyword
-        The name of the keyword header to be written out together with the keyword.
-    unit : str
-        Unit string
-    data : df
-        Data frame to be written out
+
 
     Returns
     -------
-    None
+    head1 : list
+        First row of the column headers.
+    head2 : list
+        Second row of the column headers.
     """
 
-    if keyword == 'WCONHIST':
-        file.write('--                                     \n')
-        file.write('-- WELL HISTORICAL PRODUCTION CONTROLS \n')
-        file.write('--                                     \n')
-        out = pd.DataFrame([['-- WELL ', 'OPEN', 'CNTL', 'OIL', 'WAT', 'GAS', 'VFP', 'VFP', 'THP', 'BHP',
-                             ' ', ' '],
-                            ['-- NAME ', 'SHUT', 'MODE', 'RATE', 'RATE', 'RATE', 'TABLE', 'ALFQ', 'PRES', 'PRES',
-                             ' ', ' '],
-                            ['WCONHIST', '    ', '    ', '    ', '    ', '    ', '     ', '    ', '    ', '    ',
-                             ' ', ' ']], columns=data.columns)
-    else:
-        sg.popup_error('Error Keyword Not Found: ' + '\n  \n' + keyword, no_titlebar=False, grab_anywhere=False,
-                       keep_on_top=True)
-    try:
-        out = pd.concat([out, data])
-        out = out.to_string(index=False, header=False, justify='start',
-                            formatters={'date':  lambda x: x if type(x) == str else x.strftime('%Y-%m-%d')})
-        file.write(out)
-        file.write('\n/\n\n')
-    except Exception as error:
-        sg.popup_error('Error Processing ' + keyword + '\n \n' +
-                       str(error) + ': ' + str(type(error)), no_titlebar=False, grab_anywhere=False, keep_on_top=True)
-    return ()
+    head1 = ['-- WELL', 'OPEN', 'CNTL', 'OIL' , 'WAT' , 'GAS' , 'VFP'  , 'VFP' , 'THP' , 'BHP' ]
+    head2 = ['-- NAME', 'SHUT', 'MODE', 'RATE', 'RATE', 'RATE', 'TABLE', 'ALFQ', 'PRES', 'PRES']
+    return (head1, head2)
 
 
 def prodsched_monthly(file_in, file_inc, options, window, opmsys):
@@ -491,6 +579,7 @@ def prodsched_monthly(file_in, file_inc, options, window, opmsys):
         options[1] : THP and BHP conversion from gauge to absolute conversion factor etc.
         options[2] : THP and BHP conversion kPa to bars and MPa to bars.
         options[3] : Control mode (ORAT,GRAT etc.)
+        options[4] : Set to True to read and process the input file by well, for files too large for memory.
     window : window object
         Window for display output.
     opmsys : dict
@@ -509,10 +598,6 @@ def prodsched_monthly(file_in, file_inc, options, window, opmsys):
     if Path(file_in).is_file():
         file_dbg = Path(file_inc).with_suffix('.dbg')  # OPM Flow Debug File
 
-    cols_in = ['oil', 'wat', 'gas', 'vfp', 'alfq', 'thp', 'bhp', 'days']
-    cols_out = ['wname', 'status', 'cntl', 'oil', 'wat', 'gas', 'vfp', 'alfq', 'thp', 'bhp', 'end', 'date']
-    data = pd.DataFrame()
-    df = pd.DataFrame(columns=cols_out)
     df_in = pd.DataFrame()
     alfq_lst = ['alfq', 'vfp alfq', 'gas lift', 'pump speed', 'ALFQ', 'VFP ALFQ', 'GAS LIFT', 'PUMP SPEED']
     bhp_lst = ['bhp', 'bottom-hole pressure', 'BHP', 'BOTTOM-HOLE PRESSURE']
@@ -524,6 +609,18 @@ def prodsched_monthly(file_in, file_inc, options, window, opmsys):
     gas_lst = ['gas', 'gas rate', 'grat', 'GAS', 'GAS RATE', 'GRAT', 'Hist Gas']
     vfp_lst = ['vfp', 'vfp table', 'vfp number', 'VFP', 'VFP TABLE', 'VFP NUMBER']
     wname_lst = ['wname', 'Well', 'well', 'wells', 'wellname', 'WNAME', 'WELL', 'WELLS', 'WELLNAME', 'Xy.Wellcompl']
+    checks = [(wname_lst, 'wname', False, 'Well'),
+              (date_lst, 'date', False, 'Date'),
+              (days_lst, 'days', False, 'Days'),
+              (oil_lst, 'oil', False, 'Oil Volume'),
+              (wat_lst, 'wat', False, 'Water Volume'),
+              (gas_lst, 'gas', False, 'Gas Volume'),
+              # VFP and VFP ALQ Data Set to Default Vales if Missing
+              (vfp_lst, 'vfp', True, 'VFP Tables'),
+              (alfq_lst, 'alfq', True, 'VFP Artificial Lift'),
+              # THP and BHP Data Set to Default Vales if Missing
+              (thp_lst, 'thp', True, 'THP'),
+              (bhp_lst, 'bhp', True, 'BHP')]
     #
     # List Vector Names
     #
@@ -541,6 +638,11 @@ def prodsched_monthly(file_in, file_inc, options, window, opmsys):
         sg.cprint('Well Name              = ' + str(wname_lst) + '\n')
         return(0)
     #
+    # Read In and Process Data by Well for Large Files
+    #
+    if len(options) > 4 and options[4]:
+        return prodsched_stream(file_in, file_inc, options, checks, prodsched_monthly_data, window, opmsys)
+    #
     # Read In Data
     #
     sg.cprint('Reading Production Data CSV File: \n' + str(file_in))
@@ -559,50 +661,20 @@ def prodsched_monthly(file_in, file_inc, options, window, opmsys):
     # Check Column Headers, Rename Vols, and Drop Unused Cols
     #
     sg.cprint('Checking Data:')
-    err_count = 0
-    df_in, err = prodsched_check(df_in, wname_lst, 'wname', False, 'Well', window)
-    err_count = err_count + err
-    df_in, err = prodsched_check(df_in, date_lst, 'date', False, 'Date', window)
-    err_count = err_count + err
-    df_in, err = prodsched_check(df_in, days_lst, 'days', False, 'Days', window)
-    err_count = err_count + err
-    df_in, err = prodsched_check(df_in, oil_lst, 'oil', False, 'Oil Volume', window)
-    err_count = err_count + err
-    df_in, err = prodsched_check(df_in, wat_lst, 'wat', False, 'Water Volume', window)
-    err_count = err_count + err
-    df_in, err = prodsched_check(df_in, gas_lst, 'gas', False, 'Gas Volume', window)
-    err_count = err_count + err
-    # VFP and VFP ALQ Data Set to Default Vales if Missing
-    df_in, err = prodsched_check(df_in, vfp_lst, 'vfp', True, 'VFP Tables', window)
-    df_in, err = prodsched_check(df_in, alfq_lst, 'alfq', True, 'VFP Artificial Lift', window)
-    # THP and BHP Data Set to Default Vales if Missing
-    df_in, err = prodsched_check(df_in, thp_lst, 'thp', True, 'THP', window)
-    df_in, err = prodsched_check(df_in, bhp_lst, 'bhp', True, 'BHP', window)
+    df_in, err_count = prodsched_columns(df_in, checks, window)
     sg.cprint('Checking Data: Complete \n')
     if err_count > 0:
         sg.cprint('Stopping Due to Errors')
         return (err_count)
     #
-    # Replace Default Pressure Values with Zero, and Replace Spaces in Well Names with Underscores
+    # Process Data
     #
-    df_in['bhp'].replace('1*', 0.0, inplace=True)
-    df_in['thp'].replace('1*', 0.0, inplace=True)
-    df_in['wname'] = df_in['wname'].str.replace(' ', '_')
     sg.cprint('Processing Data')
     sg.cprint(df_in.head().to_string() + '\n')
-
-    # ------------------------------------------------------------------------------------------------------------------
-    # Process Data and Setup Variables
-    # ------------------------------------------------------------------------------------------------------------------
-    data['wname'] = df_in['wname']
     try:
-        data['date'] = pd.to_datetime(df_in['date'])
-        data[cols_in] = df_in[cols_in]
-        data.sort_values(['date', 'wname'], ascending=[True, True])
-        start_date = data['date'].min().strftime('%d %b %Y')
-        end_date = data['date'].max().strftime('%d %b %Y')
-        data['index'] = data['date']
-        data.set_index('index', inplace=True)
+        data, df = prodsched_monthly_data(df_in, options)
+        start_date = data['date'].min()
+        end_date = data['date'].max()
     except ValueError as error:
         sg.popup_error('Error on Date Variable in File: ' + '\n  \n' + str(file_inc) + '\n \n' +
                        str(error) + ': ' + str(type(error)),
@@ -611,6 +683,99 @@ def prodsched_monthly(file_in, file_inc, options, window, opmsys):
         err_count = 1
         return (err_count)
 
+    # File Output Text
+    text = prodsched_text(options, start_date, end_date)
+    #
+    # Debug and Debug File Output
+    #
+    if debug:
+        sg.Print(data.columns.ravel())
+        sg.Print(data)
+
+    file = open(file_dbg, 'w')
+    opm_header_file(file, file_in, file_inc, ['start', ''], text, opmsys)
+    opm_header_file(file, file_in, file_inc, ['', ''], ['DEBUG START: DATA DATAFRAME POST PROCESSING '], opmsys)
+    file.write(data.to_string())
+    opm_header_file(file, file_in, file_inc, ['', ''], ['DEBUG END: DATA DATAFRAME POST PROCESSING '], opmsys)
+    file.close()
+    sg.cprint('Debug Data Written to Debug File')
+
+    sg.cprint('Creating Output')
+    sg.cprint(df.head().to_string() + '\n')
+    #
+    # Debug File Output
+    #
+    file = open(file_dbg, 'a')
+    opm_header_file(file, file_in, file_inc, ['', ''], ['DEBUG START: DATA DATAFRAME POST PROCESSING '], opmsys)
+    file.write(df.to_string())
+    opm_header_file(file, file_in, file_inc, ['', ''], ['DEBUG END: DATA DATAFRAME POST PROCESSING '], opmsys)
+    file.close()
+    sg.cprint('Summary Data Written to Debug File')
+    #
+    # Write Out WCONHIST Keywords per Time Step
+    #
+    try:
+        file = open(file_inc, 'w')
+        opm_header_file(file, file_in, file_inc, ['start', 'NOECHO'], text, opmsys)
+        prodsched_wconhist(file, df, '01 %b %Y')
+
+        opm_header_file(file, file_in, file_inc, ['end', 'ECHO'], [' '], opmsys)
+        file.close()
+        sg.cprint('Schedule Data Written to Include File')
+
+    except Exception as error:
+        sg.popup_error('Error Writing: ' + '\n  \n' + str(file_inc) + '\n \n' + str(error) + ': ' + str(type(error)),
+                       no_titlebar=False, grab_anywhere=False, keep_on_top=True)
+        return(1)
+
+    sg.cprint('Process Complete')
+    return(0)
+
+
+def prodsched_monthly_data(df_in, options):
+    """Process Monthly Production Data and Setup the Output Dataframe
+
+    The function processes the monthly production data, with the columns already renamed by prodsched_columns, and
+    creates the various variables required to generate the SCHEDULE section production data, and the output dataframe
+    for the selected option. The function is used for both the complete data and for each well's data when the input
+    file is processed by well.
+
+    Parameters
+    ----------
+    df_in : df
+        Input dataframe.
+    options : list
+        Options as per prodsched_monthly.
+
+    Returns
+    -------
+    data : df
+        Processed data dataframe.
+    df : df
+        Output dataframe.
+    """
+
+    cols_in = ['oil', 'wat', 'gas', 'vfp', 'alfq', 'thp', 'bhp', 'days']
+    cols_out = ['wname', 'status', 'cntl', 'oil', 'wat', 'gas', 'vfp', 'alfq', 'thp', 'bhp', 'end', 'date']
+    data = pd.DataFrame()
+    df = pd.DataFrame(columns=cols_out)
+    #
+    # Replace Default Pressure Values with Zero, and Replace Spaces in Well Names with Underscores
+    #
+    df_in['bhp'].replace('1*', 0.0, inplace=True)
+    df_in['thp'].replace('1*', 0.0, inplace=True)
+    df_in['wname'] = df_in['wname'].str.replace(' ', '_')
+
+    # ------------------------------------------------------------------------------------------------------------------
+    # Process Data and Setup Variables
+    # ------------------------------------------------------------------------------------------------------------------
+    data['wname'] = df_in['wname']
+    data['date'] = pd.to_datetime(df_in['date'])
+    data[cols_in] = df_in[cols_in]
+    data.sort_values(['date', 'wname'], ascending=[True, True])
+    data['index'] = data['date']
+    data.set_index('index', inplace=True)
+
     # Calculate Liquid Rates, and Convert THP and BHP if Requested
     data['rate'] = data['oil'] + data['wat'] + data['gas']
     data['bhp_cor'] = (pd.to_numeric(data['bhp']    , errors='ignore') + options[1]).round(1)
@@ -636,35 +801,9 @@ def prodsched_monthly(file_in, file_inc, options, window, opmsys):
     data.replace([np.inf, -np.inf], np.nan, inplace=True)
     data = data.fillna(0)
 
-    # File Output Text
-    text = ['OPM Flow Production and Injection Schedule keywords via OPMRUN(PRODSCHED) option:', '',
-            '  1) Production Schedule Option: ' + str(options[0]).upper(),
-            '  2) Pressure Conversion Factor: ' + str(options[1]).upper(),
-            '  2) Pressure Scale Factor     : ' + str(options[2]).upper(),
-            '  2) Well Control Mode         : ' + options[3],
-            '  3) Start Date                : ' + str(start_date),
-            '  4) End Date                  : ' + str(end_date), '',
-            'Data generated from CSV file containing well names dates and production data. The current implementation '+
-            'only considers CSV \n-- files as input.',
-            'Only production data is currently used, injection data not implemented.']
-    #
-    # Debug and Debug File Output
     #
-    if debug:
-        sg.Print(data.columns.ravel())
-        sg.Print(data)
-
-    file = open(file_dbg, 'w')
-    opm_header_file(file, file_in, file_inc, ['start', ''], text, opmsys)
-    opm_header_file(file, file_in, file_inc, ['', ''], ['DEBUG START: DATA DATAFRAME POST PROCESSING '], opmsys)
-    file.write(data.to_string())
-    opm_header_file(file, file_in, file_inc, ['', ''], ['DEBUG END: DATA DATAFRAME POST PROCESSING '], opmsys)
-    file.close()
-    sg.cprint('Debug Data Written to Debug File')
-
-    # ------------------------------------------------------------------------------------------------------------------
     # Setup Output Dataframe Based on Selected Option
-    # ------------------------------------------------------------------------------------------------------------------
+    #
     if options[0] == 'rate':
         df['wname'] = data['wname']
         df['status'] = data['status']
@@ -695,46 +834,297 @@ def prodsched_monthly(file_in, file_inc, options, window, opmsys):
         df['status'] = np.where((df['oil'] + df['wat'] + df['gas']) > 0, 'OPEN', 'SHUT')
         df = df.groupby(['wname', df.index.year, df.index.month]).tail(1)
 
-    sg.cprint('Creating Output')
-    sg.cprint(df.head().to_string() + '\n')
-    #
-    # Debug File Output
-    #
-    file = open(file_dbg, 'a')
-    opm_header_file(file, file_in, file_inc, ['', ''], ['DEBUG START: DATA DATAFRAME POST PROCESSING '], opmsys)
-    file.write(df.to_string())
-    opm_header_file(file, file_in, file_inc, ['', ''], ['DEBUG END: DATA DATAFRAME POST PROCESSING '], opmsys)
-    file.close()
-    sg.cprint('Summary Data Written to Debug File')
+    return (data, df)
+
+
+def prodsched_stream(file_in, file_inc, options, checks, process, window, opmsys, chunksize=500000):
+    """Reads and Processes a Large CSV File Containing Production Data by Well
+
+    The function processes production data files that are too large to be read into memory. The CSV file is read in
+    chunks, with the well names as categories and the volumes as floats, and the rows are partitioned by well into
+    temporary files. Each well's data is then processed on its own by the process function, prodsched_daily_data or
+    prodsched_monthly_data, with the well's debug output and schedule records written to temporary files, the records
+    in a file for each month. Finally the schedule records are merged by date into the include file, a month at a time.
+    The memory required is therefore based on the largest well history, rather than the whole file. Note that the
+    status change flag and effective dates are calculated by well, rather than over the whole file.
+
+    Parameters
+    ----------
+    file_in : str
+       Name of input file used to capture the comp_data.
+    file_inc : str
+       Name of output include file used to write the keywords to.
+    options : list
+        Options as per prodsched_daily and prodsched_monthly.
+    checks : list
+        List of (list, name, default, text) tuples, with the prodsched_check parameters for each variable.
+    process : function
+        Function to process each well's data, prodsched_daily_data or prodsched_monthly_data.
+    window : window object
+        Window for display output.
+    opmsys : dict
+        A dictionary containing the OPMRUN system parameters
+    chunksize : int
+        Number of rows read from the CSV file at a time.
+
+    Returns
+    -------
+    error: int
+        Error return code
+    """
+
+    file_dbg = Path(file_inc).with_suffix('.dbg')  # OPM Flow Debug File
+    if options[0] in ['daily', 'monthly_eff']:
+        datefmt = '%d %b %Y'
+    else:
+        datefmt = '01 %b %Y'
     #
-    # Write Out WCONHIST Keywords per Time Step
+    # Check Column Headers
     #
+    sg.cprint('Reading Production Data CSV File by Well: \n' + str(file_in))
     try:
-        file = open(file_inc, 'w')
-        opm_header_file(file, file_in, file_inc, ['start', 'NOECHO'], text, opmsys)
-        sched = df.groupby('date')
+        head = pd.read_csv(file_in, nrows=0)
+    except Exception as error:
+        sg.popup_error('Error Reading: ' + '\n  \n' + str(file_in),
+                       str(error) + ': ' + str(type(error)), no_titlebar=False, grab_anywhere=False, keep_on_top=True)
+        sg.cprint('Error Reading Production Data File')
+        return(1)
 
-        for key, item in sched:
-            file.write('DATES \n' + str(key.strftime('01 %b %Y')) + '  /\n/\n\n')
-            out = sched.get_group(key)
-            prodsched_keyword(file, 'WCONHIST', '', out)
+    cols = list(head.columns)
+    sg.cprint('Checking Data:')
+    head, err_count = prodsched_columns(head, checks, window)
+    sg.cprint('Checking Data: Complete \n')
+    if err_count > 0:
+        sg.cprint('Stopping Due to Errors')
+        return (err_count)
 
-        opm_header_file(file, file_in, file_inc, ['end', 'ECHO'], [' '], opmsys)
-        file.close()
-        sg.cprint('Schedule Data Written to Include File')
+    names   = dict(zip(cols, head.columns[:len(cols)]))
+    default = list(head.columns[len(cols):])
+    used    = [check[1] for check in checks]
+    typed   = {'wname': 'category', 'date': 'str', 'oil': 'float64', 'wat': 'float64', 'gas': 'float64',
+               'days': 'float64'}
+    usecols = [col for col in cols if names[col] in used]
+    dtype   = {col: typed[names[col]] for col in usecols if names[col] in typed}
+
+    with tempfile.TemporaryDirectory(dir=Path(file_inc).parent) as tmpdir:
+        tmpdir = Path(tmpdir)
+        #
+        # Partition Data by Well
+        #
+        wells = {}
+        try:
+            for chunk in pd.read_csv(file_in, usecols=usecols, dtype=dtype, chunksize=chunksize):
+                chunk = chunk.rename(columns=names)
+                chunk = chunk[chunk['wname'].notna()]
+                for well, part in chunk.groupby('wname', observed=True, sort=False):
+                    header = well not in wells
+                    if header:
+                        wells[well] = tmpdir / ('well' + str(len(wells)) + '.csv')
+                    part.to_csv(wells[well], mode='a', header=header, index=False)
+        except Exception as error:
+            sg.popup_error('Error Reading: ' + '\n  \n' + str(file_in),
+                           str(error) + ': ' + str(type(error)), no_titlebar=False, grab_anywhere=False,
+                           keep_on_top=True)
+            sg.cprint('Error Reading Production Data File')
+            return(1)
+
+        sg.cprint('Reading Production Data File Complete for ' + str(len(wells)) + ' Wells \n')
+        #
+        # Process Data by Well
+        #
+        sg.cprint('Processing Data by Well')
+        dtype  = {name: typed[name] for name in typed if name in used}
+        dtype['wname'] = 'str'
+        width  = None
+        dates  = []
+        months = {}
+        file_data = tmpdir / 'data.dbg'
+        file_df   = tmpdir / 'df.dbg'
+        for well, file_well in wells.items():
+            df_in = pd.read_csv(file_well, dtype=dtype).fillna(0.0)
+            for col in default:
+                df_in[col] = '1*'
+            try:
+                data, df = process(df_in, options)
+            except ValueError as error:
+                sg.popup_error('Error on Date Variable in File: ' + '\n  \n' + str(file_inc) + '\n \n' +
+                               str(error) + ': ' + str(type(error)),
+                               no_titlebar=False, grab_anywhere=False, keep_on_top=True)
+                sg.cprint('Stopping Due to Errors')
+                return (1)
+
+            dates = dates + [data['date'].min(), data['date'].max()]
+            with open(file_data, 'a') as file:
+                file.write(data.to_string() + '\n')
+            with open(file_df, 'a') as file:
+                file.write(df.to_string() + '\n')
+
+            fields = prodsched_fields(df)
+            width  = prodsched_widths(fields, width)
+            for month, records in itertools.groupby(zip(*fields), key=lambda record: record[-1][:7]):
+                months.setdefault(month, tmpdir / ('month' + month + '.txt'))
+                with open(months[month], 'a') as file:
+                    file.write(''.join(['\t'.join(record) + '\n' for record in records]))
+            sg.cprint('    ' + str(well) + ' Processed')
+            window.refresh()
+
+        if not wells:
+            sg.cprint('No Well Data Found, Stopping Due to Errors')
+            return (1)
+        #
+        # Debug File Output
+        #
+        text = prodsched_text(options, min(dates), max(dates))
+        with open(file_dbg, 'w') as file:
+            opm_header_file(file, file_in, file_inc, ['start', ''], text, opmsys)
+            for name in [file_data, file_df]:
+                opm_header_file(file, file_in, file_inc, ['', ''], ['DEBUG START: DATA DATAFRAME POST PROCESSING '],
+                                opmsys)
+                with open(name, 'r') as debug:
+                    shutil.copyfileobj(debug, file)
+                opm_header_file(file, file_in, file_inc, ['', ''], ['DEBUG END: DATA DATAFRAME POST PROCESSING '],
+                                opmsys)
+        sg.cprint('Debug and Summary Data Written to Debug File')
+        #
+        # Merge Well Schedules by Date and Write Out WCONHIST Keywords per Time Step
+        #
+        try:
+            with open(file_inc, 'w') as file:
+                opm_header_file(file, file_in, file_inc, ['start', 'NOECHO'], text, opmsys)
+                for month in sorted(months):
+                    with open(months[month], 'r') as file_month:
+                        records = [line.rstrip('\n').split('\t') for line in file_month]
+                    records.sort(key=lambda record: record[-1])
+                    prodsched_wconhist_records(file, records, width, datefmt)
+                opm_header_file(file, file_in, file_inc, ['end', 'ECHO'], [' '], opmsys)
+            sg.cprint('Schedule Data Written to Include File')
+
+        except Exception as error:
+            sg.popup_error('Error Writing: ' + '\n  \n' + str(file_inc) + '\n \n' + str(error) + ': ' +
+                           str(type(error)), no_titlebar=False, grab_anywhere=False, keep_on_top=True)
+            return(1)
 
-    except Exception as error:
-        sg.popup_error('Error Writing: ' + '\n  \n' + str(file_inc) + '\n \n' + str(error) + ': ' + str(type(error)),
-                       no_titlebar=False, grab_anywhere=False, keep_on_top=True)
-        return(1)
-    #
-    # Read and Write Out Schedule File to Remove Blanks in First Column (work around for df.to_string() issue)
-    #
-    file_lstrip(file_inc)
     sg.cprint('Process Complete')
     return(0)
 
 
+def prodsched_text(options, start_date, end_date):
+    """Gets the Include and Debug File Header Text
+
+    Parameters
+    ----------
+    options : list
+        Options as per prodsched_daily and prodsched_monthly.
+    start_date : datetime
+        Start date of the production data.
+    end_date : datetime
+        End date of the production data.
+
+    Returns
+    -------
+    text : list
+        Header text.
+    """
+
+    text = ['OPM Flow Production and Injection Schedule keywords via OPMRUN(PRODSCHED) option:', '',
+            '  1) Production Schedule Option: ' + str(options[0]).upper(),
+            '  2) Pressure Conversion Factor: ' + str(options[1]).upper(),
+            '  2) Pressure Scale Factor     : ' + str(options[2]).upper(),
+            '  2) Well Control Mode         : ' + options[3],
+            '  3) Start Date                : ' + str(start_date.strftime('%d %b %Y')),
+            '  4) End Date                  : ' + str(end_date.strftime('%d %b %Y')), '',
+            'Data generated from CSV file containing well names dates and production data. The current implementation '+
+            'only considers CSV \n-- files as input.',
+            'Only production data is currently used, injection data not implemented.']
+    return text
+
+
+def prodsched_wconhist(file, data, datefmt):
+    """Write Out the DATES and WCONHIST Keywords for Each Date
+
+    Writes out the DATES keyword and the WCONHIST keyword for each date in the schedule data, in date order. All the
+    records are formatted once, with the column widths for the whole schedule, and each date's keywords are then
+    written out in a single pass through the file, rather than formatting a dataframe for each date.
+
+    Parameters
+    ----------
+    file : file
+        File object that was used to writing data to.
+    data : df
+        Schedule data with the wname, status, cntl, oil, wat, gas, vfp, alfq, thp, bhp and date columns.
+    datefmt : str
+        Format used for the dates on the DATES keyword, for example '%d %b %Y'.
+
+    Returns
+    -------
+    None
+    """
+
+    fields = prodsched_fields(data)
+    prodsched_wconhist_records(file, zip(*fields), prodsched_widths(fields), datefmt)
+    return ()
+
+
+def prodsched_wconhist_records(file, records, width, datefmt):
+    """Write Out the DATES and WCONHIST Keywords for Formatted Records
+
+    Writes out the DATES keyword and the WCONHIST keyword for each date, with the columns right justified and the well
+    names left justified to the column widths. The record date is written as a comment after the record terminator.
+
+    Parameters
+    ----------
+    file : file
+        File object that was used to writing data to.
+    records : iterable
+        Formatted records from prodsched_fields in date order, with the ISO format record date as the last field.
+    width : list
+        Column widths from prodsched_widths.
+    datefmt : str
+        Format used for the dates on the DATES keyword, for example '%d %b %Y'.
+
+    Returns
+    -------
+    None
+    """
+
+    head1, head2 = prodsched_headers()
+    head1 = [head1[0].ljust(width[0])] + [head1[n].rjust(width[n]) for n in range(1, len(width))]
+    head2 = [head2[0].ljust(width[0])] + [head2[n].rjust(width[n]) for n in range(1, len(width))]
+    head  = ('--\n-- WELL HISTORICAL PRODUCTION CONTROLS\n--\n' + ' '.join(head1) + '\n' + ' '.join(head2) +
+             '\nWCONHIST\n')
+    line  = ' '.join(['{:<' + str(width[0]) + '}'] + ['{:>' + str(width[n]) + '}' for n in range(1, len(width))] +
+                     ['/ {}'])
+    for date, group in itertools.groupby(records, key=lambda record: record[-1]):
+        file.write('DATES \n' + datetime.date.fromisoformat(date).strftime(datefmt) + '  /\n/\n\n' + head +
+                   '\n'.join([line.format(*record) for record in group]) + '\n/\n\n')
+    return ()
+
+
+def prodsched_widths(fields, width=None):
+    """Get the WCONHIST Keyword Column Widths
+
+    Gets the column widths required for the formatted fields and column headers, updating the widths if given, so that
+    the widths can be accumulated over the data for several wells.
+
+    Parameters
+    ----------
+    fields : list
+        Formatted fields from prodsched_fields.
+    width : list
+        Column widths to be updated, or None.
+
+    Returns
+    -------
+    width : list
+        Column widths.
+    """
+
+    head1, head2 = prodsched_headers()
+    if width is None:
+        width = [max(len(head1[n]), len(head2[n])) for n in range(len(head1))]
+    return [max([width[n]] + [len(value) for value in fields[n]]) for n in range(len(width))]
+
+
 def prodsched_main(opmoptn, opmsys):
     """Main function to Generate the OPM Flow WCONHIST Keywords from Daily Production Data
 
@@ -808,6 +1198,11 @@ def prodsched_main(opmoptn, opmsys):
         're-opens then the production rate is calculated to the end of the month. This will result in variable ' +
         'time steps but with majority of them being monthly time steps.' +
         '\n\n' +
+        'Process Input File by Well: For input files that are too large to fit in memory, this option reads the ' +
+        'input file in chunks and processes the data one well at a time, with the well schedules then merged by ' +
+        'date to write the schedule section. The memory required is then based on the largest well history rather ' +
+        'than the size of the input file.' +
+        '\n\n' +
         'Note: \n' +
         '----- \n' +
         'The program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without ' +
@@ -846,6 +1241,8 @@ def prodsched_main(opmoptn, opmsys):
          sg.Text('Daily Data \nProduction \nSchedule \nOutput \nOptions'),
          sg.Listbox(schedule, default_values='Daily Production and Injection Schedule', key='_schedule_', size=(68, 7))
          ],
+        [sg.Checkbox('Process Input File by Well (for Input Files Too Large to Fit in Memory)', key='_stream_',
+                     default=False)],
         [sg.Text('')],
         [sg.Button('Clear', key='_clear_'), sg.Button('Help', key='_help_'),
          sg.Button('List', key='_list_', tooltip='List available vector names for selected option'), sg.Submit(),
@@ -915,6 +1312,7 @@ def prodsched_main(opmoptn, opmsys):
             options.append(constant[n])
             options.append(scale[n])
             options.append(values['_control_'][0])
+            options.append(values['_stream_'])
             #
             # Check for Valid Input File and Process
             #
@@ -954,6 +1352,7 @@ def prodsched_main(opmoptn, opmsys):
             options.append(constant[n])
             options.append(scale[n])
             options.append(values['_control_'][0])
+            options.append(values['_stream_'])
             #
             # Check for Valid Input File and Process
             #
@@ -0,0 +1,461 @@
+# ======================================================================================================================
+#
+"""OPM_PROXY.py - Response Surface Proxy Engine for Sensitivity Ensembles
+
+This module fits response surface proxies to the results of a sensitivity ensemble, that is a simulation response,
+for example FOPT at the final date, as a function of the sensitivity factors. The factors are coded on the unit
+interval, with zero for the Low value and one for the High value, so that the proxies can be evaluated over the same
+unit hypercube that the Latin Hypercube and Sobol designs are sampled from.
+
+Two proxies are available, a least squares polynomial of degree one (linear) or two (quadratic with interactions),
+and a Gaussian process with a squared exponential kernel with a length scale for each factor, where the kernel
+parameters are found by maximizing the log marginal likelihood. For both proxies the leave-one-out residuals are
+calculated from the fit without refitting, and the prediction standard deviation is available, so that the proxy can
+also be used to select the next simulation cases. A batch of cases is selected from a set of candidates by greedily
+taking the candidate with the largest prediction variance and then conditioning the variance of the remaining
+candidates on that candidate, so that the cases in a batch are not clustered together.
+
+The proxies are evaluated in vectorized form in chunks, so that millions of samples can be evaluated without holding
+the full kernel or feature matrices in memory, and are used to generate the tornado, main effect and response
+statistics for the sensitivity utility. The routines do not depend on the GUI.
+
+Program Documentation
+---------------------
+Only Python 3 is supported and tested Python2 support has been depreciated.
+
+2026.10.18 - New module initial release.
+
+Copyright Notice
+----------------
+This file is part of the Open Porous Media project (OPM).
+
+OPM is free software: you can redistribute it and/or modify it under the terms of the GNU General Public License as
+published by the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+
+OPM is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the aforementioned GNU General Public Licenses for more
+details.
+
+Copyright (C) 2022-2026 OPM-OP AS
+
+Author  : David Baxendale et al
+          info@opm-op.com
+Version : 2026.10.18
+Date    : 18-Oct-2026
+"""
+# ----------------------------------------------------------------------------------------------------------------------
+# 3456789012345678901234567890123456789012345678901234567890123456789012345678901234567890123456789012345678901234567890
+#        1         2         3         4         5         6         7         8         9         0         1         2
+#        0         0         0         0         0         0         0         0         0         1         1         1
+# ----------------------------------------------------------------------------------------------------------------------
+#
+# ----------------------------------------------------------------------------------------------------------------------
+# Import Modules Section
+# ----------------------------------------------------------------------------------------------------------------------
+import numpy as np
+import pandas as pd
+from scipy.linalg import cho_factor, cho_solve, solve_triangular
+from scipy.optimize import minimize
+
+# ----------------------------------------------------------------------------------------------------------------------
+# Define Modules Section
+# ----------------------------------------------------------------------------------------------------------------------
+def proxy_effects(proxy, names, nsample=10000, npoint=11, seed=None):
+    """Calculate the Main Effects of the Factors from a Proxy
+
+    The main effect of a factor is the mean of the proxy over the other factors, sampled uniformly over the unit
+    hypercube, with the factor fixed at each of the coded values 0, 0.1, ... 1.0.
+
+    Parameters
+    ----------
+    proxy : dict
+        Proxy from proxy_fit
+    names : list
+        Factor names
+    nsample : int
+        Number of samples of the other factors
+    npoint : int
+        Number of coded values for each factor
+    seed : int
+        Random number generator seed, None for a random seed
+
+    Returns
+    -------
+    effects : DataFrame
+        Main effect of each factor (columns) at each coded value (index)
+    """
+
+    rng     = np.random.default_rng(seed)
+    sample  = rng.random((nsample, len(names)))
+    coded   = np.linspace(0.0, 1.0, npoint)
+    effects = pd.DataFrame(index=pd.Index(coded, name='Coded'))
+    for i, name in enumerate(names):
+        x             = np.tile(sample, (npoint, 1))
+        x[:, i]       = np.repeat(coded, nsample)
+        effects[name] = proxy_eval(proxy, x).reshape(npoint, nsample).mean(axis=1)
+
+    return (effects)
+
+
+def proxy_eval(proxy, x, std=False, chunk=None):
+    """Evaluate a Proxy
+
+    Evaluates the proxy at the coded factor values in chunks of rows, so that the feature or kernel matrices for
+    millions of samples are not held in memory at the same time.
+
+    Parameters
+    ----------
+    proxy : dict
+        Proxy from proxy_fit
+    x : array
+        Coded factor values with one row per sample and one column per factor
+    std : bool
+        Also return the prediction standard deviation if True
+    chunk : int
+        Number of rows evaluated at a time, None to size the chunks from the number of training cases or terms
+
+    Returns
+    -------
+    y : array
+        Proxy value for each sample
+    s : array
+        Prediction standard deviation for each sample, only returned if std is True
+    """
+
+    x     = np.atleast_2d(np.asarray(x, dtype=float))
+    y     = np.empty(x.shape[0])
+    s     = np.empty(x.shape[0])
+    chunk = chunk or max(256, 2**22 // max(proxy['size'], 1))
+    for n in range(0, x.shape[0], chunk):
+        xc = x[n:n + chunk]
+        if proxy['method'] == 'Polynomial':
+            f              = proxy_features(xc, proxy['degree'])
+            y[n:n + chunk] = f @ proxy['coef']
+            if std:
+                s[n:n + chunk] = np.sqrt(np.maximum(np.einsum('ij,jk,ik->i', f, proxy['cov'], f), 0.0))
+        else:
+            k              = proxy_kernel(xc, proxy['x'], proxy['length'], proxy['scale'])
+            y[n:n + chunk] = proxy['ymean'] + proxy['ystd'] * (k @ proxy['alpha'])
+            if std:
+                v              = solve_triangular(proxy['chol'], k.T, lower=True)
+                s[n:n + chunk] = proxy['ystd'] * np.sqrt(np.maximum(proxy['scale'] - (v**2).sum(axis=0), 0.0))
+
+    if std:
+        return (y, s)
+    return (y)
+
+
+def proxy_features(x, degree):
+    """Polynomial Features of the Coded Factor Values
+
+    The features are the constant, the factors and, for degree two, the squares and the products of the pairs of
+    factors, with the coded values shifted to -1 to +1 to improve the conditioning of the least squares problem.
+
+    Parameters
+    ----------
+    x : array
+        Coded factor values with one row per sample and one column per factor
+    degree : int
+        Polynomial degree, one or two
+
+    Returns
+    -------
+    features : array
+        Features with one row per sample and one column per term
+    """
+
+    z     = 2.0*x - 1.0
+    terms = [np.ones((z.shape[0], 1)), z]
+    if degree >= 2:
+        i, j = np.triu_indices(z.shape[1])
+        terms.append(z[:, i] * z[:, j])
+
+    return (np.hstack(terms))
+
+
+def proxy_fit(x, y, method='Polynomial', degree=2, nmax=2000, seed=0):
+    """Fit a Response Surface Proxy
+
+    Fits a polynomial or Gaussian process proxy to the responses of the cases, and calculates the coefficient of
+    determination (R2) and the leave-one-out predictive coefficient (Q2) and root mean square error. Cases with a
+    missing response are ignored. The Gaussian process needs an n by n kernel matrix and its Cholesky factorization,
+    so that for more than nmax cases it is fitted to a random sample of nmax cases, with the number of training cases
+    given by 'size', and the leave-one-out statistics are for the sample.
+
+    Parameters
+    ----------
+    x : array
+        Coded factor values with one row per case and one column per factor
+    y : array
+        Response for each case
+    method : str
+        'Polynomial' or 'Gaussian Process'
+    degree : int
+        Polynomial degree, one or two
+    nmax : int
+        Maximum number of cases used to fit a Gaussian process
+    seed : int
+        Random number generator seed for the Gaussian process sample
+
+    Returns
+    -------
+    proxy : dict
+        Fitted proxy, with the fit statistics ('n', 'terms', 'r2', 'q2', 'rmse')
+    """
+
+    x    = np.asarray(x, dtype=float)
+    y    = np.asarray(y, dtype=float)
+    keep = np.isfinite(y) & np.all(np.isfinite(x), axis=1)
+    x, y = x[keep], y[keep]
+    if method == 'Polynomial':
+        f     = proxy_features(x, degree)
+        coef  = np.linalg.lstsq(f, y, rcond=None)[0]
+        pinv  = np.linalg.pinv(f)
+        hat   = (f * pinv.T).sum(axis=1)
+        resid = y - f @ coef
+        dof   = len(y) - f.shape[1]
+        sigma = (resid**2).sum() / dof if dof > 0 else np.nan
+        proxy = {'method': method, 'degree': degree, 'coef': coef, 'cov': sigma * (pinv @ pinv.T),
+                 'xtx': pinv @ pinv.T, 'size': f.shape[1], 'terms': f.shape[1]}
+        with np.errstate(divide='ignore', invalid='ignore'):
+            loo = np.where(hat < 1.0 - 1e-8, resid / (1.0 - hat), np.nan)
+    else:
+        rng   = np.random.default_rng(seed)
+        index = np.sort(rng.choice(len(y), nmax, replace=False)) if len(y) > nmax else np.arange(len(y))
+        proxy = proxy_gp(x[index], y[index], seed=seed)
+        resid = y - proxy_eval(proxy, x)
+        loo   = proxy['loo']
+    #
+    # Fit Statistics
+    #
+    sst  = ((y - y.mean())**2).sum()
+    ysst = sst if method == 'Polynomial' else ((y[index] - y[index].mean())**2).sum()
+    proxy['n']    = len(y)
+    proxy['r2']   = 1.0 - (resid**2).sum() / sst if sst > 0 else np.nan
+    proxy['q2']   = 1.0 - (loo**2).sum() / ysst if ysst > 0 and np.all(np.isfinite(loo)) else np.nan
+    proxy['rmse'] = np.sqrt(np.mean(loo**2)) if np.all(np.isfinite(loo)) else np.nan
+    return (proxy)
+
+
+def proxy_gp(x, y, restarts=3, seed=0):
+    """Fit a Gaussian Process Proxy
+
+    Fits a Gaussian process with a squared exponential kernel, with a length scale for each factor, a signal variance
+    and a noise variance, to the standardized responses. The kernel parameters are found by minimizing the negative
+    log marginal likelihood with its analytical gradient, starting from a default and random initial parameters. The
+    squared distances are summed one factor at a time, so that only n by n arrays are needed for n cases.
+
+    Parameters
+    ----------
+    x : array
+        Coded factor values with one row per case and one column per factor
+    y : array
+        Response for each case
+    restarts : int
+        Number of random initial parameters in addition to the default
+    seed : int
+        Random number generator seed for the initial parameters
+
+    Returns
+    -------
+    proxy : dict
+        Gaussian process proxy, with the leave-one-out residuals ('loo')
+    """
+
+    (n, k) = x.shape
+    ymean  = y.mean()
+    ystd   = y.std() if y.std() > 0 else 1.0
+    yn     = (y - ymean) / ystd
+    bounds = [(np.log(0.01), np.log(100.0))]*k + [(np.log(1e-4), np.log(1e4)), (np.log(1e-8), np.log(1.0))]
+
+    def likelihood(theta):
+        length = np.exp(theta[:k])
+        scale  = np.exp(theta[k])
+        noise  = np.exp(theta[k + 1])
+        kern   = scale * np.exp(-0.5 * sum(((x[:, d, None] - x[None, :, d]) / length[d])**2 for d in range(k)))
+        try:
+            chol = cho_factor(kern + (noise + 1e-10)*np.eye(n), lower=True)
+        except np.linalg.LinAlgError:
+            return (1e25, np.zeros_like(theta))
+        alpha = cho_solve(chol, yn)
+        w     = np.outer(alpha, alpha) - cho_solve(chol, np.eye(n))
+        nll   = 0.5*yn @ alpha + np.log(np.diag(chol[0])).sum() + 0.5*n*np.log(2.0*np.pi)
+        grad  = np.empty_like(theta)
+        grad[k+1] = -0.5*np.trace(w) * noise
+        w         = w * kern
+        grad[:k]  = [-0.5*(w * (x[:, d, None] - x[None, :, d])**2).sum() / length[d]**2 for d in range(k)]
+        grad[k]   = -0.5*w.sum()
+        return (nll, grad)
+
+    rng   = np.random.default_rng(seed)
+    start = [np.array([np.log(0.5)]*k + [0.0, np.log(1e-4)])]
+    start = start + [np.array([rng.uniform(lo, hi) for lo, hi in bounds]) for _ in range(restarts)]
+    best  = min((minimize(likelihood, theta, jac=True, method='L-BFGS-B', bounds=bounds) for theta in start),
+                key=lambda result: result.fun)
+    #
+    # Final Factorization and Leave-One-Out Residuals
+    #
+    length = np.exp(best.x[:k])
+    scale  = np.exp(best.x[k])
+    noise  = np.exp(best.x[k + 1])
+    kern   = proxy_kernel(x, x, length, scale) + (noise + 1e-10)*np.eye(n)
+    chol   = np.linalg.cholesky(kern)
+    alpha  = cho_solve((chol, True), yn)
+    kinv   = cho_solve((chol, True), np.eye(n))
+    proxy  = {'method': 'Gaussian Process', 'x': x, 'alpha': alpha, 'chol': chol, 'length': length, 'scale': scale,
+              'noise': noise, 'ymean': ymean, 'ystd': ystd, 'loo': ystd * alpha / np.diag(kinv), 'size': n,
+              'terms': n}
+    return (proxy)
+
+
+def proxy_kernel(a, b, length, scale):
+    """Squared Exponential Kernel
+
+    Parameters
+    ----------
+    a : array
+        First set of coded factor values
+    b : array
+        Second set of coded factor values
+    length : array
+        Length scale for each factor
+    scale : float
+        Signal variance
+
+    Returns
+    -------
+    kernel : array
+        Kernel matrix with one row for each row of a and one column for each row of b
+    """
+
+    a = a / length
+    b = b / length
+    d = (a**2).sum(axis=1)[:, None] + (b**2).sum(axis=1)[None, :] - 2.0*(a @ b.T)
+    return (scale * np.exp(-0.5*np.maximum(d, 0.0)))
+
+
+def proxy_select(proxy, candidates, nselect):
+    """Select the Most Informative Cases from a Set of Candidates
+
+    Selects a batch of cases from the candidates by taking the candidate with the largest prediction variance, and
+    then reducing the variance of the other candidates by their covariance with the selected candidate, as if the
+    selected case had been run, before selecting the next candidate. The variance only depends on the factor values of
+    the cases, so that the batch can be selected before the cases are run. This is a pivoted Cholesky factorization of
+    the candidates' posterior covariance matrix, so that only one row of the matrix is calculated for each case. For a
+    polynomial proxy the variance is that of the least squares fit with unit residual variance.
+
+    Parameters
+    ----------
+    proxy : dict
+        Proxy from proxy_fit
+    candidates : array
+        Coded factor values of the candidates, with one row per candidate and one column per factor
+    nselect : int
+        Number of cases to select
+
+    Returns
+    -------
+    select : list
+        Index of the selected candidates in the order selected
+    """
+
+    candidates = np.asarray(candidates, dtype=float)
+    if proxy['method'] == 'Polynomial':
+        f     = proxy_features(candidates, proxy['degree'])
+        g     = f @ proxy['xtx']
+        var   = (g * f).sum(axis=1)
+        noise = 1.0
+    else:
+        w     = solve_triangular(proxy['chol'], proxy_kernel(proxy['x'], candidates, proxy['length'], proxy['scale']),
+                                 lower=True)
+        var   = proxy['scale'] - (w**2).sum(axis=0)
+        noise = proxy['noise'] + 1e-10
+    #
+    # Greedy Selection with the Variance Conditioned on the Selected Candidates
+    #
+    var    = np.maximum(var, 0.0)
+    vecs   = []
+    select = []
+    for n in range(min(nselect, len(candidates))):
+        p = int(np.argmax(np.where(np.isin(np.arange(len(candidates)), select), -np.inf, var)))
+        if proxy['method'] == 'Polynomial':
+            cov = f @ g[p]
+        else:
+            cov = proxy_kernel(candidates, candidates[p:p + 1], proxy['length'], proxy['scale'])[:, 0] - w.T @ w[:, p]
+        for v in vecs:
+            cov = cov - v * v[p]
+        v   = cov / np.sqrt(var[p] + noise)
+        var = np.maximum(var - v**2, 0.0)
+        vecs.append(v)
+        select.append(p)
+
+    return (select)
+
+
+def proxy_statistics(proxy, nfactor, nsample=1000000, seed=None, chunk=65536):
+    """Calculate the Response Statistics from a Proxy
+
+    Evaluates the proxy for samples drawn uniformly over the unit hypercube, in chunks, and returns the mean, standard
+    deviation and the 10, 50 and 90 percentiles of the response.
+
+    Parameters
+    ----------
+    proxy : dict
+        Proxy from proxy_fit
+    nfactor : int
+        Number of factors
+    nsample : int
+        Number of samples
+    seed : int
+        Random number generator seed, None for a random seed
+    chunk : int
+        Number of samples generated and evaluated at a time
+
+    Returns
+    -------
+    stats : dict
+        Response statistics ('Mean', 'Std', 'P10', 'P50' and 'P90', where P10 is the 10th percentile)
+    """
+
+    rng = np.random.default_rng(seed)
+    y   = np.concatenate([proxy_eval(proxy, rng.random((min(chunk, nsample - n), nfactor)))
+                          for n in range(0, nsample, chunk)])
+    (p10, p50, p90) = np.percentile(y, [10, 50, 90])
+    return ({'Mean': y.mean(), 'Std': y.std(), 'P10': p10, 'P50': p50, 'P90': p90})
+
+
+def proxy_tornado(proxy, names, best):
+    """Calculate the Tornado Data from a Proxy
+
+    For each factor the proxy is evaluated at the factor Low (0) and High (1) coded values, with the other factors at
+    their Best coded values, and the factors are sorted by the absolute swing in the response.
+
+    Parameters
+    ----------
+    proxy : dict
+        Proxy from proxy_fit
+    names : list
+        Factor names
+    best : array
+        Best coded value of each factor
+
+    Returns
+    -------
+    tornado : DataFrame
+        Base, Low and High response and the swing (High - Low) for each factor
+    """
+
+    k       = len(names)
+    x       = np.tile(np.asarray(best, dtype=float), (2*k + 1, 1))
+    x[np.arange(k), np.arange(k)]     = 0.0
+    x[k + np.arange(k), np.arange(k)] = 1.0
+    y       = proxy_eval(proxy, x)
+    tornado = pd.DataFrame({'Factor': names, 'Base': y[-1], 'Low': y[:k], 'High': y[k:2*k],
+                            'Swing': y[k:2*k] - y[:k]})
+    order   = np.argsort(-np.abs(tornado['Swing'].to_numpy()), kind='stable')
+    return (tornado.iloc[order].reset_index(drop=True))
+
+
+# ======================================================================================================================
+# End of OPM_PROXY.PY
+# ======================================================================================================================
@@ -0,0 +1,368 @@
+# ======================================================================================================================
+#
+"""OPM_QUEUE.py - Job Queue Processing Utilities
+
+This module contains the routines used to process the OPMRUN job queue that do not depend on the GUI, for example
+determining the number of CPUs a job requires and selecting which queued jobs can be run concurrently without
+exceeding the number of CPUs available on the system.
+
+Program Documentation
+---------------------
+Only Python 3 is supported and tested Python2 support has been depreciated.
+
+2026.10.18 - Added queue reading, job output files and job status routines for the headless batch runner, and moved
+             the flow_job routine here from OPMRUN.
+2026.10.18 - Added background reader for OPM Flow output and moved the process kill and ANSI escape code routines here
+             from OPM_COMMON.
+2026.10.18 - New module initial release for concurrent foreground job processing.
+
+Copyright Notice
+----------------
+This file is part of the Open Porous Media project (OPM).
+
+OPM is free software: you can redistribute it and/or modify it under the terms of the GNU General Public License as
+published by the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+
+OPM is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the aforementioned GNU General Public Licenses for more
+details.
+
+Copyright (C) 2022-2026 OPM-OP AS
+
+Author  : David Baxendale et al
+          info@opm-op.com
+Version : 2026.10.18
+Date    : 18-Oct-2026
+"""
+# ----------------------------------------------------------------------------------------------------------------------
+# 3456789012345678901234567890123456789012345678901234567890123456789012345678901234567890123456789012345678901234567890
+#        1         2         3         4         5         6         7         8         9         0         1         2
+#        0         0         0         0         0         0         0         0         0         1         1         1
+# ----------------------------------------------------------------------------------------------------------------------
+#
+# ----------------------------------------------------------------------------------------------------------------------
+# Import Modules Section
+# ----------------------------------------------------------------------------------------------------------------------
+import re
+from pathlib import Path
+
+import psutil
+
+# ----------------------------------------------------------------------------------------------------------------------
+# Define Modules Section
+# ----------------------------------------------------------------------------------------------------------------------
+def flow_job(cmd):
+    """Define Job Parameters for OPM Flow
+
+    Converts job parameters into various forms for processing a flow simulation job. The routine reduces duplication
+    of code for job parameter manipulation
+
+    Parameters
+    ----------
+    cmd : str
+        Job command
+
+    Returns
+    -------
+    jobcmd : str
+        The job command
+    jobpath : str
+        The path of the job file being processed
+    jobbase : str
+        The base name of the the job file being processed
+    jobroot : str
+        The base root  of the the job file being processed
+    joblog : str
+        The job file with suffix '.LOG'
+    """
+
+    debug   = False
+    istart  = cmd.find('=')
+    job     = cmd[istart + 1:]
+    jobcmd  = cmd[:istart + 1]
+    jobpath = Path(job).parents[0]
+    jobbase = Path(job).name
+    jobroot = Path(job).stem
+    joblog  = Path(jobbase).with_suffix('.LOG')
+    if debug:
+        print('job     : ' + str(job    ))
+        print('jobcmd  : ' + str(jobcmd ))
+        print('jobpath : ' + str(jobpath))
+        print('jobbase : ' + str(jobbase))
+        print('jobroot : ' + str(jobroot))
+        print('joblog  : ' + str(joblog ))
+    return job, jobcmd, jobpath, jobbase, jobroot, joblog
+
+
+def job_check(line):
+    """Check a Line of OPM Flow Output for Job Failures
+
+    Checks a line of OPM Flow output for exceptions, unrecoverable errors and segmentation faults, so that the same
+    tests are used for all the job processing options.
+
+    Parameters
+    ----------
+    line : str
+        Line of OPM Flow output
+
+    Returns
+    -------
+    status : str
+        Set to 'Exception' for exceptions, 'Failed' for unrecoverable errors, 'Segmentation' for segmentation faults,
+        otherwise None
+    """
+
+    if 'Exception' in line or 'exception' in line:
+        return 'Exception'
+    if 'Error: Unrecoverable errors' in line:
+        return 'Failed'
+    if 'Segmentation fault' in line:
+        return 'Segmentation'
+    return None
+
+
+def job_cpus(cmd):
+    """Get the Number of CPUs Required by a Job
+
+    Gets the number of CPUs required by an OPMRUN queue command from the mpirun (or mpiexec) number of processes
+    option, for example 'mpirun -np 4 flow --parameter-file=CASE.param' requires four CPUs. Sequential jobs require one
+    CPU.
+
+    Parameters
+    ----------
+    cmd : str
+        Job command
+
+    Returns
+    -------
+    cpus : int
+        The number of CPUs required by the job
+    """
+
+    match = re.search(r'\b(?:mpirun|mpiexec)\b.*?\s(?:-np|--np|-n)(?:\s+|=)(\d+)', cmd)
+    if match:
+        return max(int(match.group(1)), 1)
+    return 1
+
+
+def job_extensions(windows=False):
+    """Get the OPM Flow Output File Extensions
+
+    Gets the list of OPM Flow output file extensions that are removed before a job is run. Both upper and lower case
+    extensions are returned, except on Windows where the file names are not case sensitive.
+
+    Parameters
+    ----------
+    windows : bool
+        Set to True if running on Windows, otherwise False
+
+    Returns
+    -------
+    jobext : list
+        List of OPM Flow output file extensions
+    """
+
+    upper = ['.DBG', '.DBPRTX', '.ECLEND', '.EGRID', '.ERROR', '.H5', '.INFOSTEP', '.INIT', '.INSPEC', '.LOG',
+             '.MSG', '.PRT', '.RSM', '.RSSPEC', '.SMSPEC', '.UNRST', '.UNSMRY']
+    if windows:
+        return upper
+    return upper + [item.lower() for item in upper]
+
+
+def job_kill(pid):
+    """Kill a Job Process and All It's Children Processes
+
+    Kills a running process and all of the associated child processes, without any confirmation, so that it can be used
+    from both the GUI and background reader threads.
+
+    Parameters
+    ----------
+    pid : int
+        Main process to be killed.
+
+    Returns
+    -------
+    killed : list
+        List of processes killed.
+    """
+
+    killed = []
+    try:
+        process = psutil.Process(pid)
+        for proc in process.children(recursive=True):
+            killed.append(proc.pid)
+            proc.kill()
+
+        killed.append(process.pid)
+        process.kill()
+
+    except psutil.Error:
+        pass
+
+    return killed
+
+
+def job_pack(jobcpus, usedcpus, ncpu):
+    """Select Queued Jobs to Start Without Exceeding the Number of CPUs
+
+    Selects jobs from the pending jobs, in queue order, that fit into the CPUs not used by the running jobs (first fit
+    packing), so that smaller jobs further down the queue can use CPUs that a larger job cannot. A job that requires
+    more CPUs than are available on the system is only started when no other jobs are running, and is then run on its
+    own, in order not to block the queue.
+
+    Parameters
+    ----------
+    jobcpus : list
+        Number of CPUs required by each pending job in queue order
+    usedcpus : int
+        Number of CPUs used by the running jobs
+    ncpu : int
+        Number of CPUs available on the system
+
+    Returns
+    -------
+    jobs : list
+        Indices of the pending jobs to start
+    """
+
+    jobs = []
+    free = ncpu - usedcpus
+    for n, cpus in enumerate(jobcpus):
+        if cpus <= free:
+            jobs.append(n)
+            free = free - cpus
+        elif cpus > ncpu and usedcpus == 0 and not jobs:
+            jobs.append(n)
+            break
+    return jobs
+
+
+def job_reader(jobproc, command, jobque, jobstat):
+    """Read OPM Flow Output in a Background Thread
+
+    Reads the output of a running OPM Flow job line by line, removes the ANSI escape codes and checks each line for
+    exceptions, unrecoverable errors and segmentation faults, before putting the line on the output queue. The queue
+    should be bounded, so that if the output is not being processed the reader waits rather than storing all of the
+    job's output in memory. None is put on the queue once all the output has been read. Exceptions from mpirun jobs
+    result in the job being killed, as mpirun jobs may hang otherwise.
+
+    Parameters
+    ----------
+    jobproc : subprocess.Popen
+        The running job process with the standard output piped as text
+    command : str
+        The OPM Flow command being executed
+    jobque : queue.Queue
+        Output queue for the job's output lines
+    jobstat : dict
+        Job status dictionary, where 'failjob' and 'segmjob' are set to True for failed jobs and segmentation faults,
+        the processes killed are stored in 'killed', and lines with errors are appended to 'errors'
+
+    Returns
+    -------
+    None
+    """
+
+    try:
+        for line in jobproc.stdout:
+            line   = remove_ansii_escape_codes(line.rstrip())
+            status = job_check(line)
+            if status in ['Exception', 'Failed']:
+                jobstat['failjob'] = True
+                jobstat['killed' ] = jobproc.pid
+                jobstat['errors' ].append(line)
+                #
+                # Fix for mpiruns hanging
+                #
+                if status == 'Exception' and 'mpirun' in command:
+                    jobstat['killed'] = job_kill(jobproc.pid)
+
+            elif status == 'Segmentation':
+                jobstat['segmjob'] = True
+
+            jobque.put(line)
+    finally:
+        jobque.put(None)
+
+
+def job_status(failjob, killjob, segmjob, returncode):
+    """Get the Completion Status of a Job
+
+    Classifies a completed job in the same order of precedence as the foreground job processing; failed jobs,
+    killed jobs, and segmentation faults or non-zero exit codes, otherwise the job has completed.
+
+    Parameters
+    ----------
+    failjob : bool
+        True if an OPM Flow exception or unrecoverable error was found
+    killjob : bool
+        True if the job was killed by the user
+    segmjob : bool
+        True if a segmentation fault was found
+    returncode : int
+        Exit code of the job process
+
+    Returns
+    -------
+    status : str
+        One of 'Failed', 'Killed', 'Segmentation' or 'Completed'
+    """
+
+    if failjob:
+        return 'Failed'
+    if killjob:
+        return 'Killed'
+    if segmjob or returncode != 0:
+        return 'Segmentation'
+    return 'Completed'
+
+
+def queue_read(filename):
+    """Read an OPMRUN Queue File
+
+    Reads the jobs from an OPMRUN queue file, that is all the records containing an OPM Flow command.
+
+    Parameters
+    ----------
+    filename : str
+        OPMRUN queue file name
+
+    Returns
+    -------
+    joblist : list
+        Job list for the queue
+    """
+
+    joblist = []
+    with open(filename, 'r') as file:
+        for line in file:
+            if 'flow' in line:
+                joblist.append(line.rstrip())
+    return joblist
+
+
+def remove_ansii_escape_codes(linein):
+    """Remove ASCII Escape Codes
+
+    Removes ascii escape code sequence from a string, based on  Martijn Pieters's answer with Jeff's regexp and
+    Édouard Lopez answer on stack overflow
+    https://stackoverflow.com/questions/14693701/how-can-i-remove-the-ansi-escape-sequences-from-a-string-in-python
+
+    Parameters
+    ----------
+    linein : str
+        String to have the ascii escape sequences removed.
+
+    Returns
+    -------
+    lineout : str
+        Returns line without the ascii escape codes
+    """
+
+    ansi_escape = re.compile(r'(?:\x1B[@-_]|[\x80-\x9F])[0-?]*[ -/]*[@-~]')
+    lineout     = ansi_escape.sub('', linein)
+    return lineout
+
+# ======================================================================================================================
+# End of OPM_QUEUE.PY
+# ======================================================================================================================
@@ -10,7 +10,8 @@ with Low, Best and High estimates. The utility generates both the required OPM F
 various sensitivity scenarios. A sensitivity scenario is a combination of the the various sensitivity factors, for
 example one can run all the Low factors as one sensitivity case, or a full factorial scenario on the Low and High
 sensitivity factors. Various Experimental Designs scenarios are included in the package, including full factorial,
-two-level full factorial, Plackett-Burman and Box-Behnken designs based on the pyDOE3 package.
+two-level full factorial, Plackett-Burman and Box-Behnken designs based on the pyDOE3 package, as well as Latin
+Hypercube, Maximin Latin Hypercube and Scrambled Sobol designs for a given number of runs.
 
 The factors (the statistical term for the variables being used) are defined as $X01 to $X20, as presented on the
 "Factors" tab. These names are used in a "Base" template input deck to define the location and values to be substituted
@@ -27,6 +28,10 @@ values for the Best case.
 
 The buttons at the base of the screen perform the following actions:
 
+"Adaptive" - Runs an initial Maximin Latin Hypercube design, fits a proxy to a summary response and then runs
+           batches of the cases the proxy is most uncertain about, until the response statistics converge.
+"Analyse" - Fits a proxy to a summary response of the completed cases and reports the tornado, main effects
+           and response statistics.
 "Base" - Selects the "Base" template file and once loaded is displayed in the "Base" tab.
 "Clear" - Clears the factor descriptions and values.
 "Copy"  - Copies the displayed factor table to the clipboard.
@@ -45,6 +50,21 @@ Program Documentation
 ---------------------
 Only Python 3 is supported and tested Python2 support has been depreciated.
 
+2026.10.18 - Sensitivity cases are now written on a process pool, with the factor placeholders found once and the base
+             DATA file memory mapped by the worker processes, and each case written in a single pass.
+           - Added thin cases option, where the unchanged sections of the base DATA file are written once as shared
+             INCLUDE files and only the sections with factors are written to each case DATA file.
+           - Added Latin Hypercube, Maximin Latin Hypercube and Scrambled Sobol designs with continuous factor ranges
+             and a user defined number of runs. The designs are generated in batches, and the limit of five factors
+             for the Factorial Low, Best and High Full design has been replaced by a limit of 100,000 runs for all
+             designs.
+           - Fixed the Factorial Low, Best and High Full and Box-Behnken designs, which did not set the Best and High
+             factor values.
+           - Added the Analyse option to fit a polynomial or Gaussian process proxy to a summary response of the
+             completed cases, with the tornado, main effect and response statistics from the proxy.
+           - Added the Adaptive option to run the cases in batches with the headless batch runner, where each new
+             batch is selected from the Gaussian process or polynomial proxy fitted to the completed cases, and to
+             stop once the response statistics converge.
 2025.09.19 - Switch from PySimpleGUI to FreeSimpleGUI package
            - Switch from pyDOE2 to pyDOE3 package
 2021.07-01 - Major re-factoring and function re-naming for consistency with other modules, together with minor bug
@@ -82,23 +102,357 @@ Date    : 17-Jul-2021
 # ----------------------------------------------------------------------------------------------------------------------
 # Import Modules Section
 # ----------------------------------------------------------------------------------------------------------------------
+import mmap
 import os
+import re
+import subprocess
+import sys
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from psutil import cpu_count
 #
 # Import Required Non-Standard Modules
 #
+import numpy as np
 import pandas as pd
 import FreeSimpleGUI as sg
 import pyDOE3
+from scipy.spatial import cKDTree
+from scipy.stats import qmc
 #
 # Import OPM Common Modules
 #
 from opmrun.opm_common import get_time, opm_popup, set_gui_options, window_debug
+from opmrun.opm_proxy import proxy_effects, proxy_fit, proxy_select, proxy_statistics, proxy_tornado
+#
+# Base DATA and PARAM File Template, Set in Each Worker Process by sensitivity_template
+#
+_template = {}
 
 # ----------------------------------------------------------------------------------------------------------------------
 # Define Modules Section
 # ----------------------------------------------------------------------------------------------------------------------
+def sensitivity_adaptive(basefile, header, factors, workers=None, thin=False, window1=None):
+    """ Run an Adaptive Sequential Sensitivity Ensemble
+
+    Runs an initial Maximin Latin Hypercube design and then adds batches of cases until the response statistics
+    converge. After each batch has been written, queued and run by the headless batch runner, a proxy is fitted to the
+    response of all the completed cases and the response statistics are calculated from the proxy. If the largest
+    change in the mean, P10, P50 and P90 since the previous batch, as a fraction of the P90 - P10 range, is less than
+    the tolerance the ensemble is stopped, otherwise the next batch is selected from a scrambled Sobol set of candidates
+    by proxy_select, that is the cases with the largest proxy uncertainty. The cases are appended to the design file,
+    so that the completed ensemble can be reviewed with sensitivity_analyse, and the statistics for each batch are
+    saved to the adaptive history file.
+
+    Parameters
+    ----------
+    basefile : str
+        The basefile used to generate all the cases
+    header : list
+        A list of of header names
+    factors : table
+        A table of design factors
+    workers : int
+        Number of worker processes used to write the cases, None for the number of CPUs
+    thin : bool
+        Write thin case DATA files that INCLUDE the shared unchanged sections of the base DATA file if True
+    window1 : FreeSimpleGUI window
+        The main window, refreshed while the jobs are running
+
+    Returns
+    -------
+    proxy : dict
+        The proxy fitted to the final batch, or None if no proxy was fitted
+    """
+
+    proxy    = None
+    scenario = 'Latin Hypercube Maximin'
+    layout1  = [[sg.Text('Response Summary Vector', size=(22, 1)),
+                 sg.Input('FOPT', key='_response_', size=(20, 1),
+                          tooltip='Summary Vector at the Final Date, for example FOPT, WOPT:OP1 or RPR:2')],
+                [sg.Text('Proxy', size=(22, 1)),
+                 sg.Combo(['Polynomial', 'Gaussian Process'], default_value='Gaussian Process', readonly=True,
+                          key='_method_', size=(18, 1))],
+                [sg.Text('Polynomial Degree', size=(22, 1)),
+                 sg.Spin([1, 2], initial_value=2, key='_degree_', size=(4, 1))],
+                [sg.Text('Initial Runs', size=(22, 1)), sg.Input('20', key='_ninit_', size=(20, 1))],
+                [sg.Text('Batch Runs', size=(22, 1)), sg.Input('8', key='_nbatch_', size=(20, 1))],
+                [sg.Text('Maximum Runs', size=(22, 1)), sg.Input('200', key='_nmax_', size=(20, 1))],
+                [sg.Text('Tolerance', size=(22, 1)),
+                 sg.Input('0.02', key='_tol_', size=(20, 1),
+                          tooltip='Largest Change in the Mean, P10, P50 and P90 as a Fraction of P90 - P10')],
+                [sg.Text('Proxy Samples', size=(22, 1)), sg.Input('100000', key='_nsample_', size=(20, 1))],
+                [sg.Text('Seed', size=(22, 1)), sg.Input('', key='_seed_', size=(20, 1))],
+                [sg.Text('CPUs', size=(22, 1)),
+                 sg.Spin(list(range(1, cpu_count() + 1)), initial_value=cpu_count(), key='_cpus_', size=(4, 1)),
+                 sg.Text('MPI Processes per Job'),
+                 sg.Spin(list(range(1, cpu_count() + 1)), initial_value=1, key='_jobnode_', size=(4, 1))],
+                [sg.Submit(), sg.Exit()]]
+    window2 = sg.Window('Adaptive Sensitivity Ensemble', layout=layout1, finalize=True,
+                        no_titlebar=False, grab_anywhere=False, keep_on_top=True)
+
+    while True:
+        (event, values) = window2.read()
+        if event == 'Exit' or event == sg.WIN_CLOSED:
+            window2.Close()
+            return (proxy)
+
+        if event == 'Submit':
+            try:
+                response = values['_response_'].strip().upper()
+                method   = values['_method_']
+                degree   = int(values['_degree_'])
+                ninit    = int(values['_ninit_'])
+                nbatch   = int(values['_nbatch_'])
+                nmax     = int(values['_nmax_'])
+                tol      = float(values['_tol_'])
+                nsample  = int(values['_nsample_'])
+                seed     = int(values['_seed_']) if values['_seed_'].strip() else None
+                cpus     = int(values['_cpus_'])
+                jobnode  = int(values['_jobnode_'])
+            except ValueError:
+                sg.popup_error('Runs, Samples, Seed and CPUs Must be Integers and the Tolerance a Number',
+                               no_titlebar=False, grab_anywhere=False, keep_on_top=True)
+                continue
+
+            if nbatch < 1 or nmax < ninit or tol <= 0.0:
+                sg.popup_error('Batch Runs Must be Positive, Maximum Runs at Least the Initial Runs and the ' +
+                               'Tolerance Positive', no_titlebar=False, grab_anywhere=False, keep_on_top=True)
+                continue
+            break
+
+    window2.Close()
+    checkerr = sensitivity_check(basefile, header, factors, scenario, ninit)
+    if checkerr:
+        return (proxy)
+    #
+    # Cleanup Existing Files and Define the Initial Design
+    #
+    sensitivity_clean(basefile)
+    df       = sensitivity_factors(header, factors)
+    ids      = list(df[header[0]])
+    names    = list(df[header[1]])
+    levels   = df[['Low', 'Best', 'High']].to_numpy(dtype=str)
+    nfactor  = len(names)
+    jobdata  = Path(basefile)
+    jobparam = Path(basefile).with_suffix('.param')
+    stem     = str(Path(basefile).with_name(Path(basefile).stem))
+    jobcmd   = 'flow --parameter-file='
+    if jobnode > 1:
+        jobcmd = 'mpirun -np ' + str(jobnode) + ' flow --parameter-file='
+
+    rng      = np.random.default_rng(seed)
+    statseed = int(rng.integers(2**31))
+    design   = np.concatenate(list(sensitivity_design(scenario, nfactor, ninit, seed)))
+    cases    = [sensitivity_case(scenario, n + 1, 'RUN' + str(n + 1).zfill(3), ids, names, values)
+                for n, values in enumerate(sensitivity_values(levels, design))]
+    ncase    = 0
+    last     = None
+    history  = []
+    sg.cprint('Adaptive:  ' + response + ' ' + method + ' Start')
+    #
+    # Write, Run and Fit Each Batch
+    #
+    while True:
+        batch = len(history) + 1
+        (joberr, jobs) = sensitivity_write_pool(cases, jobdata, jobparam, workers, thin)
+        if joberr:
+            break
+
+        sensitivity_write_design(cases, jobdata, append=batch > 1)
+        ncase   = ncase + len(cases)
+        jobque  = stem + '-ADAPTIVE-' + str(batch).zfill(2) + '.que'
+        sensitivity_queue(jobque, jobs, jobcmd)
+        sg.cprint('Adaptive:  Batch ' + str(batch) + ' Running ' + str(len(jobs)) + ' Cases from ' +
+                  str(Path(jobque).name))
+        exitcode = sensitivity_run_batch(jobque, cpus, window1)
+        if exitcode:
+            sg.cprint('Adaptive:  Batch ' + str(batch) + ' Warning Not All Jobs Completed, See ' +
+                      str(Path(jobque).with_suffix('.log').name))
+
+        results   = sensitivity_results(basefile, response)
+        xcols     = [ident.lstrip('$') for ident in ids]
+        (x, best) = sensitivity_coded(levels, results[xcols].to_numpy(dtype=str))
+        found     = np.isfinite(results['Response'].to_numpy(dtype=float))
+        if found.sum() < 2:
+            sg.popup_error('Not Enough Cases with the ' + response + ' Response to Fit a Proxy',
+                           no_titlebar=False, grab_anywhere=False, keep_on_top=True)
+            break
+        #
+        # Fit Proxy and Check the Change in the Response Statistics
+        #
+        try:
+            proxy = proxy_fit(x, results['Response'].to_numpy(dtype=float), method, degree)
+            stats = proxy_statistics(proxy, nfactor, nsample, statseed)
+        except Exception as error:
+            sg.popup_error('Error Fitting the Proxy', str(error) + ': ' + str(type(error)),
+                           no_titlebar=False, grab_anywhere=False, keep_on_top=True)
+            break
+
+        if proxy['size'] < proxy['n'] and method != 'Polynomial':
+            sg.cprint('Adaptive:  Gaussian Process Fitted to a Random Sample of ' + str(proxy['size']) + ' of ' +
+                      str(proxy['n']) + ' Cases')
+        change = np.inf
+        if last is not None:
+            scale  = max(stats['P90'] - stats['P10'], abs(stats['Mean']) * 1e-12, np.finfo(float).tiny)
+            change = max(abs(stats[key] - last[key]) for key in ['Mean', 'P10', 'P50', 'P90']) / scale
+
+        if method != 'Polynomial' or proxy['n'] > proxy['terms']:
+            last = stats
+        history.append({'Batch': batch, 'Cases': ncase, 'Found': int(found.sum()), 'Q2': proxy['q2'], **stats,
+                        'Change': change})
+        pd.DataFrame(history).to_csv(stem + '-ADAPTIVE.csv', index=False)
+        sg.cprint('Adaptive:  Batch ' + str(batch) + ' Cases ' + str(ncase) + ' Found ' + str(found.sum()) +
+                  ' Q2 ' + '{:.4f}'.format(proxy['q2']) + ' Change ' + '{:.4g}'.format(change) + '\n' +
+                  '  '.join(key + ' ' + '{:.6g}'.format(value) for key, value in stats.items()))
+        if change < tol:
+            sg.cprint('Adaptive:  Converged to a Tolerance of ' + str(tol) + ' After ' + str(ncase) + ' Cases')
+            break
+
+        nrun = min(nbatch, nmax - ncase)
+        if nrun <= 0:
+            sg.cprint('Adaptive:  Maximum of ' + str(nmax) + ' Runs Reached Without Converging')
+            break
+        #
+        # Select the Next Batch from the Candidates
+        #
+        pool   = qmc.Sobol(d=nfactor, seed=rng).random_base2(int(np.ceil(np.log2(max(256, 32 * nrun)))))
+        values = np.array(sensitivity_values(levels, pool), dtype=str)
+        select = proxy_select(proxy, sensitivity_coded(levels, values)[0], nrun)
+        cases  = [sensitivity_case(scenario, ncase + n + 1, 'RUN' + str(ncase + n + 1).zfill(3), ids, names,
+                                   values[i]) for n, i in enumerate(select)]
+
+    sg.cprint('Adaptive:  History Saved to ' + Path(stem).name + '-ADAPTIVE.csv, Use Analyse for the Tornado ' +
+              'and Main Effects')
+    sg.cprint('Adaptive:  End')
+    return (proxy)
+
+
+def sensitivity_analyse(basefile, header, factors):
+    """ Fit a Response Surface Proxy to a Completed Sensitivity Ensemble
+
+    Collects the final value of a summary vector from each case in the design file written when the cases were
+    generated, fits a polynomial or Gaussian process proxy to the responses against the coded factor values, and
+    reports the fit statistics, the tornado data, the main effects and the response statistics from sampling the
+    proxy. The results, tornado and main effect data are also saved to CSV files in the base directory.
+
+    Parameters
+    ----------
+    basefile : str
+        The basefile used to generate all the cases
+    header : list
+        A list of of header names
+    factors : table
+        A table of design factors
+
+    Returns
+    -------
+    proxy : dict
+        The fitted proxy, or None if the proxy was not fitted
+    """
+
+    proxy  = None
+    design = Path(basefile).with_name(Path(basefile).stem + '-DESIGN.csv')
+    if not design.is_file():
+        sg.popup_error('Sensitivity Design File Does Not Exist:\n\n' + str(design) + '\n\n' +
+                       'Generate and Run the Cases First', title='OPMRUN Sensitivity',
+                       no_titlebar=False, grab_anywhere=False, keep_on_top=True)
+        return (proxy)
+
+    layout1 = [[sg.Text('Response Summary Vector', size=(22, 1)),
+                sg.Input('FOPT', key='_response_', size=(20, 1),
+                         tooltip='Summary Vector at the Final Date, for example FOPT, WOPT:OP1 or RPR:2')],
+               [sg.Text('Proxy', size=(22, 1)),
+                sg.Combo(['Polynomial', 'Gaussian Process'], default_value='Polynomial', readonly=True,
+                         key='_method_', size=(18, 1))],
+               [sg.Text('Polynomial Degree', size=(22, 1)),
+                sg.Spin([1, 2], initial_value=2, key='_degree_', size=(4, 1))],
+               [sg.Text('Proxy Samples', size=(22, 1)), sg.Input('1000000', key='_nsample_', size=(20, 1))],
+               [sg.Text('Seed', size=(22, 1)), sg.Input('', key='_seed_', size=(20, 1))],
+               [sg.Submit(), sg.Exit()]]
+    window2 = sg.Window('Sensitivity Proxy Analysis', layout=layout1, finalize=True,
+                        no_titlebar=False, grab_anywhere=False, keep_on_top=True)
+
+    while True:
+        (event, values) = window2.read()
+        if event == 'Exit' or event == sg.WIN_CLOSED:
+            break
+
+        if event == 'Submit':
+            try:
+                response = values['_response_'].strip().upper()
+                method   = values['_method_']
+                degree   = int(values['_degree_'])
+                nsample  = int(values['_nsample_'])
+                seed     = int(values['_seed_']) if values['_seed_'].strip() else None
+            except ValueError:
+                sg.popup_error('Proxy Degree, Samples and Seed Must be Integers',
+                               no_titlebar=False, grab_anywhere=False, keep_on_top=True)
+                continue
+            #
+            # Collect the Responses and Code the Factor Values
+            #
+            sg.cprint('Analysis:  ' + response + ' ' + method + ' Start')
+            df      = sensitivity_factors(header, factors)
+            names   = list(df[header[1]])
+            levels  = df[['Low', 'Best', 'High']].to_numpy(dtype=str)
+            results = sensitivity_results(basefile, response)
+            xcols   = [ident.lstrip('$') for ident in df[header[0]]]
+            if set(xcols) != {col for col in results.columns if col.startswith('X')}:
+                sg.popup_error('The Factor Table Does Not Match the Sensitivity Design File:\n\n' + str(design),
+                               no_titlebar=False, grab_anywhere=False, keep_on_top=True)
+                continue
+
+            (x, best) = sensitivity_coded(levels, results[xcols].to_numpy(dtype=str))
+            found     = np.isfinite(results['Response'].to_numpy(dtype=float))
+            sg.cprint('Analysis:  Found ' + response + ' for ' + str(found.sum()) + ' of ' + str(len(found)) + ' Cases')
+            for case in results['Case'][~found]:
+                sg.cprint('Analysis:  Missing ' + str(case))
+            if found.sum() < 2:
+                sg.popup_error('Not Enough Cases with the ' + response + ' Response to Fit a Proxy',
+                               no_titlebar=False, grab_anywhere=False, keep_on_top=True)
+                continue
+            #
+            # Fit Proxy and Report
+            #
+            try:
+                proxy   = proxy_fit(x, results['Response'].to_numpy(dtype=float), method, degree)
+                tornado = proxy_tornado(proxy, names, best)
+                effects = proxy_effects(proxy, names, seed=seed)
+                stats   = proxy_statistics(proxy, len(names), nsample, seed)
+            except Exception as error:
+                sg.popup_error('Error Fitting the Proxy', str(error) + ': ' + str(type(error)),
+                               no_titlebar=False, grab_anywhere=False, keep_on_top=True)
+                continue
+
+            if proxy['n'] <= proxy['terms'] and method == 'Polynomial':
+                sg.cprint('Analysis:  Warning ' + str(proxy['terms']) + ' Terms for ' + str(proxy['n']) +
+                          ' Cases, Use More Cases or a Lower Degree')
+            if proxy['size'] < proxy['n'] and method != 'Polynomial':
+                sg.cprint('Analysis:  Gaussian Process Fitted to a Random Sample of ' + str(proxy['size']) + ' of ' +
+                          str(proxy['n']) + ' Cases, Leave-One-Out Statistics for the Sample')
+            sg.cprint('Analysis:  Cases ' + str(proxy['n']) + ' R2 ' + '{:.4f}'.format(proxy['r2']) +
+                      ' Q2 (Leave-One-Out) ' + '{:.4f}'.format(proxy['q2']) +
+                      ' RMSE (Leave-One-Out) ' + '{:.6g}'.format(proxy['rmse']))
+            sg.cprint('Analysis:  Tornado\n' + tornado.to_string(index=False, float_format='{:.6g}'.format))
+            sg.cprint('Analysis:  Statistics from ' + str(nsample) + ' Proxy Samples\n' +
+                      '  '.join(key + ' ' + '{:.6g}'.format(value) for key, value in stats.items()))
+
+            stem = Path(basefile).with_name(Path(basefile).stem)
+            results.to_csv(str(stem) + '-RESULTS.csv', index=False)
+            tornado.to_csv(str(stem) + '-TORNADO.csv', index=False)
+            effects.to_csv(str(stem) + '-EFFECTS.csv')
+            sg.cprint('Analysis:  Results, Tornado and Main Effects Saved to ' + Path(basefile).stem +
+                      '-RESULTS.csv, -TORNADO.csv and -EFFECTS.csv')
+            sg.cprint('Analysis:  End')
+            break
+
+    window2.Close()
+    return (proxy)
+
+
 def sensitivity_base_file(jobparam, jobsys, window1):
     """Add a OPM Flow Simulation job to the Job List Queue
 
@@ -216,9 +570,51 @@ def sensitivity_base_param(jobparam, jobbase, jobfile, jobmsg, jobsys):
                 title='OPMRUN Sensitivity', no_titlebar=False, grab_anywhere=False, keep_on_top=True)
 
 
-def sensitivity_check(basefile, header, factors, scenario):
+def sensitivity_case(scenario, jobnum, level, ids, names, values):
+    """ Define a Scenario Case
+
+    Defines a scenario case (job) from the factor identifiers, descriptions and the factor values for the case,
+    converted to strings, so that the case can be passed to a worker process.
+
+    Parameters
+    ----------
+    scenario : str
+        The job scenario
+    jobnum : int
+        The case job number
+    level : str
+        The factor level or design run name for the case
+    ids : list
+        The factor identifiers, the $Xnn placeholders in the base DATA file
+    names : list
+        The factor descriptions
+    values : list
+        The factor values for the case
+
+    Returns
+    -------
+    case : dict
+        The scenario, job number, level and the factor identifiers, descriptions and values for the case
+    """
+
+    case = {'scenario': scenario,
+            'jobnum'  : str(jobnum).zfill(3),
+            'level'   : str(level),
+            'ids'     : [str(x) for x in ids],
+            'names'   : [str(x) for x in names],
+            'values'  : [str(x) for x in values]}
+    return (case)
+
+
+def sensitivity_check(basefile, header, factors, scenario, nrun=None, maxrun=100000):
     """ Checks Files and Data Prior to Generating Sensitivity Scenarios
 
+    Each factor with a description or a value must have the description and the values used by the scenario, see
+    sensitivity_levels, and for the Latin Hypercube and Sobol designs a factor with non-numeric values must also have
+    a Best value. The number of runs is limited to maxrun, as all the cases are written before they are run and the
+    full factorial designs grow exponentially with the number of factors, for example 20 factors give 3**20 runs for
+    the Factorial Low, Best and High Full design.
+
     Parameters
     ----------
     basefile : str
@@ -229,6 +625,10 @@ def sensitivity_check(basefile, header, factors, scenario):
         A table of design factors
     scenario : str
         The type of scenario to be generated
+    nrun : int
+        The number of runs for the Latin Hypercube and Sobol designs
+    maxrun : int
+        The maximum number of runs
 
     Returns
     ------
@@ -258,13 +658,8 @@ def sensitivity_check(basefile, header, factors, scenario):
     # Factor Design Checks
     #
     try:
-        df   = pd.DataFrame(factors, columns=header)
-        low  = (df['Low' ].values == '').sum()
-        best = (df['Best'].values == '').sum()
-        high = (df['High'].values == '').sum()
-        df   = df[df != ''].dropna()
+        df   = sensitivity_factors(header, factors)
         nrow = df.shape[0]
-        ncol = df.shape[1]
 
     except Exception as error:
         checkerr = checkerr + 1
@@ -280,13 +675,35 @@ def sensitivity_check(basefile, header, factors, scenario):
         sg.cprint('Checkerr: No Factor Values')
         checkerr = checkerr + 1
 
-    if scenario == 'Low and High - One Job per Factor' and low != high:
-        sg.cprint('Checkerr: Low and High - One Job per Factor Error - ' +
-                  'Number of Factors for Low and High are Different')
-        checkerr = checkerr + 1
+    levels = sensitivity_levels(scenario)
+    for ident, count in df[header[0]].value_counts().items():
+        if not re.fullmatch(r'\$X\d\d', ident) or count > 1:
+            sg.cprint('Checkerr: Factor ' + ident + ' Error - Factor Identifier Must be a Unique $Xnn Placeholder')
+            checkerr = checkerr + 1
+
+    for row in df.to_dict('records'):
+        missing = [column for column in [header[1]] + levels if row[column] == '']
+        if scenario in sensitivity_designs() and row['Best'] == '':
+            numeric = pd.to_numeric(pd.Series([row['Low'], row['High']]), errors='coerce').notna().all()
+            missing = missing + ([] if numeric else ['Best'])
+        if missing:
+            sg.cprint('Checkerr: Factor ' + row[header[0]] + ' Error - ' + scenario + ' Needs the ' +
+                      ', '.join(missing) + ' Value(s)')
+            checkerr = checkerr + 1
 
     if scenario == 'Factorial Low, Best and High Full' and nrow >= 6:
-        sg.cprint('Checkerr: Factorial Low, Best and High Full Error - Number of Factors is Greater Than ' + str(nrow))
+        sg.cprint('Checkerr: Factorial Low, Best and High Full Warning - ' + str(nrow) + ' Factors Give ' +
+                  str(3**nrow) + ' Runs')
+
+    if scenario in sensitivity_designs() and (nrun is None or nrun < 2):
+        sg.cprint('Checkerr: ' + scenario + ' Error - Number of Runs Must be an Integer Greater Than One')
+        checkerr = checkerr + 1
+
+    nfull = {'Factorial Low and High Full': 2**nrow, 'Factorial Low, Best and High Full': 3**nrow}
+    ntest = nfull.get(scenario, (nrun or 0) if scenario in sensitivity_designs() else 0)
+    if ntest > maxrun:
+        sg.cprint('Checkerr: ' + scenario + ' Error - ' + str(ntest) + ' Runs Exceed the Maximum of ' +
+                  str(maxrun) + ' Runs, Reduce the Number of Factors or Runs')
         checkerr = checkerr + 1
     #
     # Checkerr Message
@@ -324,6 +741,127 @@ def sensitivity_clean(basefile):
         sg.cprint('WriteClean: Deleted ' + str(Path(job).name))
 
 
+def sensitivity_coded(levels, values):
+    """ Code the Factor Values on the Unit Interval
+
+    Codes the factor values of the cases on the unit interval, the inverse of sensitivity_values. A factor with
+    numeric Low and High values is coded linearly from zero at the Low value to one at the High value, and a factor
+    with non-numeric values is coded as 0, 0.5 and 1 for the Low, Best and High values.
+
+    Parameters
+    ----------
+    levels : array
+        The Low, Best and High values as strings, with one row per factor
+    values : array
+        The factor values as strings, with one row per case and one column per factor
+
+    Returns
+    -------
+    coded : array
+        The coded factor values, NaN if a non-numeric value is not one of the factor levels
+    best : array
+        The coded Best value of each factor
+    """
+
+    (low, mid, high) = [pd.to_numeric(pd.Series(levels[:, n]), errors='coerce').to_numpy(dtype=float)
+                        for n in range(3)]
+    numeric = np.isfinite(low) & np.isfinite(high)
+    span    = np.where(high != low, high - low, np.nan)
+    value   = pd.DataFrame(values).apply(pd.to_numeric, errors='coerce').to_numpy(dtype=float)
+    level   = np.select([values == levels[:, 0], values == levels[:, 1], values == levels[:, 2]], [0.0, 0.5, 1.0],
+                        np.nan)
+    coded   = np.where(numeric, np.nan_to_num((value - low) / span, nan=0.5), level)
+    coded   = np.where(numeric & ~np.isfinite(value), np.nan, coded)
+    best    = np.where(numeric & np.isfinite(mid), np.nan_to_num((mid - low) / span, nan=0.5), 0.5)
+    return (coded, best)
+
+
+def sensitivity_design(scenario, nfactor, nrun=None, seed=None, batch=4096):
+    """ Generate the Design Matrix for a Factorial, Latin Hypercube or Sobol Scenario
+
+    Generates the design in batches of runs, so that large designs are not held as data frames. The full factorial
+    designs are generated from the run numbers in the same run order as pyDOE3 ff2n and fullfact, and the
+    Plackett-Burman and Box-Behnken designs are taken from pyDOE3. For these designs the batches contain the factor
+    levels, 0 for Low, 1 for Best and 2 for High.
+
+    The Latin Hypercube, Maximin Latin Hypercube and Sobol designs return batches of points in the unit hypercube,
+    which sensitivity_values maps on to the factor ranges. The Latin Hypercube is built from a random permutation of
+    the strata for each factor, and for the Maximin option the points are improved by sensitivity_maximin. The Sobol
+    sequence is Owen scrambled and generated in batches from scipy.stats.qmc.
+
+    Parameters
+    ----------
+    scenario : str
+        The type of scenario to be generated
+    nfactor : int
+        The number of factors
+    nrun : int
+        The number of runs for the Latin Hypercube and Sobol designs
+    seed : int
+        Random number generator seed for the Latin Hypercube and Sobol designs, None for a random seed
+    batch : int
+        The number of runs in each batch
+
+    Returns
+    -------
+    design : array
+        Yields the design for each batch of runs, an integer array of factor levels or a float array of points in the
+        unit hypercube, with one row per run and one column per factor
+    """
+
+    rng = np.random.default_rng(seed)
+    #
+    # Full Factorial Designs
+    #
+    if scenario in ['Factorial Low and High Full', 'Factorial Low, Best and High Full']:
+        (nlevel, step, order) = (2, 2, 'C') if 'Low and High' in scenario else (3, 1, 'F')
+        for n in range(0, nlevel**nfactor, batch):
+            run    = np.arange(n, min(n + batch, nlevel**nfactor))
+            design = np.stack(np.unravel_index(run, [nlevel]*nfactor, order=order), axis=1)
+            yield (design*step)
+    #
+    # Plackett-Burman and Box-Behnken Designs
+    #
+    elif scenario in ['Factorial Low and High Plackett-Burman', 'Factorial Low, Best and High Box-Behnken']:
+        if 'Plackett-Burman' in scenario:
+            design = pyDOE3.pbdesign(nfactor)
+        else:
+            design = pyDOE3.bbdesign(nfactor)
+        design = np.rint(design).astype(int) + 1
+        for n in range(0, design.shape[0], batch):
+            yield (design[n:n + batch])
+    #
+    # Scrambled Sobol Design
+    #
+    elif scenario == 'Sobol Scrambled':
+        sobol = qmc.Sobol(d=nfactor, scramble=True, seed=rng)
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', UserWarning)
+            for n in range(0, nrun, batch):
+                yield (sobol.random(min(batch, nrun - n)))
+    #
+    # Latin Hypercube and Maximin Latin Hypercube Designs
+    #
+    elif scenario in ['Latin Hypercube', 'Latin Hypercube Maximin']:
+        design = (np.argsort(rng.random((nrun, nfactor)), axis=0) + rng.random((nrun, nfactor))) / nrun
+        if 'Maximin' in scenario:
+            design = sensitivity_maximin(design, rng)
+        for n in range(0, nrun, batch):
+            yield (design[n:n + batch])
+
+
+def sensitivity_designs():
+    """ List of the Latin Hypercube and Sobol Design Scenarios
+
+    Returns
+    -------
+    designs : list
+        The Latin Hypercube and Sobol scenarios that use a continuous factor range and a number of runs
+    """
+
+    return (['Latin Hypercube', 'Latin Hypercube Maximin', 'Sobol Scrambled'])
+
+
 def sensitivity_edit_factor(header, nrow, factors):
     """ Edit Factor Table
 
@@ -396,6 +934,311 @@ def sensitivity_edit_factor(header, nrow, factors):
     return factors
 
 
+def sensitivity_factors(header, factors):
+    """ Define the Factors Used from the Table of Design Factors
+
+    Returns the rows of the factor table with a description or a value, with blank values kept as empty strings, so
+    that a factor without the values a scenario does not use, for example the Best value for the Low and High
+    designs, is kept with its own $Xnn identifier.
+
+    Parameters
+    ----------
+    header : list
+        A list of of header names
+    factors : table
+        A table of design factors
+
+    Returns
+    -------
+    df : DataFrame
+        The factors used, with one row per factor
+    """
+
+    df = pd.DataFrame(factors, columns=header).fillna('').astype(str)
+    df = df.apply(lambda column: column.str.strip())
+    df = df[(df[header[1:]] != '').any(axis=1)].reset_index(drop=True)
+    return (df)
+
+
+def sensitivity_keywords():
+    """ Define the Keywords that Take No Data
+
+    Lists the section keywords and the common keywords that take no data, which are followed by another keyword, and
+    so a block of keywords in the base DATA file can start after them, see sensitivity_write_shared.
+
+    Returns
+    -------
+    keywords : list
+        The keywords that take no data
+    """
+
+    keywords = ['RUNSPEC', 'GRID', 'EDIT', 'PROPS', 'REGIONS', 'SOLUTION', 'SUMMARY', 'SCHEDULE',
+                'OIL', 'WATER', 'GAS', 'DISGAS', 'VAPOIL', 'VAPWAT', 'BRINE', 'SOLVENT', 'POLYMER', 'FOAM', 'TEMP',
+                'THERMAL', 'CO2STORE', 'H2STORE', 'METRIC', 'FIELD', 'LAB', 'PVT-M', 'UNIFIN', 'UNIFOUT', 'NOSIM',
+                'ECHO', 'NOECHO', 'NOINSPEC', 'NORSSPEC', 'NEWTRAN', 'OLDTRAN', 'ALL', 'EXCEL', 'RPTONLY', 'RUNSUM',
+                'SEPARATE', 'ENDBOX', 'END']
+    return (keywords)
+
+
+def sensitivity_levels(scenario):
+    """ List the Factor Levels Used by a Scenario
+
+    Parameters
+    ----------
+    scenario : str
+        The type of scenario to be generated
+
+    Returns
+    -------
+    levels : list
+        The Low, Best and High columns of the factor table used by the scenario, the Low and High values for the Latin
+        Hypercube and Sobol designs
+    """
+
+    if scenario in sensitivity_designs():
+        return (['Low', 'High'])
+    levels = [level for level in ['Low', 'Best', 'High'] if level in scenario]
+    return (levels)
+
+
+def sensitivity_maximin(design, rng, iterations=None):
+    """ Improve the Minimum Distance Between the Points of a Latin Hypercube Design
+
+    Improves a Latin Hypercube design by exchanging the factor values between pairs of runs, which keeps the design a
+    Latin Hypercube. At each iteration one point of the closest pair of points exchanges the value of a random factor
+    with a random point, and the exchange is kept if the minimum distance between the points does not decrease. The
+    nearest neighbour distances are found once with a k-d tree and are then updated for the two points that have been
+    moved, so that each iteration is linear in the number of runs.
+
+    Parameters
+    ----------
+    design : array
+        Latin Hypercube design with one row per run and one column per factor
+    rng : Generator
+        NumPy random number generator
+    iterations : int
+        The number of exchanges to try, None for 100 times the number of factors
+
+    Returns
+    -------
+    design : array
+        The improved Latin Hypercube design
+    """
+
+    (nrun, nfactor) = design.shape
+    iterations      = iterations or 100*nfactor
+    (dist, near)    = cKDTree(design).query(design, k=2)
+    (dist, near)    = (dist[:, 1], near[:, 1])
+    #
+    # Exchange Factor Values Between a Point of the Closest Pair and a Random Point
+    #
+    for n in range(iterations):
+        i = int(np.argmin(dist))
+        j = int(rng.integers(nrun - 1))
+        j = j + (j >= i)
+        k = int(rng.integers(nfactor))
+        trial          = design.copy()
+        trial[[i, j], k] = trial[[j, i], k]
+        #
+        # Update the Nearest Neighbours for the Moved Points and the Points Whose Nearest Neighbour Moved
+        #
+        disti    = np.sqrt(((trial - trial[i])**2).sum(axis=1))
+        distj    = np.sqrt(((trial - trial[j])**2).sum(axis=1))
+        (disti[i], distj[j]) = (np.inf, np.inf)
+        newdist  = np.minimum(dist, np.minimum(disti, distj))
+        newnear  = np.where(disti <= distj, i, j)
+        newnear  = np.where(newdist < dist, newnear, near)
+        for m in np.flatnonzero((near == i) | (near == j)):
+            distm       = np.sqrt(((trial - trial[m])**2).sum(axis=1))
+            distm[m]    = np.inf
+            newnear[m]  = np.argmin(distm)
+            newdist[m]  = distm[newnear[m]]
+        (newdist[i], newnear[i]) = (disti.min(), np.argmin(disti))
+        (newdist[j], newnear[j]) = (distj.min(), np.argmin(distj))
+        if newdist.min() >= dist.min():
+            (design, dist, near) = (trial, newdist, newnear)
+
+    return (design)
+
+
+def sensitivity_placeholders(jobdata, text=None):
+    """ Find the Factor Placeholders in the Base DATA File
+
+    Scans the base DATA file, memory mapped so that it is not read into memory, or the given text for the $Xnn factor
+    placeholders.
+
+    Parameters
+    ----------
+    jobdata : str
+        The base DATA file used to create the case DATA files
+    text : str
+        The DATA file text to be used instead of the base DATA file, None to scan the base DATA file
+
+    Returns
+    -------
+    spans : list
+        The (start, end, placeholder) byte offsets of each placeholder
+    """
+
+    if text is not None:
+        data = text.replace('\n', os.linesep).encode()
+    elif Path(jobdata).stat().st_size == 0:
+        data = b''
+    else:
+        with open(jobdata, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            return ([(m.start(), m.end(), m.group().decode()) for m in re.finditer(rb'\$X\d\d', data)])
+
+    return ([(m.start(), m.end(), m.group().decode()) for m in re.finditer(rb'\$X\d\d', data)])
+
+
+def sensitivity_queue(jobfile, jobs, jobcmd='flow --parameter-file='):
+    """ Write an OPMRUN Job Queue File
+
+    Parameters
+    ----------
+    jobfile : str
+        The job queue file
+    jobs : list
+        A list of the case PARAM files
+    jobcmd : str
+        The command used to run each PARAM file
+
+    Returns
+    -------
+    None
+    """
+
+    with open(jobfile, 'w') as file:
+        file.write('# \n')
+        file.write('# OPMRUN Queue File \n')
+        file.write('# \n')
+        file.write('# Date Created: ' + get_time() + '\n')
+        file.write('# Queue Length: ' + str(len(jobs)) + '\n')
+        file.write('# \n')
+        for job in jobs:
+            file.write(jobcmd + str(job) + '\n')
+
+        file.write('# \n')
+        file.write('# End of Queue \n')
+
+
+def sensitivity_records(filename, keywords):
+    """ Read Keyword Arrays from a Binary OPM Flow Output File
+
+    Reads the arrays of the selected keywords from a big endian Fortran unformatted file, for example the SMSPEC and
+    UNSMRY summary files, skipping over the data of the other keywords. If a keyword occurs more than once, the last
+    array is returned, so that for the UNSMRY file the PARAMS array is that of the last time step.
+
+    Parameters
+    ----------
+    filename : str
+        Binary OPM Flow output file name
+    keywords : list
+        The keywords to be read
+
+    Returns
+    -------
+    data : dict
+        Dictionary of the keyword arrays
+    """
+
+    dtypes = {'INTE': '>i4', 'REAL': '>f4', 'DOUB': '>f8', 'LOGI': '>i4', 'CHAR': 'S8'}
+    data   = dict()
+    with open(filename, 'rb') as file:
+        while True:
+            head = file.read(24)
+            if len(head) < 24:
+                break
+            keyword = head[4:12].decode('ascii', 'replace').strip()
+            count   = int.from_bytes(head[12:16], 'big', signed=True)
+            dtype   = head[16:20].decode('ascii', 'replace')
+            dtype   = 'S' + dtype[1:] if dtype.startswith('C0') else dtypes.get(dtype, '>i4')
+            size    = np.dtype(dtype).itemsize
+            blocks  = []
+            read    = 0
+            while read < count:
+                length = int.from_bytes(file.read(4), 'big', signed=True)
+                if keyword in keywords:
+                    blocks.append(np.frombuffer(file.read(length), dtype))
+                else:
+                    file.seek(length, 1)
+                file.seek(4, 1)
+                read = read + length // size
+            if keyword in keywords:
+                data[keyword] = np.concatenate(blocks) if blocks else np.array([], dtype)
+
+    return (data)
+
+
+def sensitivity_results(basefile, response):
+    """ Collect the Response of Each Case in the Sensitivity Design File
+
+    Reads the design file written when the cases were generated and adds the final value of the response summary
+    vector for each case, or NaN if the case summary files do not exist or do not contain the response.
+
+    Parameters
+    ----------
+    basefile : str
+        The basefile used to generate all the cases
+    response : str
+        Summary vector, for example FOPT, WOPT:OP1 or RPR:2
+
+    Returns
+    -------
+    results : DataFrame
+        The design file with the response of each case
+    """
+
+    design  = Path(basefile).with_name(Path(basefile).stem + '-DESIGN.csv')
+    results = pd.read_csv(design, dtype=str, keep_default_na=False)
+    values  = []
+    for case in results['Case']:
+        try:
+            values.append(sensitivity_summary(Path(basefile).with_name(case), response))
+        except (OSError, ValueError, KeyError, IndexError):
+            values.append(np.nan)
+
+    results['Response'] = values
+    return (results)
+
+
+def sensitivity_run_batch(jobque, cpus, window1=None):
+    """ Run a Job Queue File with the Headless Batch Runner
+
+    Runs the job queue with the OPMRUN headless batch runner as a separate process, with the jobs packed concurrently
+    on the CPUs, and waits for the jobs to complete while refreshing the main window. The batch runner messages are
+    written to a log file and the job summary to a JSON file, both named after the job queue file.
+
+    Parameters
+    ----------
+    jobque : str
+        The job queue file
+    cpus : int
+        Number of CPUs available for the jobs
+    window1 : FreeSimpleGUI window
+        The main window, refreshed while the jobs are running
+
+    Returns
+    -------
+    exitcode : int
+        Zero if all the jobs completed, otherwise non-zero
+    """
+
+    env     = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join([str(Path(__file__).resolve().parents[1])] +
+                                        ([env['PYTHONPATH']] if env.get('PYTHONPATH') else []))
+    command = [sys.executable, '-m', 'opmrun.opm_batch', str(jobque), '--concurrent', '--cpus', str(cpus), '--quiet',
+               '--summary', str(Path(jobque).with_suffix('.json'))]
+    with open(Path(jobque).with_suffix('.log'), 'w') as file:
+        process = subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=file, cwd=Path(jobque).parent, env=env)
+        while process.poll() is None:
+            if window1 is not None:
+                window1.refresh()
+            time.sleep(0.5)
+
+    return (process.returncode)
+
+
 def sensitivity_set_factors(header, nrow):
     """ Create Empty Factor Table
 
@@ -423,13 +1266,166 @@ def sensitivity_set_factors(header, nrow):
     return factors
 
 
-def sensitivity_write_cases(basefile, header, factors, scenario):
+def sensitivity_summary(jobdata, response):
+    """ Read the Final Value of a Summary Vector
+
+    Reads the final value of a summary vector from the SMSPEC and UNSMRY files of a case. The response is given as
+    the summary keyword, for example FOPT, optionally followed by a colon and the well or group name or the region or
+    block number, for example WOPT:OP1 or RPR:2.
+
+    Parameters
+    ----------
+    jobdata : str
+        The case DATA file
+    response : str
+        Summary vector
+
+    Returns
+    -------
+    value : float
+        The final value of the summary vector
+    """
+
+    (keyword, name) = (response.strip().upper().split(':', 1) + [''])[:2]
+    smspec = sensitivity_records(Path(jobdata).with_suffix('.SMSPEC'), ['KEYWORDS', 'WGNAMES', 'NAMES', 'NUMS'])
+    keys   = np.char.strip(smspec['KEYWORDS'].astype(str))
+    names  = smspec['NAMES'] if 'NAMES' in smspec else smspec.get('WGNAMES', np.zeros(len(keys), 'S8'))
+    names  = np.char.strip(names.astype(str))
+    nums   = smspec.get('NUMS', np.zeros(len(keys), int)).astype(str)
+    match  = keys == keyword
+    if name:
+        match = match & ((names == name.strip()) | (nums == name.strip()))
+    index  = np.flatnonzero(match)
+    if len(index) == 0:
+        raise ValueError('Summary Vector ' + response + ' Not Found in ' + str(Path(jobdata).with_suffix('.SMSPEC')))
+
+    params = sensitivity_records(Path(jobdata).with_suffix('.UNSMRY'), ['PARAMS'])['PARAMS']
+    return (float(params[index[0]]))
+
+
+def sensitivity_template(jobdata, jobparm, spans, text=None):
+    """ Set the Base DATA and PARAM File Template for a Worker Process
+
+    Reads the base PARAM file and memory maps the base DATA file, so that the DATA file is held once in the operating
+    system's file cache and shared by all the worker processes, rather than read into the memory of each process. The
+    factor placeholder offsets are found once by sensitivity_placeholders in the calling process, so that a case can be
+    written in one pass by copying the text between the placeholders and substituting the factor values. The routine
+    is the process pool initializer for sensitivity_write_pool.
+
+    Parameters
+    ----------
+    jobdata : str
+        The base DATA file used to create the case DATA files
+    jobparm : str
+        The base PARAM file used to create the case PARAM files
+    spans : list
+        The (start, end, placeholder) byte offsets of the $Xnn factor placeholders from sensitivity_placeholders
+    text : str
+        The DATA file text to be used instead of the base DATA file, for example the thin deck from
+        sensitivity_write_shared, None to memory map the base DATA file
+
+    Returns
+    -------
+    template : dict
+        The base file names, the DATA file data and placeholder offsets, and the PARAM file lines
+    """
+
+    with open(jobparm, 'r') as file:
+        lines = file.readlines()
+
+    if text is not None:
+        data = text.replace('\n', os.linesep).encode()
+    elif Path(jobdata).stat().st_size == 0:
+        data = b''
+    else:
+        with open(jobdata, 'rb') as file:
+            data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    _template['jobdata'] = jobdata
+    _template['jobparm'] = jobparm
+    _template['param']   = lines
+    _template['data']    = data
+    _template['spans']   = spans
+    return (_template)
+
+
+def sensitivity_values(levels, design):
+    """ Convert a Design Batch to Factor Values
+
+    Converts a batch of design runs from sensitivity_design to the factor values for each run. For the factorial
+    designs the factor levels select the Low, Best and High values. For the Latin Hypercube and Sobol designs a factor
+    with numeric Low and High values is sampled uniformly between the Low and High values, and a factor with
+    non-numeric values, for example include file names, is set to the Low, Best or High value for the lower, middle
+    and upper third of the unit interval.
+
+    Parameters
+    ----------
+    levels : array
+        The Low, Best and High values as strings, with one row per factor
+    design : array
+        The design batch, an integer array of factor levels or a float array of points in the unit hypercube
+
+    Returns
+    -------
+    values : list
+        The factor values as strings for each run in the batch
+    """
+
+    index = np.arange(levels.shape[0])
+    if np.issubdtype(design.dtype, np.integer):
+        return (levels[index, design].tolist())
+
+    low     = pd.to_numeric(pd.Series(levels[:, 0]), errors='coerce').to_numpy(dtype=float)
+    high    = pd.to_numeric(pd.Series(levels[:, 2]), errors='coerce').to_numpy(dtype=float)
+    numeric = np.isfinite(low) & np.isfinite(high)
+    level   = levels[index, np.minimum((design*3).astype(int), 2)]
+    value   = np.char.mod('%.6g', np.where(numeric, low + design*(high - low), 0.0))
+    return (np.where(numeric, value, level).tolist())
+
+
+def sensitivity_write_case(case):
+    """ Write a Scenario Case's PARAM and DATA Files
+
+    Writes the PARAM and DATA files for one scenario case from the base file template set by sensitivity_template. The
+    routine does not use the GUI so that it can be run on a process pool, the messages and any error are returned to
+    be reported by the calling routine.
+
+    Parameters
+    ----------
+    case : dict
+        The scenario case as defined by sensitivity_case
+
+    Returns
+    -------
+    result : dict
+        The case PARAM file ('jobs'), the file being written ('file'), the messages ('log') and the error message
+        ('error'), None if the case was written
+    """
+
+    result = {'jobs': None, 'file': _template['jobparm'], 'log': [], 'error': None}
+    try:
+        result['jobs'] = sensitivity_write_param(case, _template['jobparm'], _template['jobdata'], _template['param'])
+        result['log'].append('WriteParm: Generated ' + str(Path(result['jobs']).name))
+        result['file'] = _template['jobdata']
+        jobname        = sensitivity_write_data(case, _template['jobdata'], _template['data'], _template['spans'])
+        result['log'].append('WriteData: Generated ' + str(jobname))
+
+    except Exception as error:
+        result['log'].append('WriteCase: Error Writing Case ' + case['jobnum'])
+        result['error'] = str(error) + ': ' + str(type(error))
+
+    return (result)
+
+
+def sensitivity_write_cases(basefile, header, factors, scenario, workers=None, thin=False, nrun=None, seed=None):
     """ Main Function for Writing out Scenario Cases
 
     This is the main function that controls the writing out of the various requested scenario cases (jobs). The
-    function first calls the opmsens_checkerr routine to check for errors and then the opmsens_clean routine to
-    remove previously created scenario files. After which the opmsens_write_param and opmsens_write_data functions are
-    called to create the scenario PARAM and DATA files
+    function first calls the sensitivity_check routine to check for errors and then the sensitivity_clean routine to
+    remove previously created scenario files. After which the scenario cases are defined and the sensitivity_write_pool
+    function is called to create the scenario PARAM and DATA files on a process pool. For thin cases the unchanged
+    sections of the base DATA file are written once as shared INCLUDE files and each case DATA file only contains the
+    sections with factors, see sensitivity_write_shared.
 
     Parameters
     ----------
@@ -441,14 +1437,18 @@ def sensitivity_write_cases(basefile, header, factors, scenario):
         A table of design factors
     scenario : str
         The type of scenario to be generated
-
-    Returns
-    ------
-    None
+    workers : int
+        Number of worker processes, None for the number of CPUs
+    thin : bool
+        Write thin case DATA files that INCLUDE the shared unchanged sections of the base DATA file if True
+    nrun : int
+        The number of runs for the Latin Hypercube and Sobol designs
+    seed : int
+        Random number generator seed for the Latin Hypercube and Sobol designs, None for a random seed
     """
 
     # Check for Errors and Return if Errors Found
-    checkerr = sensitivity_check(basefile, header, factors, scenario)
+    checkerr = sensitivity_check(basefile, header, factors, scenario, nrun)
     if checkerr:
         return()
     #
@@ -458,8 +1458,7 @@ def sensitivity_write_cases(basefile, header, factors, scenario):
     #
     # Define Factor and Job Data Frame
     #
-    df                = pd.DataFrame(factors, columns=header)
-    df                = df[df != ''].dropna()
+    df                = sensitivity_factors(header, factors)
     jobdf             = pd.DataFrame()
     jobdf[header[1]] = df [header[1]]
     for slevel in ['Low', 'Best', 'High']:
@@ -469,8 +1468,9 @@ def sensitivity_write_cases(basefile, header, factors, scenario):
     nfactor  = jobdf.shape[0]
     nlevel   = jobdf.shape[1]
     #
-    # Write PARAM and DATA Files
+    # Define the Scenario Cases
     #
+    cases    = []
     jobs     = []
     jobstart = 1
     joberr   = False
@@ -481,15 +1481,13 @@ def sensitivity_write_cases(basefile, header, factors, scenario):
     #
     # Low, Best and High Scenario
     #
+    ids   = list(df[header[0]])
+    names = list(jobdf[header[1]])
     if 'Scenario' in scenario:
         jobnum = 0
         for joblevel in range(1, nlevel):
-            (joberr, jobs) = sensitivity_write_param(jobstart, jobnum, jobparam, jobdata, jobs)
-            if joberr:
-                break
-            joberr = sensitivity_write_data(scenario, joblevel, nfactor, jobdf, jobstart, jobnum, jobdata)
-            if joberr:
-                break
+            cases.append(sensitivity_case(scenario, jobstart + jobnum, jobdf.columns[joblevel], ids, names,
+                                          jobdf.iloc[:, joblevel]))
             jobstart = jobstart + joblevel
     #
     # One Job per Factor
@@ -497,57 +1495,25 @@ def sensitivity_write_cases(basefile, header, factors, scenario):
     elif 'One Job per Factor' in scenario:
         for joblevel in range(1, nlevel):
             for jobnum in range(0, nfactor):
-                (joberr, jobs) = sensitivity_write_param(jobstart, jobnum, jobparam, jobdata, jobs)
-                if joberr:
-                    break
-                joberr = sensitivity_write_data(scenario, joblevel, nfactor, jobdf, jobstart, jobnum, jobdata)
-                if joberr:
-                    break
+                cases.append(sensitivity_case(scenario, jobstart + jobnum, jobdf.columns[joblevel], ids, names,
+                                              jobdf.iloc[:, joblevel]))
             jobstart = jobstart + nfactor
     #
-    # Factorial Low and High Full
+    # Factorial, Latin Hypercube and Sobol Designs
     #
-    elif 'Factorial' in scenario:
-        #
-        # Obtain DOE Matrix and Convert to Data Frame
-        #
-        doedata = pd.DataFrame()
-        if 'Factorial Low and High Full' in scenario:
-            doedata = pyDOE3.ff2n(nfactor) + 2
-
-        if 'Factorial Low and High Plackett-Burman' in scenario:
-            doedata = pyDOE3.pbdesign(nfactor) + 2
-
-        if 'Factorial Low, Best and High Full' in scenario:
-            doedata = (pyDOE3.fullfact([nlevel - 1]*nfactor)) - 1
-
-        if 'Factorial Low, Best and High Box-Behnken' in scenario:
-            doedata = pyDOE3.bbdesign(nfactor)
-
-        doedf = pd.DataFrame(data=doedata).transpose()
-        doedf = doedf.rename(columns=lambda x: 'RUN' + str(x + 1).zfill(3), inplace=False)
-        #
-        # Set Factor Values
-        #
-        for n in range(0, nfactor):
-            doedf.iloc[n, :] = doedf.iloc[n, :].replace([1.0, 2.0, 3.0], [df.iloc[n, 2], df.iloc[n, 3], df.iloc[n, 4]])
-        #
-        # Merge Data Frames and Write Out Files
-        #
-        jobdf            = pd.DataFrame()
-        jobdf[header[1]] = df[header[1]]
-        jobdf            = pd.concat([jobdf, doedf], axis=1)
-        nfactor          = jobdf.shape[0]
-        nlevel           = jobdf.shape[1]
-        jobstart         = 0
-        for joblevel in range(1, nlevel):
-            jobnum = joblevel
-            (joberr, jobs) = sensitivity_write_param(jobstart, jobnum, jobparam, jobdata, jobs)
-            if joberr:
-                break
-            joberr = sensitivity_write_data(scenario, joblevel, nfactor, jobdf, jobstart, jobnum, jobdata)
-            if joberr:
-                break
+    else:
+        levels = df[['Low', 'Best', 'High']].to_numpy(dtype=str)
+        jobnum = 0
+        for design in sensitivity_design(scenario, nfactor, nrun, seed):
+            for values in sensitivity_values(levels, design):
+                jobnum = jobnum + 1
+                cases.append(sensitivity_case(scenario, jobnum, 'RUN' + str(jobnum).zfill(3), ids, names, values))
+    #
+    # Write PARAM and DATA Files
+    #
+    (joberr, jobs) = sensitivity_write_pool(cases, jobdata, jobparam, workers, thin)
+    if not joberr and cases:
+        sg.cprint('WriteDesign: Generated ' + str(sensitivity_write_design(cases, jobdata).name))
 
     sg.cprint('Scenario:  ' + scenario + ' End')
     if not joberr:
@@ -566,163 +1532,208 @@ def sensitivity_write_cases(basefile, header, factors, scenario):
     return()
 
 
-def sensitivity_write_data(scenario, nlevel, nfactor, jobdf, jobstart, jobnum, jobbase):
+def sensitivity_write_data(case, jobbase, data, spans):
     """ Write Scenario DATA File
 
     This routine writes out the OPM Flow DATA file for one case with the factor values for the scenario replacing the
-    factor names, that is $X01 replced by the factor vlaue of this variable. A header is also written to the file to
-    document the case being defined.
+    factor identifiers, that is $X01 replaced by the factor value of the $X01 factor. A header is also written to the
+    file to document the case being defined. The file is written in a single pass by copying the base DATA file
+    between the placeholders, without making a copy of the base data, and writing the factor values for the
+    placeholders.
 
     Parameters
     ----------
-    scenario : str
-        The job scenario
-    nlevel : int
-        The design Level parameter
-    nfactor : int
-        The number of factors.
-    jobdf : table
-        Job data frame containing the factors
-    jobstart : int
-        The first job number counter
-    jobnum : int
-        The current job number
+    case : dict
+        The scenario case as defined by sensitivity_case
     jobbase : str
-    the base parameter file used to create the case DATA file
+        The base DATA file used to create the case DATA file
+    data : mmap or bytes
+        The base DATA file data from sensitivity_template
+    spans : list
+        The (start, end, placeholder) byte offsets of the factor placeholders in the data
 
     Returns
     -------
-    joberr :bool
-        set to True if errors otherwise false
+    jobname : str
+        The case DATA file name
     """
 
-    joberr   = False
-    jobnum   = str(jobnum + jobstart).zfill(3)
-    jobname  = Path(jobbase).stem + '-' + jobnum + str(Path(jobbase).suffix)
+    jobname  = Path(jobbase).stem + '-' + case['jobnum'] + str(Path(jobbase).suffix)
     jobfile  = Path(jobbase).with_name(jobname)
     header   = '-- ' + '*'*129 + '\n'
+    factor   = {}
     #
-    # Create DATA File
+    # Define DATA File Header
     #
-    try:
-        file = open(jobfile, 'w')
-        file.write(header)
-        file.write('--                                      \n')
-        file.write('-- OPMRUN SENSITIVITY GENERATOR CASE    \n')
-        file.write('-- ---------------------------------    \n')
-        file.write('--                                      \n')
-        file.write('-- JOB SCENARIO                       : ' + str(scenario) + '\n')
-        file.write('-- JOB BASE                           : ' + str(jobbase)  + '\n')
-        file.write('-- JOB NAME                           : ' + str(jobname)  + '\n')
-        for i in range(0, nfactor):
-            file.write('--                                  \n')
-            file.write('-- FACTOR LEVEL                       : ' + jobdf.columns[nlevel]           + '\n')
-            file.write('-- FACTOR IDENTIFIER                  : ' + str('X')  + str(i + 1).zfill(2) + '\n')
-            file.write('-- FACTOR DESCRIPTION                 : ' + jobdf.iloc[i, 0]                + '\n')
-            file.write('-- FACTOR VALUE                       : ' + str('$X') + str(i + 1).zfill(2) + '\n')
-        file.write('--                                      \n')
-        file.write(header)
-        base = Path(jobbase).read_text()
-        file.write(base)
-        file.close()
-
-    except Exception as error:
-        sg.popup_error('Error Writing: ' + '\n  \n' + str(jobfile), no_titlebar=False, grab_anywhere=False,
-                       keep_on_top=True)
-        sg.cprint('WriteParam: Error Writing - ' + str(jobname))
-        return True
+    text = [header,
+            '--                                      \n',
+            '-- OPMRUN SENSITIVITY GENERATOR CASE    \n',
+            '-- ---------------------------------    \n',
+            '--                                      \n',
+            '-- JOB SCENARIO                       : ' + str(case['scenario']) + '\n',
+            '-- JOB BASE                           : ' + str(jobbase)          + '\n',
+            '-- JOB NAME                           : ' + str(jobname)          + '\n']
+    for (ident, name, value) in zip(case['ids'], case['names'], case['values']):
+        factor[ident] = value
+        text.append('--                                  \n')
+        text.append('-- FACTOR LEVEL                       : ' + case['level']              + '\n')
+        text.append('-- FACTOR IDENTIFIER                  : ' + ident.lstrip('$')          + '\n')
+        text.append('-- FACTOR DESCRIPTION                 : ' + name                       + '\n')
+        text.append('-- FACTOR VALUE                       : ' + value                      + '\n')
+    text.append('--                                      \n')
+    text.append(header)
     #
-    # DATA Template Processing
+    # Write DATA File Substituting the Factor Values
     #
-    try:
-        file = open(jobfile, 'r')
-        data = file.read()
-        file.close()
-        for i in range(0, nfactor):
-            xfac = str('$X') + str(i + 1).zfill(2)
-            xdat = jobdf.iloc[i, nlevel]
-            data = data.replace(xfac, str(xdat))
-#           sg.Print(str(i) + '   ' + str(nlevel) + '  ' + str(xfac), '  ' + str(xdat))
-
-        file = open(jobfile, 'w')
-        file.write(data)
-        file.close()
-        sg.cprint('WriteData: Generated ' + str(jobname))
+    with open(jobfile, 'wb') as file, memoryview(data) as view:
+        file.write(''.join(text).replace('\n', os.linesep).encode())
+        last = 0
+        for (start, end, token) in spans:
+            file.write(view[last:start])
+            file.write(factor.get(token, token).encode())
+            last = end
+        file.write(view[last:])
 
-    except Exception as error:
-        sg.popup_error('Error Processing Base Data File: ' + '\n  \n' + str(jobfile), title='OPMRUN Sensitivity',
-                      no_titlebar=False, grab_anywhere=False, keep_on_top=True)
-        sg.cprint('WriteData: Error Processing Base Data File ' + str(jobname))
-        return True
+    return (jobname)
+
+
+def sensitivity_write_design(cases, jobdata, append=False):
+    """ Write the Sensitivity Design File
 
-    return joberr
+    Writes the case DATA file name, the level or run name and the factor values of each case to the design file,
+    which is used by sensitivity_analyse to fit a proxy once the cases have been run. The cases are appended to an
+    existing design file for the batches of an adaptive ensemble.
 
+    Parameters
+    ----------
+    cases : list
+        The scenario cases as defined by sensitivity_case
+    jobdata : str
+        The base DATA file used to create the case DATA files
+    append : bool
+        Append the cases to the design file if True, otherwise overwrite the design file
 
-def sensitivity_write_param(jobstart, jobnum, jobparm, jobdata, jobs):
+    Returns
+    -------
+    design : Path
+        The design file
+    """
+
+    design  = Path(jobdata).with_name(Path(jobdata).stem + '-DESIGN.csv')
+    columns = [ident.lstrip('$') for ident in cases[0]['ids']]
+    df      = pd.DataFrame([case['values'] for case in cases], columns=columns)
+    df.insert(0, 'Level', [case['level'] for case in cases])
+    df.insert(0, 'Case', [Path(jobdata).stem + '-' + case['jobnum'] + str(Path(jobdata).suffix) for case in cases])
+    if append and design.is_file():
+        df.to_csv(design, mode='a', header=False, index=False)
+    else:
+        df.to_csv(design, index=False)
+    return (design)
+
+
+def sensitivity_write_param(case, jobparm, jobdata, lines):
     """ Write Scenario PARAM File
 
-    This routine writes out the OPM Flow PARAM file for one case and substitutes the 'ecl-deck-file-name' variable
-    with the correct file name for the case
+    This routine writes out the OPM Flow PARAM file for one case from the lines of the base PARAM file, and
+    substitutes the 'ecl-deck-file-name' variable with the correct file name for the case.
 
     Parameters
     ----------
-    jobstart : int
-        The first job number counter
-    jobnum : int
-        The current job number
+    case : dict
+        The scenario case as defined by sensitivity_case
     jobparm: str
         The base parameter file used to create the case PARAM file
     jobdata: str
         The base data file used to create the case DATA file
-    jobs: list
-        A list of jobs for the job queue
+    lines : list
+        The lines of the base PARAM file from sensitivity_template
 
     Returns
     -------
-    joberr : bool
-        Set to True for error otherwise False
+    jobfile : Path
+        The case PARAM file
     """
 
-    joberr  = False
-    jobnum  = str(jobnum + jobstart).zfill(3)
-    jobname = Path(jobparm).stem + '-' + jobnum + str(Path(jobparm).suffix)
+    jobname = Path(jobparm).stem + '-' + case['jobnum'] + str(Path(jobparm).suffix)
     jobfile = Path(jobparm).with_name(jobname)
-    jobdeck = Path(jobdata).stem + '-' + jobnum + str(Path(jobdata).suffix)
-    #
-    # Create PARAM File
-    #
-    try:
-        Path(jobfile).write_text(Path(jobparm).read_text())
-    except Exception as error:
-        sg.popup_error('Error Writing Parameter File: ' + '\n\n' + str(jobfile), str(error) + ': ' + str(type(error)),
-                       title='OPMRUN Sensitivity', no_titlebar=False, grab_anywhere=False, keep_on_top=True)
-        sg.cprint('WriteParam: Error Writing - ' + str(jobname))
-        return True
-    #
-    # Edit PARAM File
-    #
-    try:
-        file = open(jobfile, 'r')
-        data = file.readlines()
-        file.close()
-        file = open(jobfile, 'w')
-        for line in data:
+    jobdeck = Path(jobdata).stem + '-' + case['jobnum'] + str(Path(jobdata).suffix)
+
+    with open(jobfile, 'w') as file:
+        for line in lines:
             if 'ecl-deck-file-name=' in line:
                 file.write('ecl-deck-file-name=' + str(jobdeck) + '\n')
             else:
                 file.write(line)
 
-        file.close()
-        jobs.append(jobfile)
-        sg.cprint('WriteParm: Generated ' + str(jobname))
+    return (jobfile)
+
+
+def sensitivity_write_pool(cases, jobdata, jobparm, workers=None, thin=False):
+    """ Write the Scenario Cases on a Process Pool
+
+    Writes the PARAM and DATA files for the scenario cases on a process pool. The factor placeholders are found once by
+    sensitivity_placeholders, and each worker process memory maps the base DATA file via sensitivity_template, so that
+    the memory used does not grow with the size of the base DATA file and the number of workers. The results are
+    reported in case order and the first error stops the generation of the remaining cases. For thin cases the shared
+    INCLUDE files are written first and the workers are given the thin deck instead of the base DATA file.
+
+    Parameters
+    ----------
+    cases : list
+        The scenario cases as defined by sensitivity_case
+    jobdata : str
+        The base DATA file used to create the case DATA files
+    jobparm : str
+        The base PARAM file used to create the case PARAM files
+    workers : int
+        Number of worker processes, None for the number of CPUs
+    thin : bool
+        Write thin case DATA files that INCLUDE the shared unchanged sections of the base DATA file if True
+
+    Returns
+    -------
+    joberr : bool
+        Set to True for error otherwise False
+    jobs : list
+        A list of the case PARAM files for the job queue
+    """
+
+    jobs    = []
+    if not cases:
+        return (False, jobs)
+
+    workers = min(workers or os.cpu_count() or 1, len(cases))
+    chunks  = max(1, len(cases) // (workers * 4))
+    try:
+        text = None
+        if thin:
+            (text, shared) = sensitivity_write_shared(jobdata)
+            for file in shared:
+                sg.cprint('WriteBase: Generated ' + str(Path(file).name))
+
+        sg.cprint('WriteCase: Generating ' + str(len(cases)) + ' Cases Using ' + str(workers) + ' Processes')
+        spans = sensitivity_placeholders(jobdata, text)
+        with ProcessPoolExecutor(max_workers=workers, initializer=sensitivity_template,
+                                 initargs=(jobdata, jobparm, spans, text)) as pool:
+            for result in pool.map(sensitivity_write_case, cases, chunksize=chunks):
+                for line in result['log']:
+                    sg.cprint(line)
+                if result['error'] is not None:
+                    pool.shutdown(wait=False, cancel_futures=True)
+                    sg.popup_error('Error Writing: ' + '\n  \n' + str(result['file']), result['error'],
+                                   title='OPMRUN Sensitivity', no_titlebar=False, grab_anywhere=False,
+                                   keep_on_top=True)
+                    return (True, jobs)
+                jobs.append(result['jobs'])
 
     except Exception as error:
-        sg.popup_error('Error Processing Parameter File ' + '\n\n' + str(jobfile), str(error) + ': ' + str(type(error)),
+        sg.popup_error('Error Processing Base Data File: ' + '\n  \n' + str(jobdata),
+                       str(error) + ': ' + str(type(error)),
                        title='OPMRUN Sensitivity', no_titlebar=False, grab_anywhere=False, keep_on_top=True)
-        sg.cprint('WriteParam: Processing Error - ' + str(jobname))
-        return True
+        sg.cprint('WriteData: Error Processing Base Data File ' + str(Path(jobdata).name))
+        return (True, jobs)
 
-    return joberr, jobs
+    return (False, jobs)
 
 
 def sensitivity_write_queue(jobs):
@@ -771,27 +1782,14 @@ def sensitivity_write_queue(jobs):
 
         if event == 'Submit':
             if jobfile:
-                file = open(jobfile, 'w')
-                file.write('# \n')
-                file.write('# OPMRUN Queue File \n')
-                file.write('# \n')
-            #    file.write('# Created By  : ' + opmuser + '\n')
-                file.write('# Date Created: ' + get_time() + '\n')
-                file.write('# Queue Length: ' + str(len(jobs)) + '\n')
-                file.write('# \n')
-                for job in jobs:
-                    file.write(jobcmd + str(job) + '\n')
-
-                file.write('# \n')
-                file.write('# End of Queue \n')
-                file.close()
-
+                sensitivity_queue(jobfile, jobs, jobcmd)
                 sg.popup_ok('OPMRUN Queue File Saved to: ' + jobfile,
                             no_titlebar=False, grab_anywhere=False, keep_on_top=True)
                 break
             else:
                 sg.popup_error('OPMRUN Queue File Invalid: ' + jobfile,
                             no_titlebar=False, grab_anywhere=False, keep_on_top=True)
+                (event, values) = window2.read()
                 continue
         else:
             break
@@ -800,6 +1798,87 @@ def sensitivity_write_queue(jobs):
     return()
 
 
+def sensitivity_write_shared(jobdata, size=65536):
+    """ Write the Unchanged Sections of the Base DATA File as Shared INCLUDE Files
+
+    Splits the base DATA file into keyword blocks and writes each run of consecutive blocks without a $Xnn factor
+    placeholder to a shared INCLUDE file. A keyword line is an upper case name of up to eight characters on its own
+    line, but as data lines can look the same, for example the line after TITLE, a block only starts at a keyword line
+    if the previous line, ignoring blank and comment lines, ends a record with a slash or is a keyword that takes no
+    data, see sensitivity_keywords, so that an INCLUDE is never placed inside a record. The thin deck returned replaces
+    these runs by INCLUDE keywords and keeps the blocks with placeholders, so that each case DATA file only contains
+    the sections that change between the cases. Runs smaller than the size are kept in the thin deck to avoid writing
+    many small files. Once written, the shared files are read back and the thin deck is checked to give the base DATA
+    file when its INCLUDE keywords are expanded, and if not the shared files are deleted and an error raised. The
+    shared files are written to the base directory and are named after the base DATA file,
+    so that they are removed by sensitivity_clean with the cases.
+
+    Parameters
+    ----------
+    jobdata : str
+        The base DATA file used to create the case DATA files
+    size : int
+        Minimum size in characters of a run of blocks written to a shared INCLUDE file
+
+    Returns
+    -------
+    text : str
+        The thin deck with the shared INCLUDE keywords
+    shared : list
+        The shared INCLUDE files written
+    """
+
+    data   = Path(jobdata).read_text()
+    nodata = set(sensitivity_keywords())
+    keyw   = []
+    for m in re.finditer(r'^[A-Z][A-Z0-9_+-]{0,7}[ \t]*(?:--.*)?$', data, flags=re.M):
+        end = m.start() - 1
+        while end > 0:
+            line = data[data.rfind('\n', 0, end) + 1:end].split('--')[0].strip()
+            if line:
+                break
+            end = data.rfind('\n', 0, end)
+        if end <= 0 or line.endswith('/') or line.split()[0] in nodata:
+            keyw.append(m.start())
+    start  = np.unique(np.array([0] + keyw + [len(data)]))
+    xvar   = np.array([m.start() for m in re.finditer(r'\$X\d\d', data)], dtype=int)
+    #
+    # Flag the Blocks with Placeholders and Find the Runs of Blocks without Placeholders
+    #
+    factor = np.zeros(len(start) - 1, dtype=bool)
+    factor[np.searchsorted(start, xvar, side='right') - 1] = True
+    edge   = np.flatnonzero(np.diff(np.concatenate(([True], factor, [True])).astype(int)))
+    runs   = [(start[i], start[j]) for i, j in zip(edge[0::2], edge[1::2]) if start[j] - start[i] >= size]
+    #
+    # Write Shared INCLUDE Files and Define the Thin Deck
+    #
+    names   = [Path(jobdata).with_name(Path(jobdata).stem + '-SHARED-' + str(n + 1).zfill(3) + '.INC')
+               for n in range(len(runs))]
+    include = ['INCLUDE\n' + "  '" + jobfile.name + "' /\n" for jobfile in names]
+    text    = []
+    last    = 0
+    for (i, j), jobfile, keyword in zip(runs, names, include):
+        with open(jobfile, 'w') as file:
+            file.write(data[i:j])
+        text.extend([data[last:i], keyword])
+        last = j
+    text.append(data[last:])
+    text    = ''.join(text)
+    #
+    # Check the Thin Deck Expands to the Base DATA File from the Shared INCLUDE Files
+    #
+    expand  = text
+    for jobfile, keyword in zip(names, include):
+        (head, found, tail) = expand.partition(keyword) if expand.count(keyword) == 1 else (expand, '', '')
+        expand = head + Path(jobfile).read_text() + tail if found else expand
+    if expand != data:
+        for jobfile in names:
+            jobfile.unlink(missing_ok=True)
+        raise ValueError('Thin Deck Does Not Expand to the Base DATA File ' + str(Path(jobdata).name))
+
+    return (text, names)
+
+
 def sensitivity_main(jobparam, opmoptn, opmsys):
     """OPMRUN Sensitivity Case Generator Utility Main Function
 
@@ -859,6 +1938,13 @@ def sensitivity_main(jobparam, opmoptn, opmsys):
                 '\n'
                 'The buttons at the base of the screen perform the following actions: \n'
                 '\n'
+                '"Adaptive" - Runs an initial Maximin Latin Hypercube design with the headless batch runner, fits a ' +
+                'proxy to a summary response and then runs batches of the cases with the largest proxy uncertainty, ' +
+                'until the change in the response statistics between batches is less than the tolerance, as a '      +
+                'fraction of the P90 - P10 range, or the maximum number of runs is reached. \n'
+                '"Analyse" - Fits a polynomial or Gaussian process proxy to a summary response, for example FOPT, '    +
+                'at the final date of the completed cases, and reports the tornado, main effects and response '       +
+                'statistics. \n'
                 '"Base" - Selects the "Base" template file and once loaded is displayed in the "Base" tab. \n'
                 '"Clean" - Cleans (deletes) all Cases based on the current "Base" file. \n'
                 '"Clear" - Clears the factor descriptions and values.\n'
@@ -872,6 +1958,15 @@ def sensitivity_main(jobparam, opmoptn, opmsys):
                 'Note that the "Generate" option also generates an OPMRUN queue file that contains all the jobs in '  +
                 'the scenario. One can then load the queue file into OPMRUN and run all the jobs.\n'
                 '\n'
+                'The Latin Hypercube, Maximin Latin Hypercube and Scrambled Sobol designs generate the number of '    +
+                '"Runs" requested. Factors with numeric Low and High values are sampled uniformly between these '     +
+                'values, other factors are set to the Low, Best or High value. The "Seed" option makes the design '   +
+                'repeatable. \n'
+                '\n'
+                'The "Processes" option sets the number of processes used to write the cases. If the "Thin Cases" '    +
+                'option is selected, the base deck sections without factors are written once as shared INCLUDE files ' +
+                'and each case only contains the sections with factors, which saves disk space for large models.\n'
+                '\n'
                 'See the OPM Flow manual for further information. \n')
     #
     #  Define Constants
@@ -892,7 +1987,7 @@ def sensitivity_main(jobparam, opmoptn, opmsys):
                  'Factorial Low and High Full',
                  'Factorial Low and High Plackett-Burman',
                  'Factorial Low, Best and High Full',
-                 'Factorial Low, Best and High Box-Behnken']
+                 'Factorial Low, Best and High Box-Behnken'] + sensitivity_designs()
     # ------------------------------------------------------------------------------------------------------------------
     # Define Display Window col_widths=[12, 44, 12, 12, 12],
     # ------------------------------------------------------------------------------------------------------------------
@@ -923,6 +2018,15 @@ def sensitivity_main(jobparam, opmoptn, opmsys):
 
                  [sg.Text('Sensitivity Scenario Options')],
                  [sg.Listbox(values=scenarios, default_values=scenarios[0], size=(ncol + 14, 8), key='_scenarios_')],
+                 [sg.Text('Processes'), sg.Spin(list(range(1, cpu_count() + 1)), initial_value=cpu_count(),
+                                                key='_workers_', size=(4, 1)),
+                  sg.Checkbox('Thin Cases with the Unchanged Base Sections as Shared INCLUDE Files', key='_thin_',
+                              default=False),
+                  sg.Text('Runs'), sg.Input('100', key='_nrun_', size=(8, 1),
+                                            tooltip='Number of Runs for the Latin Hypercube and Sobol Designs'),
+                  sg.Text('Seed'), sg.Input('', key='_seed_', size=(8, 1),
+                                            tooltip='Random Seed for the Latin Hypercube and Sobol Designs, ' +
+                                                    'Leave Blank for a Random Seed')],
 
                  [sg.Text('Messages')],
                  [sg.Multiline(key=outlog, size=(ncol +13, 5), text_color='blue', autoscroll=True,
@@ -930,7 +2034,9 @@ def sensitivity_main(jobparam, opmoptn, opmsys):
 
                  [sg.Text('')],
 
-                 [sg.Button('Base'    , tooltip='Base Input and Parameter File'      , key='_base_'    ),
+                 [sg.Button('Adaptive', tooltip='Run an Adaptive Sensitivity Ensemble', key='_adaptive_'),
+                  sg.Button('Analyse' , tooltip='Fit a Proxy to the Completed Cases' , key='_analyse_' ),
+                  sg.Button('Base'    , tooltip='Base Input and Parameter File'      , key='_base_'    ),
                   sg.Button('Clean'   , tooltip='Clean All Base Derived Runs'        , key='_clean_'   ),
                   sg.Button('Clear'   , tooltip='Clear All Factor Parameters'        , key='_clear_'   ),
                   sg.Button('Copy'    , tooltip='Copy Factor Parameters to Clipboard', key='_copy_'    ),
@@ -957,9 +2063,26 @@ def sensitivity_main(jobparam, opmoptn, opmsys):
         event, values = window1.read()
         window_debug(event, 'values', values, False)
         #
+        # Adaptive (Sequential Ensemble)
+        #
+        if event == '_adaptive_':
+            window1[outlog].update('')
+            basefile = window1['_basefile_'].get()
+            factors  = window1['_factors_'].get()
+            sensitivity_adaptive(basefile, header, factors, int(values['_workers_']), values['_thin_'], window1)
+            continue
+        #
+        # Analyse (Completed Cases)
+        #
+        elif event == '_analyse_':
+            basefile = window1['_basefile_'].get()
+            factors  = window1['_factors_'].get()
+            sensitivity_analyse(basefile, header, factors)
+            continue
+        #
         # Base (Input Deck Template)
         #
-        if event == '_base_':
+        elif event == '_base_':
             basefile = sensitivity_base_file(jobparam, opmsys, window1)
             continue
         #
@@ -1053,7 +2176,16 @@ def sensitivity_main(jobparam, opmoptn, opmsys):
             basefile = window1['_basefile_'].get()
             factors  = window1['_factors_'].get()
             scenario = values['_scenarios_'][0]
-            sensitivity_write_cases(basefile, header, factors, scenario)
+            try:
+                nrun = int(values['_nrun_']) if values['_nrun_'].strip() else None
+                seed = int(values['_seed_']) if values['_seed_'].strip() else None
+            except ValueError:
+                sg.popup_error('Number of Runs and Seed Must be Integers',
+                               no_titlebar=False, grab_anywhere=False, keep_on_top=True)
+                continue
+
+            sensitivity_write_cases(basefile, header, factors, scenario, int(values['_workers_']),
+                                    values['_thin_'], nrun, seed)
             continue
         #
         # Help
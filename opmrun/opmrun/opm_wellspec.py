@@ -13,6 +13,12 @@ Program Documentation
 --------------------
 Only Python 3 is supported and tested Python2 support has been depreciated.
 
+2026.10.18 - Added the generation of the WELSPECS and COMPDAT keywords directly from well trajectories intersected
+             with a GRDECL or EGRID grid.
+2026.10.18 - OPM ResInsight export and formation layer files tokenized in one pass into dataframes created once with
+             typed columns, with the echo of the input files to the output window optional.
+2026.10.18 - COMPLUMP completion zones assigned to all the connections in one pass using a sorted K interval lookup,
+             with overlapping and undefined formation layers reported.
 2025.09.19 - Switch from PySimpleGUI to FreeSimpleGUI package
 2021.07.01 - New module initial release.
 
@@ -41,7 +47,9 @@ Date    : 20-Jul-2021
 # -----------------------------------------------------------------------------------------------------------------------
 # Import Modules and Start Up Section
 # -----------------------------------------------------------------------------------------------------------------------
+import re
 from pathlib import Path
+import numpy as np
 import pandas as pd
 #
 # Import Required Non-Standard Modules
@@ -51,6 +59,8 @@ import FreeSimpleGUI as sg
 # Import OPM Common Modules
 #
 from opmrun.opm_common import file_lstrip, opm_header_file, opm_popup, opm_view, window_debug
+from opmrun.opm_grid import grid_read, grid_wells
+from opmrun.opm_welltraj import welltraj_read
 
 # ----------------------------------------------------------------------------------------------------------------------
 # Define Modules Section
@@ -131,16 +141,15 @@ def wellspec_complump(file_inc, comp_name, comp_data, depth):
     #
     # Lookup Completion Zones
     #
-    for n in range(0, comp_data.shape[0]):
-        k = int(comp_data.at[n, 'k1'])
-        if n == 0:
-            comp_zone = comp_name.query('@k >= k1 and @k <= k2')
-        else:
-            comp_zone = comp_zone.append(comp_name.query('@k >= k1 and @k <= k2'))
-
-    comp_zone.columns = ['zone', 'ztop', 'zbot', 'zcomp']
-    comp_zone = comp_zone.reset_index()
-    comp_zone.pop('index')
+    comp_zone, overlap, missing = wellspec_complump_zones(comp_name, comp_data['k1'].astype(int).to_numpy())
+    for k1, k2, zones in overlap:
+        sg.cprint('Warning Overlapping Formation Layers K ' + str(k1) + ' to ' + str(k2) + ' in Zones ' +
+                  ', '.join(zones) + ', Layers Assigned to ' + zones[0])
+    if missing.any():
+        sg.cprint('Warning ' + str(int(missing.sum())) + ' Connections in Layers Without a Formation Name, ' +
+                  'Assigned to Zone ' + str(comp_zone.loc[missing, 'zone'].iloc[0]) + ' Completion ' +
+                  str(comp_zone.loc[missing, 'zcomp'].iloc[0]) + ' for K Layers ' +
+                  str(sorted(set(comp_data.loc[missing, 'k1'].astype(int))))[1:-1])
     #
     # Create COMPLUMP Data DataFrame for Processing
     #
@@ -183,7 +192,66 @@ def wellspec_complump(file_inc, comp_name, comp_data, depth):
     return (comp_zone, error)
 
 
-def wellspec_formation_names(file):
+def wellspec_complump_zones(comp_name, layers):
+    """Lookup the Completion Zone for Each Connection K Layer
+
+    Assigns the formation layer zones to all the connections in one pass, by splitting the formation layers into
+    non-overlapping K intervals with sorted boundaries and looking up the interval for each connection's K layer using
+    a binary search. Where formation layers overlap, the layers are assigned to the zone that comes first in the
+    Formation Name Layer File. Connections in layers without a formation name are assigned to an 'UNDEFINED' zone,
+    with a completion number one greater than the largest formation completion number.
+
+    Parameters
+    ----------
+    comp_name : df
+        Dataframe containing completion layers and layer names.
+    layers : array
+        The K layer of each connection.
+
+    Returns
+    -------
+    comp_zone : df
+        Dataframe containing the zone name, top and bottom K layers, and the completion number for each connection.
+    overlap : list
+        List of (k1, k2, zones) for the K intervals that are in more than one zone, with the zone names in file order.
+    missing : array
+        Boolean array set to True for the connections in layers without a formation name.
+    """
+
+    layers = np.asarray(layers, dtype=int)
+    if comp_name.empty:
+        comp_zone = pd.DataFrame({'zone' : np.full(len(layers), "'UNDEFINED'"), 'ztop': layers, 'zbot': layers,
+                                  'zcomp': np.ones(len(layers), dtype=int)})
+        return (comp_zone, [], np.ones(len(layers), dtype=bool))
+
+    zname = comp_name['zname'].to_numpy()
+    k1    = comp_name['k1'   ].to_numpy(dtype=int)
+    k2    = comp_name['k2'   ].to_numpy(dtype=int)
+    comp  = comp_name['comp_no'].to_numpy(dtype=int)
+    #
+    # Split the Formation Layers into Non-Overlapping K Intervals, and Assign Each Interval to the First Zone
+    #
+    bound = np.unique(np.concatenate((k1, k2 + 1)))
+    cover = (k1[:, None] <= bound[None, :-1]) & (k2[:, None] >= bound[None, :-1])
+    owner = np.where(cover.any(axis=0), cover.argmax(axis=0), -1)
+    overlap = [(int(bound[n]), int(bound[n + 1] - 1), [str(name).strip() for name in zname[cover[:, n]]])
+               for n in np.flatnonzero(cover.sum(axis=0) > 1)]
+    #
+    # Lookup the Interval for Each Connection
+    #
+    index  = np.searchsorted(bound, layers, side='right') - 1
+    valid  = (index >= 0) & (index < len(bound) - 1)
+    zone   = np.full(len(layers), -1)
+    zone[valid] = owner[index[valid]]
+    missing = zone < 0
+    comp_zone = pd.DataFrame({'zone' : np.where(missing, "'UNDEFINED'", zname[zone]),
+                              'ztop' : np.where(missing, layers, k1[zone]),
+                              'zbot' : np.where(missing, layers, k2[zone]),
+                              'zcomp': np.where(missing, comp.max(initial=0) + 1, comp[zone])})
+    return (comp_zone, overlap, missing)
+
+
+def wellspec_formation_names(file, echo=False):
     """Reads an OPM ResInsight Formation Name Layer File (*.lyr)
 
     OPM_UTILITIES is a Graphical User Interface ("GUI") program for the Open Porous Media ("OPM") Flow simulator. This
@@ -194,6 +262,8 @@ def wellspec_formation_names(file):
     ----------
     file : str
        File name to read the OPM ResInsight data from
+    echo : boolean
+        Set to True to echo the file to the output window, otherwise False.
 
     Returns
     -------
@@ -208,39 +278,36 @@ def wellspec_formation_names(file):
     #
     debug = False
     error = False
+    layer = re.compile(r"\s*('.*')\s+(\d+)\s*-\s*(\d+)\s*$")
     zone_name = pd.DataFrame(columns=['zname', 'k1', 'k2', 'comp_no'])
     try:
-        file = open(file, 'r')
-        data = file.read().splitlines()
-        file.close()
+        with open(file, 'r') as fileobj:
+            data = fileobj.read().splitlines()
     except FileNotFoundError as error:
         sg.popup_error('Error Reading: ' + '\n  \n' + str(file) + '\n \n' +
                        str(error) + ': ' + str(type(error)), no_titlebar=False, grab_anywhere=False, keep_on_top=True)
         error = True
         return (zone_name, error)
 
-    n = 0
-    for line in data:
-        sg.cprint(str(line[:120]))
-        try:
-            if '--' not in line:
-                n = n + 1
-
-                line = "',".join(line.rsplit("' " , 1))  # Reverse replace
-                line = ", ".join(line.rsplit(" - ", 1))  # Reverse replace
-                line = (line.strip() + ', ' + str(n))
-                zone_name.loc[n] = line.split(',')
-
-        except ValueError as error:
+    if echo:
+        sg.cprint('\n'.join(line[:120] for line in data))
+    #
+    # Tokenize the Layer Records ('Name' K1 - K2) in One Pass
+    #
+    lines = [line for line in data if '--' not in line and line.strip()]
+    match = [layer.match(line) for line in lines]
+    for line, token in zip(lines, match):
+        if token is None:
             sg.popup_error('Error Reading: ' + '\n  \n' + str(file) + '\n \n' +
-                           'Line ' + str(line) + '\n \n' + str(error) + ': ' + str(type(error)), no_titlebar=False,
-                           grab_anywhere=False, keep_on_top=True)
+                           'Line ' + str(line), no_titlebar=False, grab_anywhere=False, keep_on_top=True)
             error = True
             return (zone_name, error)
 
-    zone_name['k1'] = zone_name['k1'].astype(int)
-    zone_name['k2'] = zone_name['k2'].astype(int)
-    zone_name['comp_no'] = zone_name['comp_no'].astype(int)
+    zone_name = pd.DataFrame({'zname'  : [token.group(1) for token in match],
+                              'k1'     : np.array([token.group(2) for token in match], dtype=int),
+                              'k2'     : np.array([token.group(3) for token in match], dtype=int),
+                              'comp_no': np.arange(1, len(match) + 1)},
+                             index=pd.RangeIndex(1, len(match) + 1))
     if debug:
         sg.Print(zone_name.columns.ravel())
         sg.Print(zone_name)
@@ -303,7 +370,7 @@ def wellspec_keyword(file, keyword, unit='', data=None):
         sg.popup_error('Error Keyword Not Found: ' + '\n  \n' + keyword, no_titlebar=False, grab_anywhere=False,
                        keep_on_top=True)
     try:
-        out = out.append(data)
+        out = pd.concat((out, data))
         out = out.to_string(index=False, header=False, justify='start')
         file.write(out)
         file.write('\n/\n\n')
@@ -391,7 +458,7 @@ def wellspec_perforations(file_ev, file_in, comp_name, comp_data, comp_zone, dep
                                     ['--      ', '           ',  depth,  depth, 'DIAM', 'FACT', '  ', '    '],
                                     ['WELLNAME',  well        , '    ', '    ', '    ', '    ', '  ', '    ']],
                                     columns=perf_data.columns)
-                out = out.append(perf_data)
+                out = pd.concat((out, perf_data))
                 out = out.to_string(index=False, header=False, justify='start')
                 file.write('\n')
                 file.write(out)
@@ -408,22 +475,28 @@ def wellspec_perforations(file_ev, file_in, comp_name, comp_data, comp_zone, dep
                 no_titlebar=False, grab_anywhere=False, keep_on_top=True)
 
 
-def wellspec_welscomp(file_in, file_inc, depth, opmsys):
-    """Writes the OPM Flow WELSPECS and COMPDAT Keywords to a file
+def wellspec_trajectories(file_in, file_grid, file_inc, depth, opmsys, spec):
+    """Writes the OPM Flow WELSPECS and COMPDAT Keywords from Well Trajectories and a Grid
 
-    This function writes an OPM Flow well specification data set using the WELSPECS and COMPDAT keyword based on an
-    OPM ResInsight simulation perforation export file.
+    This function intersects the well trajectories in an OPM ResInsight trajectory file with a corner point grid, read
+    from a GRDECL or EGRID file, and writes the WELSPECS and COMPDAT keywords for all the cells penetrated by the
+    wells, so that the completions can be regenerated after a grid update without an OPM ResInsight session. The
+    trajectories must be in the same coordinate system and units as the grid.
 
     Parameters
     ----------
     file_in : str
-       Name of input file used to capture the comp_data.
+       Name of the OPM ResInsight trajectory file.
+    file_grid : str
+       Name of the GRDECL or EGRID grid file.
     file_inc : str
        Name of output include file used to write the keywords to.
     depth : str
         Depth units for report headers.
     opmsys : dict
         A dictionary containing the OPMRUN system parameters
+    spec : dict
+        Well group ('group'), preferred phase ('phase') and wellbore diameter ('weldia') for the wells.
 
     Returns
     -------
@@ -437,90 +510,191 @@ def wellspec_welscomp(file_in, file_inc, depth, opmsys):
     #
     # Initialize Variables and Constants
     #
-    debug = False
     error = False
     comp_data = pd.DataFrame(columns=['wname', 'i1', 'j1', 'k1', 'k2', 'status', 'satab', 'confact', 'weldia',
                                       'kh', 'skin', 'd_fact', 'pen', 'end', 'mdin', 'mdout', 'trans'])
-    comp_zone = pd.DataFrame()
     wels_data = pd.DataFrame(columns=['wname', 'i1', 'j1', 'k1', 'depth', 'phase', 'area', 'inflow', 'status',
                                       'xflow', 'pvtab', 'hydr', 'fiip', 'end'])
     #
-    # Read Input File and Get Indices for Keywords
+    # Read Trajectories and Grid and Intersect the Trajectories with the Grid
     #
     try:
-        file = open(file_in, 'r')
-        data = file.read().splitlines()
-        file.close()
-    except FileNotFoundError as error:
-        sg.popup_error('Error Reading: ' + '\n  \n' + str(file_in) + '\n \n' +
-                       str(error) + ': ' + str(type(error)), no_titlebar=False, grab_anywhere=False, keep_on_top=True)
+        trajs = welltraj_read(file_in)
+        sg.cprint('Trajectories         : ' + str(len(trajs)))
+        grid  = grid_read(file_grid)
+        sg.cprint('Grid Dimensions      : ' + ' '.join(str(dim) for dim in grid['dims']))
+        conn  = grid_wells(grid, trajs)
+    except (OSError, ValueError, IndexError) as error:
+        sg.popup_error('Error Processing: ' + '\n  \n' + str(file_in) + '\n' + str(file_grid) + '\n \n' +
+                       str(error) + ': ' + str(type(error)),
+                       no_titlebar=False, grab_anywhere=False, keep_on_top=True)
         error = True
         return (wels_data, comp_data, error)
 
-    n = 0
-    comp_start = 0
-    comp_end = 0
-    wels_start = 0
-    wels_end = 0
-    for line in data:
-        n = n + 1
-        if 'WELSPECS' in line:
-            wels_start = n + 1
-            continue
+    missing = [well for well in trajs if well not in set(conn['wname'])]
+    if missing:
+        sg.cprint('Wells Not in the Grid : ' + ' '.join(missing))
+    sg.cprint('Connections          : ' + str(len(conn)))
+    if conn.empty:
+        sg.popup_error('No Well Trajectories Intersect the Active Grid Cells', no_titlebar=False, grab_anywhere=False,
+                       keep_on_top=True)
+        error = True
+        return (wels_data, comp_data, error)
+    #
+    # Load WELSPECS and COMPDAT Data Into DataFrames
+    #
+    comp_data = pd.DataFrame({'wname': conn['wname'], 'i1': conn['i'], 'j1': conn['j'], 'k1': conn['k'],
+                              'k2': conn['k'], 'status': 'OPEN', 'satab': '1*', 'confact': '1*',
+                              'weldia': str(spec['weldia']), 'kh': '1*', 'skin': '0.0', 'd_fact': '1*',
+                              'pen': conn['pen'], 'end': '/', 'mdin': conn['mdin'].round(3),
+                              'mdout': conn['mdout'].round(3), 'trans': '1*'}, columns=comp_data.columns)
+    head = conn.drop_duplicates('wname')
+    wels_data = pd.DataFrame({'wname': head['wname'], 'i1': str(spec['group']), 'j1': head['i'], 'k1': head['j'],
+                              'depth': '1*', 'phase': str(spec['phase']), 'area': '1*', 'inflow': 'STD',
+                              'status': 'SHUT', 'xflow': 'YES', 'pvtab': '1*', 'hydr': 'SEG', 'fiip': '1*',
+                              'end': '/'}, columns=wels_data.columns)
+    wels_data.sort_values(by=['wname'], inplace=True)
 
-        if 'COMPDAT' in line:
-            comp_start = n + 1
-            wels_end = n - 4
-            break
+    sg.cprint('WELS_DATA')
+    sg.cprint(wels_data.head().to_string())
+    sg.cprint('COMP_DATA')
+    sg.cprint(comp_data.head().to_string())
     #
-    # Load WELSPECS Data Into DataFrame for Processing
+    # Write Out WELSPECS and COMPDAT Keywords
+    #
+    text = ['OPM Flow Well Specification keywords via OPMRUN(WELSPEC) option', ' ',
+            'Data Generated by intersecting the OPM ResInsight well trajectories with the grid file:',
+            str(file_grid)]
+    with open(file_inc, 'w') as file:
+        opm_header_file(file, file_in, file_inc, ['start', 'NOECHO'], text, opmsys)
+        wellspec_keyword(file, 'WELSPECS', depth, wels_data)
+        wellspec_keyword(file, 'COMPDATA', depth, comp_data)
+    # Read and Write Remove Blanks in First Column (work around for df.to_string() issue)
+    file_lstrip(file_inc)
+    sg.cprint('Process Complete for WELSPECS and COMPDAT Keywords')
+    return (wels_data, comp_data, error)
+
+
+def wellspec_welscomp(file_in, file_inc, depth, opmsys, echo=False):
+    """Writes the OPM Flow WELSPECS and COMPDAT Keywords to a file
+
+    This function writes an OPM Flow well specification data set using the WELSPECS and COMPDAT keyword based on an
+    OPM ResInsight simulation perforation export file. The file is tokenized in one pass, with each COMPDAT record
+    taking the measured depths and transmissibility from the preceding '-- Perforation Completion' comment.
+
+    Parameters
+    ----------
+    file_in : str
+       Name of input file used to capture the comp_data.
+    file_inc : str
+       Name of output include file used to write the keywords to.
+    depth : str
+        Depth units for report headers.
+    opmsys : dict
+        A dictionary containing the OPMRUN system parameters
+    echo : boolean
+        Set to True to echo the input file to the output window, otherwise False.
+
+    Returns
+    -------
+    comp_data : df
+      Contains the COMPDAT keyword data
+    wels_data : df
+      Contains the WELSPECS keyword data
+    error : boolean
+        Set to True for errors otherwise False.
+    """
+    #
+    # Initialize Variables and Constants
+    #
+    debug = False
+    error = False
+    comp_cols = ['wname', 'i1', 'j1', 'k1', 'k2', 'status', 'satab', 'confact', 'weldia', 'kh', 'skin', 'd_fact', 'pen',
+                 'end', 'mdin', 'mdout', 'trans']
+    wels_cols = ['wname', 'i1', 'j1', 'k1', 'depth', 'phase', 'area', 'inflow', 'status', 'xflow', 'pvtab', 'hydr',
+                 'fiip', 'end']
+    comp_data = pd.DataFrame(columns=comp_cols)
+    wels_data = pd.DataFrame(columns=wels_cols)
+    #
+    # Read Input File
     #
-    comp_end = len(data) - 1
-    sg.cprint('WELSPECS Start: ' + str(wels_start))
-    sg.cprint('WELSPECS End  : ' + str(wels_end))
-    n = -1
     try:
-        for line in data[wels_start:wels_end]:
-            n = n + 1
-            sg.cprint(str(line))
-            line = line.split()
-            wels_data.loc[n] = line
-    except ValueError as error:
-        sg.popup_error('Error Processing WELSPECS: ' + '\n  \n' + str(line) + '\n \n' +
-                       str(error) + ': ' + str(type(error)),
-                       no_titlebar=False, grab_anywhere=False, keep_on_top=True)
+        with open(file_in, 'r') as file:
+            data = file.read().splitlines()
+    except FileNotFoundError as error:
+        sg.popup_error('Error Reading: ' + '\n  \n' + str(file_in) + '\n \n' +
+                       str(error) + ': ' + str(type(error)), no_titlebar=False, grab_anywhere=False, keep_on_top=True)
         error = True
         return (wels_data, comp_data, error)
 
-    wels_data.sort_values(by=['wname'], inplace=True)
+    if echo:
+        sg.cprint('\n'.join(data))
     #
-    # Load COMPDAT Data Into DataFrame for Processing
+    # Tokenize the WELSPECS and COMPDAT Records in One Pass
     #
-    sg.cprint('COMPDAT Start : ' + str(comp_start))
-    sg.cprint('COMPDAT End   : ' + str(comp_end))
-    n = 0
-    try:
-        for line in data[comp_start:comp_end]:
-            if '-- Perforation Completion' in line:
-                line0 = line.split()
-            else:
-                n = n + 1
-                sg.cprint(str(line))
-                line = (line + ' ' + line0[6] + ' ' + line0[10] + ' ' + line0[12]).split()
-                comp_data.loc[n] = line
+    block = None
+    perf  = None
+    wels  = []
+    comp  = []
+    for line in data:
+        text = line.strip()
+        if not text:
+            continue
+        elif text.startswith('--'):
+            if block == 'COMPDAT' and '-- Perforation Completion' in line:
+                perf = line.split()
+                if len(perf) < 13:
+                    sg.popup_error('Error Processing COMPDAT: ' + '\n  \n' + str(line) + '\n \n' +
+                                   'Perforation Completion Comment Has ' + str(len(perf)) + ' Items, Expected 13',
+                                   no_titlebar=False, grab_anywhere=False, keep_on_top=True)
+                    error = True
+                    return (wels_data, comp_data, error)
+                perf = [perf[6], perf[10], perf[12]]
+        elif text.startswith('WELSPECS'):
+            block = 'WELSPECS'
+        elif text.startswith('COMPDAT'):
+            block = 'COMPDAT'
+        elif text == '/':
+            block = None
+        elif block == 'WELSPECS':
+            wels.append(text.split())
+        elif block == 'COMPDAT':
+            if perf is None:
+                sg.popup_error('Error Processing COMPDAT: ' + '\n  \n' + str(line) + '\n \n' +
+                               'Record Not Preceded by a Perforation Completion Comment',
+                               no_titlebar=False, grab_anywhere=False, keep_on_top=True)
+                error = True
+                return (wels_data, comp_data, error)
+            comp.append(text.split() + perf)
+            perf = None
+    #
+    # Load WELSPECS and COMPDAT Data Into DataFrames for Processing
+    #
+    for keyword, records, columns in [('WELSPECS', wels, wels_cols), ('COMPDAT', comp, comp_cols)]:
+        for record in records:
+            if len(record) != len(columns):
+                sg.popup_error('Error Processing ' + keyword + ': ' + '\n  \n' + ' '.join(record) + '\n \n' +
+                               'Expected ' + str(len(columns)) + ' Items but Found ' + str(len(record)),
+                               no_titlebar=False, grab_anywhere=False, keep_on_top=True)
+                error = True
+                return (wels_data, comp_data, error)
 
-    except Exception as error:
-        sg.popup_error('Error Processing COMPDAT: ' + '\n  \n' + str(file_in) + '\n \n' +
+    sg.cprint('WELSPECS Wells      : ' + str(len(wels)))
+    sg.cprint('COMPDAT Connections : ' + str(len(comp)))
+    try:
+        wels_data = pd.DataFrame(wels, columns=wels_cols)
+        wels_data = wels_data.astype({'j1': int, 'k1': int})
+        wels_data.sort_values(by=['wname'], inplace=True)
+        comp_data = pd.DataFrame(comp, columns=comp_cols)
+        comp_data = comp_data.astype({'i1': int, 'j1': int, 'k1': int, 'k2': int,
+                                      'mdin': float, 'mdout': float, 'trans': float})
+    except ValueError as error:
+        sg.popup_error('Error Processing: ' + '\n  \n' + str(file_in) + '\n \n' +
                        str(error) + ': ' + str(type(error)),
                        no_titlebar=False, grab_anywhere=False, keep_on_top=True)
         error = True
         return (wels_data, comp_data, error)
 
-    comp_data = comp_data.reset_index()
-    comp_data['mdin'] = comp_data['mdin'].astype(float)
-    comp_data['mdout'] = comp_data['mdout'].astype(float)
-    comp_data['trans'] = comp_data['trans'].astype(float)
-    comp_data.pop('index')
     if debug:
         sg.Print(comp_data.columns.ravel())
         sg.Print(comp_data)
@@ -598,6 +772,12 @@ def wellspec_main(opmoptn, opmsys):
             'In addition, the routine reads an OPM ResInsight Formation Layer file to get the completion number for '
             'a connection and then writes out the COMPLUMP keyword for all the connections. ' +
             '\n\n' +
+            'Alternatively, the WELSPECS and COMPDAT keywords can be generated directly from an OPM ResInsight ' +
+            'well trajectory file (*.asci), as written by the well trajectory utility, by selecting a GRDECL or ' +
+            'EGRID grid file. The trajectories are intersected with the grid to get the connections for all the ' +
+            'active cells penetrated by the wells, so the trajectories must be in the same coordinates and units as ' +
+            'the grid. \n' +
+            '\n' +
             'Note: \n' +
             '----- \n' +
             'For wells that do not have defined perforrations, first genrate the perforations by defining the ' +
@@ -622,7 +802,16 @@ def wellspec_main(opmoptn, opmsys):
                [sg.Text('OPM ResInsight Exported Well Specification File')],
                [sg.Input(file_in, key='_input_', size=(125, None)),
                 sg.FilesBrowse(target='_input_', initial_folder=Path(file_in).absolute(),
-                               file_types=(('OPM ResInsight', '*.exp *.EXP'), ('All', '*.*')))],
+                               file_types=(('OPM ResInsight', '*.exp *.EXP'),
+                                           ('OPM ResInsight Trajectory', '*.asci *.ASCI'), ('All', '*.*')))],
+               [sg.Text('Grid File for Well Trajectory Input (Leave Blank for OPM ResInsight Export Input)')],
+               [sg.Input('', key='_grid_', size=(125, None)),
+                sg.FilesBrowse(target='_grid_', initial_folder=Path(file_in).absolute(),
+                               file_types=(('Grid File', '*.grdecl *.GRDECL *.egrid *.EGRID'), ('All', '*.*')))],
+               [sg.Text('Well Group'), sg.Input('WELLS', key='_group_', size=(10, None)),
+                sg.Text('Phase'), sg.Combo(['OIL', 'GAS', 'WATER', 'LIQ'], default_value='OIL', key='_phase_',
+                                           readonly=True, size=(6, None)),
+                sg.Text('Wellbore Diameter'), sg.Input('0.216', key='_weldia_', size=(8, None))],
                [sg.Text('OPM ResInSight Perforation Output File (Leave Blank for Default)')],
                [sg.InputText(file_ev, key='_output1_', size=(125, None)),
                 sg.FilesBrowse(target='_output1_', initial_folder=Path(file_in).absolute(),
@@ -643,6 +832,7 @@ def wellspec_main(opmoptn, opmsys):
                 sg.Radio('Output Header Units (ms)', "bRadio1", key='_metric_', default=False)],
                [sg.Checkbox('Generate OPM ResInsight Perforation File', size=(70, None), key='_perforations_',
                             default=True)],
+               [sg.Checkbox('Echo Input Files to Output', size=(70, None), key='_echo_', default=False)],
                [sg.Text('')],
                [sg.Button('Load Formation Names', key='_loadnames_'), sg.Button('Generate Keywords', key='_submit_'),
                 sg.Button('Clear', key='_clear_'), sg.Button('Help', key='_help_'),
@@ -703,7 +893,7 @@ def wellspec_main(opmoptn, opmsys):
                                no_titlebar=False, grab_anywhere=False, keep_on_top=True)
                 continue
             else:
-                comp_name, error = wellspec_formation_names(file_lyr)
+                comp_name, error = wellspec_formation_names(file_lyr, values['_echo_'])
             continue
         #
         # Submit
@@ -732,8 +922,19 @@ def wellspec_main(opmoptn, opmsys):
             else:
                 depth = unit_depth['metric']
 
-            # Read Input File and Process WELSPECS and COMPDAT Keywords Exported from OPM ResInsight
-            wels_data, comp_data, error = wellspec_welscomp(file_in, file_inc, depth,opmsys)
+            # Intersect Well Trajectories with the Grid, or Read Input File and Process WELSPECS and COMPDAT
+            # Keywords Exported from OPM ResInsight
+            if values['_grid_'].strip():
+                if not Path(values['_grid_']).is_file():
+                    sg.popup_error('Grid File Not Found', 'File: ', str(values['_grid_']),
+                                   no_titlebar=False, grab_anywhere=False, keep_on_top=True)
+                    continue
+                spec = {'group': values['_group_'].strip(), 'phase': values['_phase_'],
+                        'weldia': values['_weldia_'].strip()}
+                wels_data, comp_data, error = wellspec_trajectories(file_in, values['_grid_'], file_inc, depth,
+                                                                    opmsys, spec)
+            else:
+                wels_data, comp_data, error = wellspec_welscomp(file_in, file_inc, depth, opmsys, values['_echo_'])
             if error:
                 continue
             else:
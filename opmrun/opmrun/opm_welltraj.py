@@ -9,6 +9,11 @@ Program Documentation
 --------------------
 Only Python 3 is supported and tested Python2 support has been depreciated.
 
+2026.10.18 - Added the conversion of deviation surveys to trajectories using the minimum curvature method, for
+             batches of wells with optional resampling to a fixed measured depth step.
+2026.10.18 - Trajectory files converted concurrently on a process pool and written out in order, with each file read
+             once and the trajectories formatted with np.savetxt, rather than re-writing the output file to remove
+             the leading blanks.
 2025.09.19 - Switch from PySimpleGUI to FreeSimpleGUI package
 2021.07.01 - New module initial release.
 
@@ -38,8 +43,13 @@ Date    : 19-Jul-2021
 # ----------------------------------------------------------------------------------------------------------------------
 # Import Modules and Start Up Section
 # ----------------------------------------------------------------------------------------------------------------------
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import repeat
 from pathlib import Path
-import pandas as pd
+import numpy as np
 #
 # Import Required Non-Standard Modules
 #
@@ -47,16 +57,19 @@ import FreeSimpleGUI as sg
 #
 # Import OPM Common Modules
 #
-from opmrun.opm_common import change_directory, file_lstrip, opm_header_file, opm_view, print_dict, window_debug
+from opmrun.opm_common import change_directory, opm_header_file, opm_view, window_debug
 
 # ----------------------------------------------------------------------------------------------------------------------
 # Define Modules Section
 # ----------------------------------------------------------------------------------------------------------------------
-def welltraj(file_list, units, file_out, opmsys):
+def welltraj(file_list, units, file_out, opmsys, workers=None, survey=False, step=None):
     """Reads Petrel Petrel Well Trajectories, Converts and Writes Out OPM ResInsight Trajectories
 
     The function converts Schlumberger Petrel well trajectories into OPM ResInsight format for loading into
-    OPM ResInsight, the program can also convert the data to different units.
+    OPM ResInsight, the program can also convert the data to different units. The trajectory files are converted
+    concurrently on a process pool by welltraj_file, and the converted trajectories are written out in the same order
+    as the file list. Alternatively, the files can be deviation surveys that are converted to trajectories by
+    welltraj_survey using the minimum curvature method.
 
     Parameters
     ----------
@@ -68,6 +81,12 @@ def welltraj(file_list, units, file_out, opmsys):
         Name of the output file
     opmsys : dict
         A dictionary containing the OPMRUN system parameters
+    workers : int
+        Number of worker processes, None for the number of CPUs
+    survey : boolean
+        Set to True if the files are deviation surveys, otherwise False for Petrel well trajectory files
+    step : float
+        Measured depth step to resample the deviation surveys to, None for the survey stations
 
     Returns
     -------
@@ -78,30 +97,17 @@ def welltraj(file_list, units, file_out, opmsys):
     # ------------------------------------------------------------------------------------------------------------------
     # Initialize
     # ------------------------------------------------------------------------------------------------------------------
-    confact = dict()
-    confact['none'] = 1.0
-    confact['msft'] = 3.28083989501312
-    confact['ftms'] = 1 / confact['msft']
-    unit    = str(units['out'])
-    col_in  = []
-    col_out = ['CMT', 'XCORD', 'YCORD', 'TVDSS', 'MD']
-    col_fmt = {'XCORD': '{:14.6e}', 'YCORD': '{:14.6e}', 'TVDSS': '{:10.2f}', 'MD': '{:10.2f}'}
-    col_txt = pd.DataFrame([['--', 'XCORD', 'YCORD', 'TVDSS', 'MD'  ],
-                            ['--', '     ', '     ', 'DEPTH', 'DEPTH'],
-                            ['--',  unit  ,  unit  ,  unit  ,  unit  ],
-                            ['--', '--------------', '--------------', '----------', '----------']], columns=col_out)
-    #                               12345678901234    12345678901234    1234567890    1234567890
-    debug     = False
-    header    = '-- ' + '-' * 129 + '\n'
-    well_name = ''
+    text    = ['Petrel Well Trajectory Conversion to OPM ResInsight Trajectory File:',
+               '(1) Areal Conversion Factor Option - ' + str(units['out']),
+               '(2) Depth Conversion Factor Option - ' + str(units['out'])]
+    convert = partial(welltraj_survey, step=step) if survey else welltraj_file
+    workers = workers or os.cpu_count() or 1
+    chunks  = max(1, len(file_list) // (workers * 4))
     # ------------------------------------------------------------------------------------------------------------------
     # Process All Trajectory Files
     # ------------------------------------------------------------------------------------------------------------------
     try:
         file = open(file_out, 'w')
-        text = ['Petrel Well Trajectory Conversion to OPM ResInsight Trajectory File:',
-                '(1) Areal Conversion Factor Option - ' + str(units['out']),
-                '(2) Depth Conversion Factor Option - ' + str(units['out'])]
         opm_header_file(file, '', file_out, ['start', 'none'], text, opmsys)
     except IOError as error:
         sg.popup_error('Error Writing to: ' + '\n  \n' + str(file_out),
@@ -109,100 +115,17 @@ def welltraj(file_list, units, file_out, opmsys):
                        no_titlebar=False, grab_anywhere=False, keep_on_top=False)
         return (False)
     #
-    # Process Each Trajectory File
+    # Convert the Trajectory Files on a Process Pool and Write Out the Results in File List Order
     #
+    sg.cprint('Processing: ' + str(len(file_list)) + ' Trajectory Files Using ' + str(workers) + ' Processes')
     try:
-        for item in file_list:
-            sg.cprint('Processing: ' + str(item))
-            file.write(header)
-            file.write('-- ' + str(item) + '\n')
-            file.write(header)
-            #
-            # Read Trajectory File into Memory
-            #
-            file_in =open(item, 'r')
-            data = file_in.readlines()
-            file_in.close()
-            # Find All the Parameters
-            nskip = 0
-            for line in data:
-                nskip = nskip + 1
-                if line[:2] == '# ':
-                    file.write('-- ' + line[2:])
-                    if 'WELL NAME:' in line:
-                        well_name = line[12:].strip()
-                        sg.cprint('Processing: ' + well_name)
-                    if '# DX DY' in line:
-                        if 'm-UNITS' in line:
-                            units['areal'] = 'ms'
-                        else:
-                            units['areal'] = 'ft'
-                        sg.cprint('Processing: ' + well_name + ' Areal Input Units: ' + units.get('areal'))
-
-                    if '# DEPTH ' in line:
-                        if 'm-UNITS' in line:
-                            units['depth'] = 'ms'
-                        else:
-                            units['depth'] = 'ft'
-                        sg.cprint('Processing: ' + well_name + ' Depth Input Units: ' + units.get('depth'))
-
-                elif 'DLS' in line:
-                    col_in  = line.split()
-                    sg.cprint('Processing: ' + well_name + ' Column Headers at Line ' + str(nskip))
-                    nskip = nskip + 1
-                    break
-            #
-            # Load Trajectory into a Data Frame
-            #
-            sg.cprint('Processing: ' + well_name + ' Trajectory Data at Line ' + str(nskip))
-            data = pd.read_table(item, delimiter=' ', skiprows=nskip, header=None, names=col_in, skipinitialspace=True)
-            if debug:
-                sg.Print(data.columns.ravel())
-                sg.Print(data)
-            #
-            # Set Conversion Factors If Necessary
-            #
-            if units['areal'] == units['out']:
-                confact['areal'] = confact['none']
-            else:
-                if units['areal'] == units['ft']:
-                    confact['areal'] = confact['ftms']
-                else:
-                    confact['areal'] = confact['msft']
-
-            if units['depth'] == units['out']:
-                confact['depth'] = confact['none']
-            else:
-                if units['depth'] == units['ft']:
-                    confact['depth'] = confact['ftms']
-                else:
-                    confact['depth'] = confact['msft']
-
-            if debug:
-                print_dict('confact', confact, option='debug')
-                print_dict('units'  , units,   option='debug')
-
-            file.write('-- \n')
-            file.write('-- APPLIED AREAL CONVERSION FACTOR: ' + str(confact['areal']) + ' \n')
-            file.write('-- APPLIED DEPTH CONVERSION FACTOR: ' + str(confact['depth']) + ' \n')
-            file.write('-- \n')
-            file.write('WELLNAME:' + well_name + '\n')
-
-            out  = pd.DataFrame(columns=col_out)
-            out['XCORD'] = data['X' ] * confact['areal']
-            out['YCORD'] = data['Y' ] * confact['areal']
-            out['TVDSS'] = data['Z' ] * confact['depth'] * -1
-            out['MD'   ] = data['MD'] * confact['depth']
-            out['CMT'  ] = '   '
-            for key, value in col_fmt.items():
-                out[key] = out[key].apply(value.format)
-            out = col_txt.append(pd.DataFrame(out, columns=col_out))
-            out = out.to_string(index=False, header=False)
-
-            file.write(out)
-            file.write('   \n')
-            file.write('-- \n')
-            sg.cprint('Processing: ' + well_name + ' Complete')
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for result in pool.map(convert, file_list, repeat(units['out']), chunksize=chunks):
+                for line in result['log']:
+                    sg.cprint(line)
+                if result['error'] is not None:
+                    raise ValueError(str(result['file']) + ': ' + result['error'])
+                file.write(result['text'])
         #
         # Write End of File Header
         #
@@ -215,14 +138,402 @@ def welltraj(file_list, units, file_out, opmsys):
                        no_titlebar=False, grab_anywhere=False, keep_on_top=False)
         file.close()
         return(True)
-    #
-    # Read and Write Out Trajectory File to Remove Blanks in First Column (work around for df.to_string() issue)
-    #
-    file_lstrip(file_out)
+
     sg.cprint('Process Complete')
     return(False)
 
 
+def welltraj_file(item, unit):
+    """Reads and Converts a Petrel Well Trajectory File to the OPM ResInsight Format
+
+    Reads a Petrel well trajectory file once, gets the well name, input units and column headers from the file header,
+    and formats the converted trajectory as an OPM ResInsight trajectory block. The numeric columns are formatted as
+    fixed width columns in a single call to np.savetxt. The routine does not use the GUI so that it can be run on a
+    process pool.
+
+    Parameters
+    ----------
+    item : str
+        Trajectory file to be converted
+    unit : str
+        Output areal and depth units, 'ft' or 'ms'
+
+    Returns
+    -------
+    result : dict
+        Dictionary with the trajectory file ('file'), the well name ('well'), the formatted OPM ResInsight trajectory
+        ('text'), a list of messages for the output window ('log'), and an error message ('error') that is None if the
+        file was converted.
+    """
+
+    confact = {'ftms': 1 / 3.28083989501312, 'msft': 3.28083989501312}
+    header  = '-- ' + '-' * 129 + '\n'
+    units   = {'areal': unit, 'depth': unit}
+    col_in  = []
+    nskip   = 0
+    result  = {'file': item, 'well': '', 'text': '', 'log': [], 'error': None}
+    #
+    # Read Trajectory File and Find All the Parameters
+    #
+    try:
+        with open(item, 'r') as file:
+            data = file.readlines()
+    except OSError as error:
+        result['error'] = str(error)
+        return (result)
+
+    text = [header, '-- ' + str(item) + '\n', header]
+    for nskip, line in enumerate(data, 1):
+        if line[:2] == '# ':
+            text.append('-- ' + line[2:].rstrip() + '\n')
+            if 'WELL NAME:' in line:
+                result['well'] = line[12:].strip()
+            if '# DX DY' in line:
+                units['areal'] = 'ms' if 'm-UNITS' in line else 'ft'
+            if '# DEPTH ' in line:
+                units['depth'] = 'ms' if 'm-UNITS' in line else 'ft'
+
+        elif 'DLS' in line:
+            col_in = line.split()
+            break
+
+    well = result['well']
+    if not col_in:
+        result['error'] = 'Trajectory Column Headers Not Found'
+        return (result)
+    #
+    # Load Trajectory Data, Skipping the Line After the Column Headers
+    #
+    try:
+        traj = np.array(' '.join(data[nskip + 1:]).split(), dtype=float).reshape(-1, len(col_in))
+        traj = dict(zip(col_in, traj.T))
+        traj = np.column_stack((traj['X'], traj['Y'], traj['Z'], traj['MD']))
+    except (KeyError, ValueError) as error:
+        result['error'] = 'Error Reading Trajectory Data ' + str(error)
+        return (result)
+    #
+    # Set Conversion Factors If Necessary and Convert Trajectory
+    #
+    for key in ['areal', 'depth']:
+        if units[key] == unit:
+            confact[key] = 1.0
+        elif units[key] == 'ft':
+            confact[key] = confact['ftms']
+        else:
+            confact[key] = confact['msft']
+
+    traj = traj * [confact['areal'], confact['areal'], -confact['depth'], confact['depth']]
+    result['log'].append('Processing: ' + well + ' (' + str(item) + ') Areal Input Units: ' + units['areal'] +
+                         ' Depth Input Units: ' + units['depth'] + ' Points: ' + str(len(traj)))
+    #
+    # Format Trajectory
+    #
+    text.append('--\n')
+    text.append('-- APPLIED AREAL CONVERSION FACTOR: ' + str(confact['areal']) + '\n')
+    text.append('-- APPLIED DEPTH CONVERSION FACTOR: ' + str(confact['depth']) + '\n')
+    text.append('--\n')
+    text.append(welltraj_table(well, traj, unit))
+    result['text'] = ''.join(text)
+    return (result)
+
+
+def welltraj_mincurv(md, inc, azi, well=None, xref=0.0, yref=0.0, zref=0.0, step=None):
+    """Calculate Well Trajectories from Deviation Surveys Using the Minimum Curvature Method
+
+    Calculates the X, Y and TVDSS coordinates of the survey stations for a batch of wells in one pass. The position
+    increment of every survey interval, for all the wells, is calculated from the interval's dogleg angle and ratio
+    factor, and the increments are summed by well. The trajectories can optionally be resampled to a fixed measured
+    depth step, with the resampled points lying on the minimum curvature arc of each survey interval. Azimuths are
+    taken to be relative to grid north, and the TVDSS is positive downwards.
+
+    Parameters
+    ----------
+    md : array
+        Measured depth of each survey station
+    inc : array
+        Inclination of each survey station in degrees
+    azi : array
+        Azimuth of each survey station in degrees
+    well : array
+        Well name of each survey station, None for a single well. The stations are sorted by well, in order of first
+        appearance, and by measured depth
+    xref : float or array
+        X coordinate of the first survey station of each well, for arrays the value at each well's first station is used
+    yref : float or array
+        Y coordinate of the first survey station of each well, for arrays the value at each well's first station is used
+    zref : float or array
+        TVDSS of the first survey station of each well, for arrays the value at each well's first station is used
+    step : float
+        Measured depth step to resample the trajectories to, None for the survey stations. The last survey station of
+        each well is always included.
+
+    Returns
+    -------
+    traj : dict
+        Dictionary of arrays for the 'well', 'md', 'inc', 'azi', 'x', 'y' and 'tvdss' of each trajectory point
+    """
+
+    md   = np.asarray(md, dtype=float)
+    well = np.zeros(len(md), dtype=int) if well is None else np.asarray(well)
+    xref, yref, zref = [np.broadcast_to(np.asarray(value, dtype=float), md.shape) for value in (xref, yref, zref)]
+    #
+    # Sort Stations by Well and Measured Depth, and Get the First and Last Station of Each Well
+    #
+    names, first, code = np.unique(well, return_index=True, return_inverse=True)
+    code  = np.argsort(np.argsort(first))[code]
+    names = names[np.argsort(first)]
+    order = np.lexsort((md, code))
+    md, code = md[order], code[order]
+    inc   = np.radians(np.asarray(inc, dtype=float)[order])
+    azi   = np.radians(np.asarray(azi, dtype=float)[order])
+    start = np.flatnonzero(np.r_[True, code[1:] != code[:-1]])
+    end   = np.r_[start[1:], len(md)] - 1
+    #
+    # Minimum Curvature Position Increments for Each Survey Interval (East, North, Down)
+    #
+    tvec  = np.column_stack((np.sin(inc) * np.sin(azi), np.sin(inc) * np.cos(azi), np.cos(inc)))
+    dmd   = np.diff(md, prepend=md[:1])
+    dmd[start] = 0.0
+    beta  = welltraj_dogleg(np.roll(tvec, 1, axis=0), tvec)
+    delta = (dmd * welltraj_ratio(beta) / 2.0)[:, None] * (np.roll(tvec, 1, axis=0) + tvec)
+    delta[start] = 0.0
+    pos   = np.cumsum(delta, axis=0)
+    pos   = pos - np.repeat(pos[start], end - start + 1, axis=0)
+    pos   = pos + np.column_stack((xref[order][start], yref[order][start], zref[order][start]))[code]
+    if not step:
+        return ({'well': names[code], 'md': md, 'inc': np.degrees(inc), 'azi': np.degrees(azi) % 360.0,
+                 'x': pos[:, 0], 'y': pos[:, 1], 'tvdss': pos[:, 2]})
+    #
+    # Resample Each Well to the Measured Depth Step, Including the Last Station
+    #
+    count  = np.floor((md[end] - md[start]) / step).astype(int) + 1
+    last   = md[start] + (count - 1) * step < md[end]
+    count  = count + last
+    wcode  = np.repeat(np.arange(len(start)), count)
+    points = np.arange(count.sum()) - np.repeat(np.cumsum(count) - count, count)
+    target = np.minimum(md[start][wcode] + points * step, md[end][wcode])
+    span   = md.max() - md.min() + 1.0
+    lo     = np.searchsorted(md + code * span, target + wcode * span, side='right') - 1
+    lo     = np.clip(lo, start[wcode], np.maximum(end[wcode] - 1, start[wcode]))
+    hi     = np.minimum(lo + 1, end[wcode])
+    length = md[hi] - md[lo]
+    frac   = np.divide(target - md[lo], length, out=np.zeros(len(target)), where=length > 0)
+    #
+    # Interpolate the Direction Along the Interval's Arc and Calculate the Position from the Lower Station
+    #
+    beta  = welltraj_dogleg(tvec[lo], tvec[hi])
+    small = beta < 1.0e-9
+    sinb  = np.where(small, 1.0, np.sin(beta))
+    wlo   = np.where(small, 1.0 - frac, np.sin((1.0 - frac) * beta) / sinb)
+    whi   = np.where(small, frac, np.sin(frac * beta) / sinb)
+    tint  = wlo[:, None] * tvec[lo] + whi[:, None] * tvec[hi]
+    tint  = tint / np.linalg.norm(tint, axis=1)[:, None]
+    delta = ((target - md[lo]) * welltraj_ratio(frac * beta) / 2.0)[:, None] * (tvec[lo] + tint)
+    pos   = pos[lo] + delta
+    return ({'well': names[wcode], 'md': target, 'inc': np.degrees(np.arccos(np.clip(tint[:, 2], -1.0, 1.0))),
+             'azi': np.degrees(np.arctan2(tint[:, 0], tint[:, 1])) % 360.0,
+             'x': pos[:, 0], 'y': pos[:, 1], 'tvdss': pos[:, 2]})
+
+
+def welltraj_dogleg(tvec1, tvec2):
+    """Calculate the Dogleg Angle Between Two Sets of Unit Direction Vectors
+
+    Parameters
+    ----------
+    tvec1 : array
+        Unit direction vectors at the start of the intervals
+    tvec2 : array
+        Unit direction vectors at the end of the intervals
+
+    Returns
+    -------
+    beta : array
+        Dogleg angle of each interval in radians
+    """
+
+    return (2.0 * np.arctan2(np.linalg.norm(tvec2 - tvec1, axis=1), np.linalg.norm(tvec2 + tvec1, axis=1)))
+
+
+def welltraj_ratio(beta):
+    """Calculate the Minimum Curvature Ratio Factor
+
+    Parameters
+    ----------
+    beta : array
+        Dogleg angle of each interval in radians
+
+    Returns
+    -------
+    ratio : array
+        Ratio factor of each interval, set to one for straight intervals
+    """
+
+    small = beta < 1.0e-9
+    return (np.where(small, 1.0, 2.0 / np.where(small, 1.0, beta) * np.tan(beta / 2.0)))
+
+
+def welltraj_read(filename):
+    """Read an OPM ResInsight Well Trajectory File
+
+    Reads the well trajectories from an OPM ResInsight trajectory file, as written by the well trajectory utility,
+    where each well starts with a WELLNAME record followed by the X, Y, TVDSS and MD columns, and comment records
+    start with '--'.
+
+    Parameters
+    ----------
+    filename : str
+        OPM ResInsight trajectory file name
+
+    Returns
+    -------
+    trajs : dict
+        Dictionary of well names and their trajectory X, Y, TVDSS and MD columns, in file order
+    """
+
+    wells = dict()
+    well  = None
+    with open(filename, 'r') as file:
+        for line in file:
+            text = line.strip()
+            if not text or text.startswith('--') or text.startswith('#'):
+                continue
+            elif text.upper().startswith('WELLNAME'):
+                well = text.split(':', 1)[1].strip() if ':' in text else text.split(None, 1)[1].strip()
+                wells.setdefault(well, [])
+            elif well is not None:
+                wells[well].append(text)
+
+    return ({well: np.array(' '.join(lines).split(), dtype=float).reshape(-1, 4)
+             for well, lines in wells.items() if lines})
+
+
+def welltraj_survey(item, unit, step=None):
+    """Reads a Deviation Survey File and Converts the Surveys to the OPM ResInsight Format
+
+    Reads a deviation survey file with a column header record, followed by space or comma separated columns, and
+    calculates the trajectories for all the wells in the file in one batch using the minimum curvature method. The
+    header must contain the MD, INCL (or INC, INCLINATION) and AZIM (or AZI, AZIMUTH) columns, and optionally the WELL
+    (or WELLNAME, NAME) column for files with several wells. The X, Y and TVDSS (or Z) columns, if present, give the
+    position of the first station of each well, otherwise the well starts at zero. Comment records start with a '#',
+    and a '# WELL NAME:' comment sets the well name for files without a WELL column, otherwise the file name is used.
+    The survey data should be in the output units. The routine does not use the GUI so that it can be run on a process
+    pool.
+
+    Parameters
+    ----------
+    item : str
+        Deviation survey file to be converted
+    unit : str
+        Output areal and depth units, 'ft' or 'ms'
+    step : float
+        Measured depth step to resample the trajectories to, None for the survey stations
+
+    Returns
+    -------
+    result : dict
+        Dictionary with the deviation survey file ('file'), the number of wells ('well'), the formatted OPM
+        ResInsight trajectories ('text'), a list of messages for the output window ('log'), and an error message
+        ('error') that is None if the file was converted.
+    """
+
+    alias  = {'WELL': ['WELL', 'WELLNAME', 'NAME'], 'MD': ['MD'], 'INCL': ['INCL', 'INC', 'INCLINATION'],
+              'AZIM': ['AZIM', 'AZI', 'AZIMUTH'], 'X': ['X'], 'Y': ['Y'], 'TVDSS': ['TVDSS', 'Z']}
+    header = '-- ' + '-' * 129 + '\n'
+    result = {'file': item, 'well': '', 'text': '', 'log': [], 'error': None}
+    name   = Path(item).stem
+    #
+    # Read Deviation Survey File
+    #
+    try:
+        with open(item, 'r') as file:
+            data = file.read().splitlines()
+    except OSError as error:
+        result['error'] = str(error)
+        return (result)
+
+    text = [header, '-- ' + str(item) + '\n', header]
+    for line in data:
+        if line.startswith('#'):
+            text.append('-- ' + line[1:].strip() + '\n')
+            if 'WELL NAME:' in line:
+                name = line.split('WELL NAME:')[1].strip()
+
+    data = [line.replace(',', ' ') for line in data if line.strip() and not line.startswith('#')]
+    if not data:
+        result['error'] = 'Deviation Survey Column Headers Not Found'
+        return (result)
+
+    col_in = data[0].upper().split()
+    column = {key: next((col_in.index(item) for item in items if item in col_in), None) for key, items in alias.items()}
+    if None in [column['MD'], column['INCL'], column['AZIM']]:
+        result['error'] = 'Deviation Survey MD, INCL and AZIM Columns Not Found in ' + ' '.join(col_in)
+        return (result)
+    #
+    # Load Deviation Survey Data and Calculate the Trajectories
+    #
+    try:
+        survey = np.array(' '.join(data[1:]).split(), dtype=object).reshape(-1, len(col_in))
+        well   = survey[:, column['WELL']].astype(str) if column['WELL'] is not None else np.full(len(survey), name)
+        value  = {key: survey[:, column[key]].astype(float) if column[key] is not None else 0.0
+                  for key in ['MD', 'INCL', 'AZIM', 'X', 'Y', 'TVDSS']}
+        traj   = welltraj_mincurv(value['MD'], value['INCL'], value['AZIM'], well,
+                                  value['X'], value['Y'], value['TVDSS'], step)
+    except ValueError as error:
+        result['error'] = 'Error Reading Deviation Survey Data ' + str(error)
+        return (result)
+    #
+    # Format Trajectories
+    #
+    names = traj['well'][np.r_[True, traj['well'][1:] != traj['well'][:-1]]]
+    split = np.flatnonzero(traj['well'][1:] != traj['well'][:-1]) + 1
+    table = np.split(np.column_stack((traj['x'], traj['y'], traj['tvdss'], traj['md'])), split)
+    text.append('--\n')
+    text.append('-- MINIMUM CURVATURE TRAJECTORIES FROM DEVIATION SURVEYS\n')
+    text.append('-- RESAMPLED MD STEP: ' + (str(step) if step else 'NONE') + '\n')
+    text.append('--\n')
+    for well, rows in zip(names, table):
+        text.append(welltraj_table(well, rows, unit))
+    result['well'] = str(len(names))
+    result['text'] = ''.join(text)
+    result['log'].append('Processing: ' + str(item) + ' Wells: ' + str(len(names)) + ' Stations: ' +
+                         str(len(survey)) + ' Points: ' + str(len(traj['md'])))
+    return (result)
+
+
+def welltraj_table(well, traj, unit):
+    """Format a Well Trajectory as an OPM ResInsight Trajectory Table
+
+    The numeric columns are formatted as fixed width columns in a single call to np.savetxt.
+
+    Parameters
+    ----------
+    well : str
+        Well name
+    traj : array
+        Trajectory X, Y, TVDSS and MD columns
+    unit : str
+        Output areal and depth units, 'ft' or 'ms'
+
+    Returns
+    -------
+    text : str
+        The formatted OPM ResInsight trajectory table
+    """
+
+    text = ['WELLNAME:' + str(well) + '\n']
+    for row in [['--', 'XCORD', 'YCORD', 'TVDSS', 'MD'   ],
+                ['--', '     ', '     ', 'DEPTH', 'DEPTH'],
+                ['--',  unit  ,  unit  ,  unit  ,  unit  ],
+                ['--', '-' * 14, '-' * 14, '-' * 10, '-' * 10]]:
+        text.append('{:>2} {:>14} {:>14} {:>10} {:>10}'.format(*row).rstrip() + '\n')
+    #                12345678901234  12345678901234  1234567890  1234567890
+    out = io.StringIO()
+    np.savetxt(out, traj, fmt='   %14.6e %14.6e %10.2f %10.2f')
+    text.append(out.getvalue())
+    text.append('--\n')
+    return (''.join(text))
+
+
 def welltraj_main(opmoptn, opmsys):
     """Main function for Converting Petrel Well Trajectories to OPM ResInsight Trajectories
 
@@ -265,6 +576,12 @@ def welltraj_main(opmoptn, opmsys):
                 [sg.Text('Areal and Depth Data Output Options')],
                 [sg.Radio('Areal and Depth Output in feet  ', "bRadio1", key='_output_ft_', default=True)],
                 [sg.Radio('Areal and Depth Output in metres', "bRadio1", key='_output_ms_')],
+                [sg.Checkbox('Input Files are Deviation Surveys (MD, INCL, AZIM) Converted by Minimum Curvature',
+                             key='_survey_', default=False),
+                 sg.Text('Resample MD Step'), sg.Input('', key='_step_', size=(8, 1),
+                                                       tooltip='Leave Blank for the Survey Stations')],
+                [sg.Text('Processes'), sg.Spin(list(range(1, os.cpu_count() + 1)), initial_value=os.cpu_count(),
+                                               key='_workers_', size=(4, 1))],
                 [sg.Button('Add'), sg.Button('Clear',  tooltip='Clear Output'), sg.Button('List'),
                  sg.Button('Remove', tooltip='Remove Files'), sg.Submit(),
                  sg.Button('View', disabled=True, tooltip='View Results', key='_view_'), sg.Exit()]]
@@ -362,7 +679,17 @@ def welltraj_main(opmoptn, opmsys):
                         units['out'] = units['ft']
                     else:
                         units['out'] = units['ms']
-                    error = welltraj(file_list, units, file_out, opmsys)
+                    # Set Deviation Survey Resample Step
+                    try:
+                        step = float(values['_step_']) if values['_step_'].strip() else None
+                    except ValueError:
+                        step = -1.0
+                    if step is not None and step <= 0.0:
+                        sg.popup_error('Invalid Resample MD Step: ' + str(values['_step_']),
+                                       no_titlebar=False, grab_anywhere=False, keep_on_top=False)
+                        continue
+                    error = welltraj(file_list, units, file_out, opmsys, int(values['_workers_']),
+                                     values['_survey_'], step)
                     if error:
                         continue
                     window1['_view_'].update(disabled=False)
@@ -46,6 +46,51 @@ Revision History
 ----------------
 Only Python 3 is supported and tested Python2 support has been depreciated.
 
+**2026.10.18**
+
+- Added a concurrent foreground processing option that runs several jobs in the queue at the same time, with the jobs
+  packed so that the running jobs never require more CPUs than are available on the system.
+- Added a job state database (OPMRUN.db in the OPM home directory) recording the start, end, exit code, status and log
+  file of each job, with a resume queue option that skips jobs that have already been completed.
+- Added the opmrun-batch command to run OPMRUN queue files without the GUI, with a JSON summary of the jobs.
+- The opmrun package routines are now loaded on first use, so that the batch runner does not import the GUI modules.
+  The sensitivity and production schedule routines are still available from the package, apart from prodsched_keyword
+  which has been replaced by prodsched_wconhist, but the modules imported by these utilities, for example numpy and
+  pandas, are no longer re-exported by the package.
+- OPM Flow output is now read by a background thread and displayed in batches at a fixed frame rate, rather than
+  refreshing the display for every line of output.
+- The compress utility now compresses the cases in process on a process pool, rather than running the zip command for
+  each case, with a choice of compression method and level, and reports the bytes and throughput for each archive.
+- The uncompress utility now uncompresses the archives in process on a process pool, and can extract selected files
+  only, for example just the summary files, with the CRC of each file checked as it is written.
+- Added the option to compress ensemble directories into a shared chunk store, so that files that are the same in all
+  the ensemble members, for example include files, are only stored once.
+- Faster processing of daily production data in the production schedule utility, by calculating the monthly variables
+  in two grouped passes over the data.
+- Faster writing of the WCONHIST keywords in the production schedule utility.
+- Added an option to the production schedule utility to process large input files by well, so that the input file does
+  not have to fit in memory.
+- Faster assignment of the COMPLUMP completion zones in the well specification utility, with connections in overlapping
+  or undefined formation layers reported.
+- Faster reading of OPM ResInsight export and formation layer files in the well specification utility, with an option
+  to echo the input files to the output window.
+- The well trajectory utility now converts the trajectory files concurrently on a process pool.
+- Added the conversion of deviation surveys (MD, inclination and azimuth) to trajectories using the minimum curvature
+  method to the well trajectory utility, with optional resampling to a fixed measured depth step.
+- The well specification utility can now generate the WELSPECS and COMPDAT keywords directly from well trajectories
+  and a GRDECL or EGRID grid, without an OPM ResInsight completion export.
+- The sensitivity utility now writes the cases on a process pool, with the base deck read once per process and each
+  case written in a single pass.
+- Added a thin cases option to the sensitivity utility, where the base deck sections without factors are written once
+  as shared INCLUDE files and each case deck only contains the sections with factors.
+- Added Latin Hypercube, Maximin Latin Hypercube and Scrambled Sobol designs to the sensitivity utility, with
+  continuous factor ranges and a user defined number of runs, and removed the factor limit for the Factorial Low, Best
+  and High Full design.
+- Added an analysis option to the sensitivity utility, that fits a polynomial or Gaussian process proxy to a summary
+  response of the completed cases and reports the tornado, main effects and response statistics.
+- Added an adaptive option to the sensitivity utility, that runs the cases in batches with the headless batch runner
+  and selects each new batch from the proxy fitted to the completed cases, until the response statistics converge.
+
 **2022.04.01**
 
 Add compression option to add Ensemble directories recursively and updated help information.
@@ -281,14 +326,14 @@ try:
     import getpass, importlib, numpy, os
     import pandas as pd
     from pathlib import Path, PurePath, PurePosixPath, PureWindowsPath
-    import platform, psutil
-    import subprocess, sys
+    import platform, psutil, queue
+    import subprocess, sys, threading
     from packaging.version import Version as parse_version
     from importlib.metadata import version as get_version
     print('OPMRUN Startup: Importing Standard Modules Complete')
 except ImportError as error:
-    packages = ['getpass', 'importlib', 'numpy', 'os', 'pandas', 'pathlib', 'platform', 'psutil',
-                'subprocess', 'sys']
+    packages = ['getpass', 'importlib', 'numpy', 'os', 'pandas', 'pathlib', 'platform', 'psutil', 'queue',
+                'subprocess', 'sys', 'threading']
     print('   Importing Standard Modules Failed\n' +
           '   ' + str(error) + ': ' + str(type(error)) + '\n' +
           '   Required Packages: '+ str(packages) + '\n' +
@@ -355,7 +400,17 @@ print('OPMRUN Startup: Importing Non-Standard Modules Complete')
 #
 # Import OPMRUN Modules
 #
-from opmrun import *
+from opmrun.opm_common import (copy_to_clipboard, convert_string, get_time, kill_job, set_gui_options, opm_popup,
+                               print_dict, remove_ansii_escape_codes, run_command, tail, window_debug, wsl_path)
+from opmrun.opm_compress import (change_directory, compress_cmd, compress_files, uncompress_files)
+from opmrun.opm_jobdb import jobdb_completed, jobdb_end, jobdb_open, jobdb_start
+from opmrun.opm_keyw import keyw_main
+from opmrun.opm_queue import (flow_job, job_check, job_cpus, job_extensions, job_pack, job_reader, job_status,
+                              queue_read)
+from opmrun.opm_sensitivity import *
+from opmrun.opm_prodsched import *
+from opmrun.opm_wellspec import wellspec_main
+from opmrun.opm_welltraj import welltraj_main
 
 #
 # Check for Python 2 Version
@@ -1311,49 +1366,6 @@ def edit_projects(opmoptn1, opmsys1):
     return opmoptn1
 
 
-def flow_job(cmd):
-    """Define Job Parameters for OPM Flow
-
-    Converts job parameters into various forms for processing a flow simulation job. The routine reduces duplication
-    of code for job parameter manipulation
-
-    Parameters
-    ----------
-    cmd : str
-        Job command
-
-    Returns
-    -------
-    jobcmd : str
-        The job command
-    jobpath : str
-        The path of the job file being processed
-    jobbase : str
-        The base name of the the job file being processed
-    jobroot : str
-        The base root  of the the job file being processed
-    joblog : str
-        The job file with suffix '.LOG'
-    """
-
-    debug   = False
-    istart  = cmd.find('=')
-    job     = cmd[istart + 1:]
-    jobcmd  = cmd[:istart + 1]
-    jobpath = Path(job).parents[0]
-    jobbase = Path(job).name
-    jobroot = Path(job).stem
-    joblog  = Path(jobbase).with_suffix('.LOG')
-    if debug:
-        sg.Print('job     : ' + str(job    ))
-        sg.Print('jobcmd  : ' + str(jobcmd ))
-        sg.Print('jobpath : ' + str(jobpath))
-        sg.Print('jobbase : ' + str(jobbase))
-        sg.Print('jobroot : ' + str(jobroot))
-        sg.Print('joblog  : ' + str(joblog ))
-    return job, jobcmd, jobpath, jobbase, jobroot, joblog
-
-
 def load_manual(opmsys1, filename):
     """Loads the OPM Flow User Manual
 
@@ -1648,13 +1660,7 @@ def load_queue(joblist, jobparam):
                     keep_on_top=True)
 
     elif Path(filename).is_file():
-        joblist = []
-
-        file  = open(filename, 'r')
-        for n, line in enumerate(file):
-            if 'flow' in line:
-                joblist.append(line.rstrip())
-        file.close()
+        joblist = queue_read(filename)
         window0['_joblist_'].update(joblist)
         sg.popup_ok('OPMRUN Queue: Loaded from: ' + filename,
                    no_titlebar=False, grab_anywhere=False, keep_on_top=True)
@@ -1741,6 +1747,7 @@ def opm_startup(opmvers, opmsys1, opmlog1):
     opmsys1['opmlog'  ] = Path(opmsys1['opmhome'] / 'OPMRUN.log'  )
     opmsys1['opmjob'  ] = Path(opmsys1['opmhome'] / opmjob        )
     opmsys1['opmparam'] = Path(opmsys1['opmhome'] / 'OPMRUN.param')
+    opmsys1['opmdb'   ] = Path(opmsys1['opmhome'] / 'OPMRUN.db'   )
     opmsys1['opmuser' ] = getpass.getuser()
     #
     # Create OPM Directory if Missing
@@ -1991,6 +1998,9 @@ def run_job(command, opmsys):
     """Run an OPM Flow Job
 
     Runs a OPM Flow job via the subprocess command, gets process ID, and sends output to the OPM Flow output element.
+    The output is read and checked for failures by a background reader thread via a bounded queue, and the output
+    element is updated with the lines received since the last update at a fixed frame rate, rather than for every line
+    of output, with the kill button being checked between updates.
 
     Parameters
     ----------
@@ -2001,17 +2011,25 @@ def run_job(command, opmsys):
 
     Returns
     -------
-    exitcode : int
+    failjob : bool
+        True if the job failed, otherwise False
+    killjob : bool
+        True if the job was killed or aborted, otherwise False
+    status : str
+        Job status, one of 'Completed', 'Failed', 'Killed' or 'Segmentation'
+    returncode : int
         Return code from the sub-process command
     """
     #
     # Submit Job and Get Process ID
     #
-    segmjob = False
-    errors  = ['Exception',  'exception', 'Error: Unrecoverable errors']
-    failjob = False
-    killed  = []
-    killjob = False
+    jobend   = False
+    jobframe = 100
+    jobmax   = 5000
+    jobque   = queue.Queue(maxsize=jobmax)
+    jobstat  = {'failjob': False, 'segmjob': False, 'killed': [], 'errors': []}
+    killed   = []
+    killjob  = False
     if sg.running_windows():
         jobproc = subprocess.Popen(['powershell.exe ','wsl', command], shell=True, stdout=subprocess.PIPE,
                                    stderr=subprocess.STDOUT, bufsize=1, universal_newlines=True)
@@ -2020,50 +2038,53 @@ def run_job(command, opmsys):
                                    bufsize=1, universal_newlines=True)
     out_log('Simulation PID ' + str(jobproc.pid), True)
     window0['_status_bar_'].update(value='Running: ' + str(command), visible=True)
+    jobread = threading.Thread(target=job_reader, args=(jobproc, command, jobque, jobstat), daemon=True)
+    jobread.start()
     #
-    # Process OPM Flow Output
+    # Process OPM Flow Output in Batches at a Fixed Frame Rate
     #
-    for line in jobproc.stdout:
-        line = remove_ansii_escape_codes(line.rstrip())
-        sg.cprint(line)
-        window0.refresh()
-        #
-        # Check if Job Failed
-        #
-        if any(err in line for err in errors):
-            failjob = True
-            killed = jobproc.pid
-            out_log(line, False)
-            #
-            # Fix for mpiruns hanging
-            #
-            if 'Exception' in line or 'exception' in line and 'mpirun' in command:
-                failjob, killed = kill_job('None', jobproc.pid)
+    while not jobend:
+        lines = []
+        while len(lines) < jobmax:
+            try:
+                line = jobque.get_nowait()
+            except queue.Empty:
+                break
+            if line is None:
+                jobend = True
+                break
+            lines.append(line)
 
-            continue
+        if lines:
+            sg.cprint('\n'.join(lines))
         #
-        # Check for Segmentation Fault
+        # Log Job Failures Found by the Reader
         #
-        if 'Segmentation fault' in line:
-            segmjob = True
+        while jobstat['errors']:
+            out_log(jobstat['errors'].pop(0), False)
+
+        if jobend:
+            break
         #
         # Check if User Requested for the Job to be Killed
         #
-        event, values = window0.read(timeout=10)
+        event, values = window0.read(timeout=jobframe)
         if event == '_kill_job_':
             killjob, killed = kill_job('Do You Wish to Kill the Current OPM Flow Job ? \n \n' +
                                        'Job: ' + str(command) + '\n \n', jobproc.pid)
             if killjob:
                 sg.popup_ok('OPM Flow Process ' + str(jobproc.pid) + ' Has Been Stopped by ' + opmsys['opmuser'],
                              auto_close=True, no_titlebar=False, grab_anywhere=False, keep_on_top=True)
-
-            continue
     #
     # Process Complete
     #
     returncode = jobproc.wait()
+    jobread.join()
+    failjob = jobstat['failjob']
+    segmjob = jobstat['segmjob']
+    status  = job_status(failjob, killjob, segmjob, returncode)
     if failjob:
-        out_log('Failed: ' + str(killed), True, True)
+        out_log('Failed: ' + str(jobstat['killed']), True, True)
         out_log('OPM Flow Process ' + str(jobproc.pid) + ' Has Failed', True, True, colors=('red', None))
 
     elif killjob:
@@ -2081,7 +2102,7 @@ def run_job(command, opmsys):
     sg.cprint('Process Complete (' + str(returncode) + ') \n \n')
     window0['_status_bar_'].update(value='', visible=False)
     window0.refresh()
-    return (failjob, killjob)
+    return (failjob, killjob, status, returncode)
 
 
 def run_jobs(joblist, jobsys, outlog):
@@ -2105,16 +2126,16 @@ def run_jobs(joblist, jobsys, outlog):
     """
 
     jobcase  = ''
+    jobdone  = set()
     jobnum   = 0
+    jobqueue = []
     jobsfail = 0
     jobskill = 0
-    upper    = ['.DBG', '.DBPRTX', '.ECLEND', '.EGRID', '.ERROR', '.H5', '.INFOSTEP', '.INIT', '.INSPEC', '.LOG',
-                '.MSG', '.PRT', '.RSM', '.RSSPEC', '.SMSPEC', '.UNRST', '.UNSMRY']
+    jobskip  = 0
+    jobext   = job_extensions(sg.running_windows())
     if sg.running_windows():
-        jobext   = upper
         tail_len = 1
     else:
-        jobext   = upper + [item.lower() for item in upper]
         tail_len = 14
 
     if not joblist:
@@ -2126,7 +2147,9 @@ def run_jobs(joblist, jobsys, outlog):
                [sg.Radio('Run in Standard Simulation Mode', 'bRadio1', key='_rusim_',  default=True)],
                [sg.Text('Submit jobs for foreground or background processing'                      )],
                [sg.Radio('Foreground Processing'          , 'bRadio2', key='_fore_'  , default=True)],
+               [sg.Radio('Foreground Concurrent Processing (Jobs Packed by CPUs)', 'bRadio2', key='_conc_' )],
                [sg.Radio('Background Processing'          , 'bRadio2', key='_back_'                )],
+               [sg.Checkbox('Resume Queue (Skip Foreground Jobs Already Completed)', key='_resume_'    )],
                [sg.Text(''                                                                         )],
                [sg.Submit(), sg.Cancel()]]
     window1 = sg.Window('Select Run Option', layout=layout1, resizable=True)
@@ -2174,6 +2197,22 @@ def run_jobs(joblist, jobsys, outlog):
     # ------------------------------------------------------------------------------------------------------------------
     # Foreground Processing
     # ------------------------------------------------------------------------------------------------------------------
+    #
+    # Open Job State Database and Get Completed Jobs if Resuming the Queue
+    #
+    jobdb   = None
+    jobmode = 'nosim' if values['_nosim_'] else 'run'
+    if event == 'Submit':
+        try:
+            jobdb = jobdb_open(jobsys['opmdb'])
+            if values['_resume_']:
+                jobdone = jobdb_completed(jobdb, joblist, jobmode)
+                out_log('Resume Queue Skipping ' + str(len(jobdone)) + ' Completed Jobs', outlog, True)
+        except Exception as error:
+            jobdb = None
+            out_log('Job State Database Error ' + str(error) + ' Job States Will Not Be Recorded', outlog, True,
+                    colors=('red', None))
+
     for cmd in joblist:
         jobnum  = jobnum + 1
         window0['_joblist_'].update(set_to_index=jobnum - 1, scroll_to_index=jobnum - 1)
@@ -2182,11 +2221,16 @@ def run_jobs(joblist, jobsys, outlog):
         jobdat2 = Path(jobroot).with_suffix('.data')
 
         if values['_nosim_']:
-            jobcase = jobcmd + str(jobbase) + ' --enable-dry-run="true"' + ' | tee ' + str(joblog)
-            sg.cprint(jobcase)
-
+            jobcase = jobcmd + str(jobbase) + ' --enable-dry-run="true"'
         if values['_rusim_']:
-            jobcase = jobcmd + str(jobbase)  + ' | tee ' + str(joblog)
+            jobcase = jobcmd + str(jobbase)
+        #
+        # Concurrent Jobs Write Directly to the Log File Instead of via Tee
+        #
+        if not values['_conc_']:
+            jobcase = jobcase + ' | tee ' + str(joblog)
+        if values['_nosim_']:
+            sg.cprint(jobcase)
 
         if event == 'Cancel' or event is None:
             out_log('Job Processing Canceled', outlog, True)
@@ -2198,7 +2242,15 @@ def run_jobs(joblist, jobsys, outlog):
             #
             set_button_status(True)
             out_log('Run Job ' + str(jobnum) + ' of ' + str(len(joblist)), outlog)
-            out_log('Start Job: ' + jobcase, outlog)
+            if cmd in jobdone:
+                jobskip = jobskip + 1
+                out_log('Skipped  : Completed Previously ' + cmd, outlog, True)
+                out_log('', outlog)
+                continue
+            if values['_conc_']:
+                out_log('Queue Job: ' + jobcase, outlog)
+            else:
+                out_log('Start Job: ' + jobcase, outlog)
             #
             # Change Working Directory
             #
@@ -2254,11 +2306,21 @@ def run_jobs(joblist, jobsys, outlog):
                         out_log('   rm ' + str(filename) + ' Failed - File in Use', outlog)
                         continue
             #
+            # Concurrent Processing - Queue Job and Run Once All Jobs Have Been Checked
+            #
+            if values['_conc_']:
+                jobqueue.append((jobnum, cmd, jobcase, jobpath, joblog))
+                continue
+            #
             # Run Job
             #
             sg.cprint(jobcase)
             out_log('Simulation Started', outlog)
-            failed, killed = run_job(jobcase, opmsys)
+            if jobdb is not None:
+                jobid = jobdb_start(jobdb, None, cmd, jobmode, Path(jobpath) / joblog)
+            failed, killed, status, returncode = run_job(jobcase, opmsys)
+            if jobdb is not None:
+                jobdb_end(jobdb, jobid, status, returncode)
             #
             # Job Failed
             #
@@ -2304,9 +2366,19 @@ def run_jobs(joblist, jobsys, outlog):
             out_log('', outlog)
             opmlog.flush()
     #
+    # Run Concurrent Jobs
+    #
+    if jobqueue:
+        failed, killed = run_jobs_concurrent(jobqueue, tail_len, jobdb, jobmode, jobsys, outlog)
+        jobsfail = jobsfail + failed
+        jobskill = jobskill + killed
+
+    if jobdb is not None:
+        jobdb.close()
+    #
     # Ena of Processing So Print Summary and Enable Buttons
     #
-    jobsrun = jobnum - jobsfail - jobskill
+    jobsrun = jobnum - jobsfail - jobskill - jobskip
     sg.cprint('Queue Schedule Statistics', text_color='blue')
     sg.cprint('Number of Jobs Processed: ' + str(jobnum), text_color='blue')
     if jobsfail == 0:
@@ -2317,12 +2389,168 @@ def run_jobs(joblist, jobsys, outlog):
         sg.cprint('Number of Jobs Killed: ' + str(jobskill), text_color='blue')
     else:
         sg.cprint('Number of Jobs Killed: ' + str(jobskill), text_color='red')
+    if jobskip > 0:
+        sg.cprint('Number of Jobs Skipped (Completed Previously): ' + str(jobskip), text_color='blue')
     sg.cprint('Number of Jobs Completed: ' + str(jobsrun), text_color='blue')
 
     set_button_status(False)
     return()
 
 
+def run_jobs_concurrent(jobqueue, tail_len, jobdb, jobmode, jobsys, outlog):
+    """Run Foreground Jobs Concurrently Packed by the Number of CPUs
+
+    Runs the checked foreground jobs several at a time, where jobs are started in queue order when the CPUs required by
+    the job (the mpirun number of processes, otherwise one) are free, so that the running jobs never require more CPUs
+    than are available on the system. The output of each job is written directly to the job's log file, which is
+    scanned as the job runs for OPM Flow exceptions, unrecoverable errors and segmentation faults.
+
+    Parameters
+    ----------
+    jobqueue : list
+        List of (jobnum, cmd, jobcase, jobpath, joblog) tuples for the jobs to be run
+    tail_len : int
+        Number of lines at the end of the log file to be written to the log once a job is complete
+    jobdb : sqlite3.Connection
+        Job state database connection, or None if job states are not being recorded
+    jobmode : str
+        Run mode, 'run' or 'nosim', for the job state database
+    jobsys : dict
+        Contains a dictionary list of all OPMRUN System parameters
+    outlog  : bool
+        Boolean log file output (True to write to log file, False not to write).
+
+    Returns
+    -------
+    jobsfail : int
+        Number of jobs that failed
+    jobskill : int
+        Number of jobs killed or aborted
+    """
+
+    jobsfail = 0
+    jobskill = 0
+    ncpu     = psutil.cpu_count()
+    pending  = list(jobqueue)
+    running  = []
+    out_log('Concurrent Processing of ' + str(len(pending)) + ' Jobs Using ' + str(ncpu) + ' CPUs', outlog, True)
+
+    while pending or running:
+        #
+        # Start Pending Jobs that Fit into the Free CPUs
+        #
+        jobs = job_pack([job_cpus(job[1]) for job in pending], sum(job['cpus'] for job in running), ncpu)
+        for (jobnum, cmd, jobcase, jobpath, joblog) in [pending.pop(n) for n in sorted(jobs, reverse=True)][::-1]:
+            filename = Path(jobpath) / joblog
+            try:
+                fileout = open(filename, 'w')
+                if sg.running_windows():
+                    jobproc = subprocess.Popen(['powershell.exe ', 'wsl', jobcase], shell=True, cwd=jobpath,
+                                               stdout=fileout, stderr=subprocess.STDOUT)
+                else:
+                    jobproc = subprocess.Popen(jobcase, shell=True, cwd=jobpath, stdout=fileout,
+                                               stderr=subprocess.STDOUT)
+            except OSError as error:
+                jobsfail = jobsfail + 1
+                out_log('Failed to Start Job No. ' + str(jobnum) + ': ' + str(error), outlog, True,
+                        colors=('red', None))
+                continue
+
+            jobid = None
+            if jobdb is not None:
+                jobid = jobdb_start(jobdb, None, cmd, jobmode, filename)
+            running.append({'jobnum': jobnum, 'jobid': jobid, 'jobcase': jobcase, 'jobpath': jobpath,
+                            'filename': filename, 'cpus': job_cpus(jobcase), 'jobproc': jobproc, 'fileout': fileout,
+                            'filescan': open(filename, 'r', errors='replace'), 'partial': '',
+                            'failjob': False, 'segmjob': False, 'killjob': False})
+            window0['_joblist_'].update(set_to_index=jobnum - 1, scroll_to_index=jobnum - 1)
+            sg.cprint('Start Job No. ' + str(jobnum) + ' (' + str(job_cpus(jobcase)) + ' CPUs): ' + jobcase)
+            out_log('Start Job: ' + jobcase + ' PID ' + str(jobproc.pid), outlog)
+
+        window0['_status_bar_'].update(value='Running: ' + str(len(running)) + ' Jobs Using ' +
+                                             str(sum(job['cpus'] for job in running)) + ' of ' + str(ncpu) +
+                                             ' CPUs, ' + str(len(pending)) + ' Jobs Pending', visible=True)
+        #
+        # Check if User Requested for the Running Jobs to be Killed
+        #
+        event, values = window0.read(timeout=250)
+        if event == '_kill_job_' and running:
+            text = sg.popup_yes_no('Do You Wish to Kill All ' + str(len(running)) + ' Running OPM Flow Jobs?\n\n' +
+                                   '\n'.join(job['jobcase'] for job in running),
+                                   no_titlebar=False, grab_anywhere=False, keep_on_top=True)
+            if text == 'Yes':
+                for job in running:
+                    job['killjob'], killed = kill_job('None', job['jobproc'].pid)
+                    out_log('Killed: ' + str(killed), True, True, colors=('red', None))
+                text = sg.popup_yes_no('Kill All Jobs in Queue?', no_titlebar=False, grab_anywhere=False,
+                                       keep_on_top=True)
+                if text == 'Yes':
+                    out_log('Job Queue Killed by User', True, True, colors=('red', None))
+                    pending = []
+        #
+        # Scan Job Output and Process Completed Jobs
+        #
+        for job in list(running):
+            returncode = job['jobproc'].poll()
+            lines      = (job['partial'] + job['filescan'].read()).split('\n')
+            job['partial'] = lines.pop()
+            if returncode is not None:
+                lines.append(job['partial'])
+
+            for line in lines:
+                status = job_check(line)
+                if status in ['Exception', 'Failed'] and not job['failjob']:
+                    job['failjob'] = True
+                    out_log(remove_ansii_escape_codes(line), False)
+                    #
+                    # Fix for mpiruns hanging
+                    #
+                    if status == 'Exception' and 'mpirun' in job['jobcase']:
+                        kill_job('None', job['jobproc'].pid)
+                elif status == 'Segmentation':
+                    job['segmjob'] = True
+
+            if returncode is None:
+                continue
+
+            running.remove(job)
+            job['fileout'].close()
+            job['filescan'].close()
+            if jobdb is not None:
+                jobdb_end(jobdb, job['jobid'], job_status(job['failjob'], job['killjob'], job['segmjob'], returncode),
+                          returncode)
+            jobnum = job['jobnum']
+            pid    = job['jobproc'].pid
+            if job['failjob']:
+                jobsfail = jobsfail + 1
+                out_log('OPM Flow Process ' + str(pid) + ' Has Failed', True, True, colors=('red', None))
+            elif job['killjob']:
+                jobskill = jobskill + 1
+                out_log('OPM Flow Process ' + str(pid) + ' Has Been Stopped by ' + jobsys['opmuser'], True, True,
+                        colors=('red', None))
+            elif job['segmjob'] or returncode != 0:
+                jobskill = jobskill + 1
+                out_log('OPM Flow Process ' + str(pid) + ' Segmentation Fault - Job Aborted (' + str(returncode) +
+                        ')', True, True, colors=('red', None))
+            else:
+                with open(job['filename'], 'r', errors='replace') as file:
+                    lines, status = tail(file, tail_len, offset=None)
+                if status:
+                    for line in lines:
+                        if line != '':
+                            out_log(remove_ansii_escape_codes(line), outlog)
+
+            sg.cprint('End Job No. ' + str(jobnum) + ' Process Complete (' + str(returncode) + ')')
+            out_log('End   Job: ' + job['jobcase'], outlog)
+            out_log('Completed Job No. ' + str(jobnum), outlog)
+            out_log('', outlog)
+            opmlog.flush()
+
+    window0['_status_bar_'].update(value='', visible=False)
+    window0.refresh()
+    return jobsfail, jobskill
+
+
 def run_resinsight(command, jobfile='None'):
     """Run ResInsight
 
@@ -2938,7 +3166,9 @@ def main():
                 'to verify the input decks, or "RUN" mode, without editing the input decks. \n' +
                 '\n'
                 'Jobs in the job queue can be run in foreground mode under OPMRUN, or background in a xterm terminal.' +
-                'The latter is slightly more computationally efficient than the foreground mode. \n' +
+                'The latter is slightly more computationally efficient than the foreground mode. In concurrent ' +
+                'foreground mode several jobs are run at the same time, packed so that the running jobs never use ' +
+                'more CPUs than are available on the system. \n' +
                 '\n'
                 'Various utility options are included via the the Tools menu including:\n' +
                 '\n'
@@ -24,10 +24,318 @@ from CoolProp import CoolProp as cp
 import numpy as np
 from tqdm import tqdm
 from mako.template import Template
+from mako.runtime import Context
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import repeat
 import argparse
+import hashlib
+import os
 
+# Reference state set for each component and the AbstractState reused for each component, per process
+_references = {}
+_states = {}
 
-def generate_table(min_temp, max_temp, ntemp, min_pres, max_pres, npres, comp, tref=None, pref=None):
+
+def set_reference(comp, tref=None, pref=None):
+    """
+    Set the reference state in Coolprop for enthalpy calculations. The reference state is global to the process, so it
+    is also used as initializer for each worker process. The reference state is only set again if it has changed, and
+    then the AbstractState of the component is recreated, as an AbstractState keeps the reference state it was created
+    with.
+
+    Parameters
+    ----------
+    comp : str
+        Component name
+    tref : float, optional
+        Reference temperature
+    pref : float, optional
+        Reference pressure
+    """
+    if _references.get(comp, (None, None)) == (tref, pref):
+        return
+
+    if tref is not None and pref is not None:
+        dmolar = cp.PropsSI('Dmolar', 'T', tref, 'P', pref, comp)
+        cp.set_reference_state(comp, tref, dmolar, 0.0, 0.0)
+    else:
+        cp.set_reference_state(comp, 'DEF')
+    _references[comp] = (tref, pref)
+    _states.pop(comp, None)
+
+
+def get_state(comp):
+    """
+    Get the AbstractState of a component, created on first use in each process
+
+    Parameters
+    ----------
+    comp : str
+        Component name
+
+    Returns
+    -------
+    state : AbstractState
+        Coolprop HEOS AbstractState of the component
+    """
+    if comp not in _states:
+        _states[comp] = cp.AbstractState('HEOS', comp)
+    return _states[comp]
+
+
+def compute_row(t, pres, comp, engine='abstractstate'):
+    """
+    Calculate density and enthalpy for one temperature row. The abstractstate engine updates a reused AbstractState
+    once per point and reads density and enthalpy from the same state, while the propssi engine calls the high-level
+    PropsSI interface once for density and once for enthalpy. Points where Coolprop fails, for example on the
+    saturation line, are set to inf with both engines.
+
+    Parameters
+    ----------
+    t : float
+        Temperature [K]
+    pres : ndarray
+        Pressure values [Pa]
+    comp : str
+        Component name
+    engine : str, optional
+        Property evaluation engine, 'abstractstate' or 'propssi'
+
+    Returns
+    -------
+    dens : ndarray
+        Density [kg/m3] for each pressure
+    enth : ndarray
+        Enthalpy [J/kg] for each pressure
+    """
+    if engine == 'propssi':
+        dens = cp.PropsSI('D', 'T', t, 'P', pres, comp)
+        enth = cp.PropsSI('H', 'T', t, 'P', pres, comp)
+        return dens, enth
+
+    state = get_state(comp)
+    dens = np.full(len(pres), np.inf)
+    enth = np.full(len(pres), np.inf)
+    for j, p in enumerate(pres):
+        try:
+            state.update(cp.PT_INPUTS, p, t)
+        except ValueError:
+            continue
+        dens[j] = state.rhomass()
+        enth[j] = state.hmass()
+    return dens, enth
+
+
+def evaluate_points(pool, temp, pres, ii, jj, comp, engine='abstractstate'):
+    """
+    Calculate density and enthalpy at a set of grid points, grouped into one call of compute_row per temperature
+
+    Parameters
+    ----------
+    pool : ProcessPoolExecutor
+        Worker processes, None to calculate in this process
+    temp : ndarray
+        Temperature values [K]
+    pres : ndarray
+        Pressure values [Pa]
+    ii : ndarray
+        Temperature index of each point
+    jj : ndarray
+        Pressure index of each point
+    comp : str
+        Component name
+    engine : str, optional
+        Property evaluation engine, 'abstractstate' or 'propssi'
+
+    Returns
+    -------
+    dens : ndarray
+        Density [kg/m3] for each point
+    enth : ndarray
+        Enthalpy [J/kg] for each point
+    """
+    order = np.lexsort((jj, ii))
+    rows, start = np.unique(ii[order], return_index=True)
+    groups = np.split(order, start[1:])
+    args = (temp[rows], [pres[jj[group]] for group in groups], repeat(comp), repeat(engine))
+    rows = pool.map(compute_row, *args) if pool is not None else map(compute_row, *args)
+    dens = np.empty(ii.size)
+    enth = np.empty(ii.size)
+    for group, (dens_row, enth_row) in zip(groups, rows):
+        dens[group], enth[group] = dens_row, enth_row
+    return dens, enth
+
+
+def refine_table(temp, pres, comp, tref=None, pref=None, nproc=1, engine='abstractstate', tol=1e-3, ncoarse=17):
+    """
+    Calculate the tables on an adaptive grid, refined where bilinear interpolation does not match Coolprop. The grid
+    starts from ncoarse x ncoarse cells of the uniform grid. For each cell Coolprop is evaluated at the mid-points of
+    the edges and the centre, and the relative difference to the bilinear interpolation of the corner values is taken
+    as the interpolation error of the cell, where values smaller than 0.1 % of the largest value are measured relative
+    to that value. Cells with an error above the tolerance are split at these points, so the refinement follows the
+    saturation line and the critical region, down to single cells of the uniform grid. The uniform grid points inside
+    the accepted cells are interpolated from the cell corners.
+
+    Parameters
+    ----------
+    temp : ndarray
+        Temperature values of the uniform grid [K]
+    pres : ndarray
+        Pressure values of the uniform grid [Pa]
+    comp : str
+        Component name
+    tref : float, optional
+        Reference temperature
+    pref : float, optional
+        Reference pressure
+    nproc : int, optional
+        Number of worker processes, 0 for all cores
+    engine : str, optional
+        Property evaluation engine, 'abstractstate' or 'propssi'
+    tol : float, optional
+        Relative interpolation error tolerance
+    ncoarse : int, optional
+        Number of points of the initial grid in each direction
+
+    Returns
+    -------
+    dens : ndarray
+        Density [kg/m3] on the uniform grid
+    enth : ndarray
+        Enthalpy [J/kg] on the uniform grid
+    neval : int
+        Number of points calculated with Coolprop
+    maxerr : float
+        Max. interpolation error of the accepted cells
+    """
+    ntemp, npres = temp.size, pres.size
+    vals = np.full((2, ntemp, npres), np.nan)
+    known = np.zeros((ntemp, npres), dtype=bool)
+    done = np.zeros((ntemp, npres), dtype=bool)
+    maxerr = 0.0
+
+    nproc = nproc or os.cpu_count() or 1
+    pool = None
+    if nproc == 1:
+        set_reference(comp, tref, pref)
+    else:
+        pool = ProcessPoolExecutor(max_workers=nproc, initializer=set_reference, initargs=(comp, tref, pref))
+
+    # Initial grid, with cells given by the temperature and pressure index of their corners (i0, i1, j0, j1)
+    ti = np.unique(np.linspace(0, ntemp - 1, min(ncoarse, ntemp)).round().astype(int))
+    pj = np.unique(np.linspace(0, npres - 1, min(ncoarse, npres)).round().astype(int))
+    ii, jj = [x.ravel() for x in np.meshgrid(ti, pj, indexing='ij')]
+    vals[:, ii, jj] = evaluate_points(pool, temp, pres, ii, jj, comp, engine)
+    known[ii, jj] = True
+    i0, j0 = [x.ravel() for x in np.meshgrid(ti[:-1], pj[:-1], indexing='ij')]
+    i1, j1 = [x.ravel() for x in np.meshgrid(ti[1:], pj[1:], indexing='ij')]
+    cells = np.stack([i0, i1, j0, j1], axis=1)
+
+    pbar = tqdm(total=(ntemp * npres), ncols=100, desc='Progress')
+    while cells.size:
+        i0, i1, j0, j1 = cells.T
+        im, jm = (i0 + i1) // 2, (j0 + j1) // 2
+
+        # Evaluate the edge mid-points and the centre of each cell
+        ci = np.stack([im, im, i0, i1, im], axis=1)
+        cj = np.stack([j0, j1, jm, jm, jm], axis=1)
+        new = np.unique(np.ravel_multi_index((ci, cj), known.shape)[~known[ci, cj]])
+        ii, jj = np.unravel_index(new, known.shape)
+        if new.size:
+            vals[:, ii, jj] = evaluate_points(pool, temp, pres, ii, jj, comp, engine)
+            known[ii, jj] = True
+
+        # Interpolation error of each cell
+        wt = ((temp[ci] - temp[i0, None]) / (temp[i1] - temp[i0])[:, None])
+        wp = ((pres[cj] - pres[j0, None]) / (pres[j1] - pres[j0])[:, None])
+        err = np.zeros(len(cells))
+        with np.errstate(invalid='ignore'):
+            for v in vals:
+                interp = ((1 - wt) * (1 - wp) * v[i0, j0][:, None] + wt * (1 - wp) * v[i1, j0][:, None] +
+                          (1 - wt) * wp * v[i0, j1][:, None] + wt * wp * v[i1, j1][:, None])
+                floor = 1e-3 * np.abs(v[known & np.isfinite(v)]).max(initial=0.0)
+                cell = np.abs(interp - v[ci, cj]) / np.maximum(np.abs(v[ci, cj]), floor)
+                err = np.maximum(err, np.where(np.isfinite(cell), cell, np.inf).max(axis=1))
+
+        # Split the cells above the tolerance and interpolate the uniform grid points inside the accepted cells
+        si, sj = i1 - i0 > 1, j1 - j0 > 1
+        split = (err > tol) & (si | sj)
+        for a, b, c, d in cells[~split & (si | sj)]:
+            wa = ((temp[a:b + 1] - temp[a]) / (temp[b] - temp[a]))[:, None]
+            wc = ((pres[c:d + 1] - pres[c]) / (pres[d] - pres[c]))[None, :]
+            free = ~known[a:b + 1, c:d + 1]
+            for v in vals:
+                block = ((1 - wa) * (1 - wc) * v[a, c] + wa * (1 - wc) * v[b, c] + (1 - wa) * wc * v[a, d] +
+                         wa * wc * v[b, d])
+                v[a:b + 1, c:d + 1][free] = block[free]
+            done[a:b + 1, c:d + 1] = True
+        maxerr = max(maxerr, err[~split & (si | sj)].max(initial=0.0))
+
+        ia, ja = np.where(si, im, i1), np.where(sj, jm, j1)
+        cells = np.concatenate([np.stack([i0, ia, j0, ja], axis=1)[split],
+                                np.stack([im, i1, j0, ja], axis=1)[split & si],
+                                np.stack([i0, ia, jm, j1], axis=1)[split & sj],
+                                np.stack([im, i1, jm, j1], axis=1)[split & si & sj]])
+        pbar.update(int((done | known).sum()) - pbar.n)
+
+    if pool is not None:
+        pool.shutdown()
+    pbar.close()
+    return vals[0], vals[1], int(known.sum()), maxerr
+
+
+def open_checkpoint(scratch, ntemp, npres):
+    """
+    Open the memory-mapped checkpoint of a table, or create it if it does not exist. Each row holds the density and
+    enthalpy for one temperature followed by a flag set to one once the row has been completed.
+
+    Parameters
+    ----------
+    scratch : str
+        Checkpoint file name
+    ntemp : int
+        Number of temperature points
+    npres : int
+        Number of pressure points
+
+    Returns
+    -------
+    table : memmap
+        Checkpoint table of shape (ntemp, 2 * npres + 1)
+    """
+    if os.path.isfile(scratch):
+        table = np.load(scratch, mmap_mode='r+')
+        if table.shape == (ntemp, 2 * npres + 1) and table.dtype == np.float64:
+            return table
+        del table
+    return np.lib.format.open_memmap(scratch, mode='w+', dtype=np.float64, shape=(ntemp, 2 * npres + 1))
+
+
+def format_rows(vals):
+    """
+    Format the rows of a table for the include file. The values of a row are formatted together with a format string
+    built once for the row length, five values per line, so the table is never held as one string.
+
+    Parameters
+    ----------
+    vals : ndarray
+        Table values, one row per temperature
+
+    Yields
+    ------
+    row : str
+        Formatted row, including the braces and the separator to the next row
+    """
+    seps = [',\n' if (j + 1) % 5 == 0 else ',' for j in range(vals.shape[1])]
+    seps[-1] = '\n'
+    fmt = '\t{\n' + ''.join('\t\t%.15e' + sep for sep in seps) + '\t}'
+    for i, row in enumerate(vals):
+        yield fmt % tuple(row.tolist()) + ('\n' if i == len(vals) - 1 else ',\n')
+
+
+def generate_table(min_temp, max_temp, ntemp, min_pres, max_pres, npres, comp, tref=None, pref=None, nproc=1,
+                   engine='abstractstate', checkpoint=True, tol=None):
     """
     Generate OPM tables for a component
 
@@ -51,43 +359,83 @@ def generate_table(min_temp, max_temp, ntemp, min_pres, max_pres, npres, comp, t
         Reference temperature
     pref : float, optional
         Reference pressure
+    nproc : int, optional
+        Number of worker processes the temperature rows are spread over, 0 for all cores
+    engine : str, optional
+        Property evaluation engine, 'abstractstate' or 'propssi', see compute_row
+    checkpoint : bool, optional
+        Checkpoint the completed rows to a scratch file and resume from it, see open_checkpoint
+    tol : float, optional
+        Relative interpolation error tolerance of the adaptive grid, see refine_table. The uniform grid is calculated
+        if not given, and the adaptive grid is not checkpointed
     """
     # Generate pressure and temperature values
     pres = np.linspace(min_pres, max_pres, npres)
     temp = np.linspace(min_temp, max_temp, ntemp)
 
-    # Init. density and enthalpy output from Coolprops
-    dens = np.zeros((ntemp, npres))  # kg/m3
-    enth = np.zeros((ntemp, npres))  # J/kg
+    # Calculate the tables on the adaptive grid, projected on to the uniform grid
+    neval, maxerr = ntemp * npres, None
+    if tol is not None:
+        dens, enth, neval, maxerr = refine_table(temp, pres, comp, tref, pref, nproc, engine, tol)
+        checkpoint = False
+        print(f'Adaptive grid: {neval} of {ntemp * npres} points calculated with Coolprop, '
+              f'max. estimated interpolation error {maxerr:.3e}')
+    else:
+        # Init. density and enthalpy output from Coolprops. With checkpointing the tables are memory-mapped to a
+        # scratch file named after the table arguments, so a re-run with the same arguments skips the completed rows
+        key = repr((min_temp, max_temp, ntemp, min_pres, max_pres, npres, comp, tref, pref))
+        scratch = f'{comp.lower()}tables-{hashlib.sha1(key.encode()).hexdigest()[:12]}.npy'
+        if checkpoint:
+            table = open_checkpoint(scratch, ntemp, npres)
+        else:
+            table = np.zeros((ntemp, 2 * npres + 1))
+        dens = table[:, :npres]  # kg/m3
+        enth = table[:, npres:-1]  # J/kg
+        done = table[:, -1]
+        todo = np.flatnonzero(done != 1.0)
 
-    # Instantiate progress bar
-    pbar = tqdm(total=(temp.size * 2), ncols=100, desc='Progress')
+        # Instantiate progress bar
+        pbar = tqdm(total=(temp.size * 2), initial=(ntemp - todo.size) * 2, ncols=100, desc='Progress')
 
-    # Set reference temperature and pressure in Coolprop for enthalpy calculations
-    if tref is not None and pref is not None:
-        dmolar = cp.PropsSI('Dmolar', 'T', tref, 'P', pref, comp)
-        cp.set_reference_state(comp, tref, dmolar, 0.0, 0.0)
+        # Calculate density and enthalpy from Coolprops, one temperature row at a time. With several processes the
+        # rows are returned in temperature order, so the tables do not depend on the number of processes
+        nproc = min(nproc or os.cpu_count() or 1, todo.size)
+        if nproc <= 1:
+            # Set reference temperature and pressure in Coolprop for enthalpy calculations
+            set_reference(comp, tref, pref)
+            rows = (compute_row(t, pres, comp, engine) for t in temp[todo])
+        else:
+            pool = ProcessPoolExecutor(max_workers=nproc, initializer=set_reference, initargs=(comp, tref, pref))
+            rows = pool.map(partial(compute_row, pres=pres, comp=comp, engine=engine), temp[todo],
+                            chunksize=max(1, todo.size // (nproc * 16)))
+
+        for i, (dens_row, enth_row) in zip(todo, rows):
+            dens[i, :], enth[i, :] = dens_row, enth_row
+            done[i] = 1.0
+            if checkpoint:
+                table.flush()
+            pbar.update(2)
 
-    # Calculate density and enthalpy from Coolprops
-    for i, t in enumerate(temp):
-            # Density
-            dens[i, :] = cp.PropsSI('D', 'T', t, 'P', pres, comp)
-            pbar.update(1)
-
-            # Enthalpy
-            enth[i, :] = cp.PropsSI('H', 'T', t, 'P', pres, comp)
-            pbar.update(1)
-    
-    # Generate template with mako
-    mako_dict = {"minTemp": min_temp, "maxTemp": max_temp, "nTemp": ntemp, "minPress": min_pres, 
-                 "maxPress" : max_pres, "nPress": npres, "density": dens, "enthalpy": enth, "comp": comp,
-                 "refT" : tref, "refP" : pref}
+        if nproc > 1:
+            pool.shutdown()
+        pbar.close()
+
+    # Generate template with mako, with the table rows pre-formatted by format_rows
+    mako_dict = {"minTemp": min_temp, "maxTemp": max_temp, "nTemp": ntemp, "minPress": min_pres,
+                 "maxPress" : max_pres, "nPress": npres, "density": format_rows(dens),
+                 "enthalpy": format_rows(enth), "comp": comp, "refT" : tref, "refP" : pref, "tol": tol,
+                 "nEval": neval, "maxErr": maxerr}
     template = Template(filename='table_coolprop.mako')
-    filled_template = template.render(**mako_dict)
-    
-    # Write <comp>tables.inc using the filled-out mako template
+
+    # Write <comp>tables.inc by rendering the mako template straight to the file
     with open(f'{comp.lower()}tables.inc', 'w', encoding='utf-8') as fid:
-        fid.write(filled_template)
+        template.render_context(Context(fid, **mako_dict))
+
+    # Remove the checkpoint once the tables have been written
+    del mako_dict, dens, enth
+    if checkpoint:
+        del done, table
+        os.remove(scratch)
 
 
 if __name__ == '__main__':
@@ -136,6 +484,37 @@ if __name__ == '__main__':
     parser.add_argument(
         "-pref", "--ref_press", required=False, type=float, help="Reference pressure in K. [OPTIONAL]"
     )
+    parser.add_argument(
+        "-nw",
+        "--n_workers",
+        required=False,
+        type=int,
+        default=1,
+        help="The number of worker processes the temperature rows are spread over, 0 for all cores. [OPTIONAL]",
+    )
+    parser.add_argument(
+        "-e",
+        "--engine",
+        required=False,
+        choices=["abstractstate", "propssi"],
+        default="abstractstate",
+        help="The Coolprop property engine, a reused AbstractState or the PropsSI function. [OPTIONAL]",
+    )
+    parser.add_argument(
+        "-nc",
+        "--no_checkpoint",
+        action="store_true",
+        help="Do not checkpoint the completed temperature rows to a <comp>tables-<key>.npy scratch file, "
+        "which is used to resume an interrupted run with the same arguments. [OPTIONAL]",
+    )
+    parser.add_argument(
+        "-tol",
+        "--tolerance",
+        required=False,
+        type=float,
+        help="Relative interpolation error tolerance of an adaptive pressure-temperature grid, refined where the "
+        "interpolation error is above the tolerance and projected on to the uniform grid. [OPTIONAL]",
+    )
 
     # Parse CLI arguments
     cmd_args = parser.parse_args()
@@ -148,4 +527,6 @@ if __name__ == '__main__':
     # Run
     generate_table(min_temp=cmd_args.min_temp, max_temp=cmd_args.max_temp, ntemp=cmd_args.n_temp, 
                    tref=cmd_args.ref_temp, min_pres=cmd_args.min_press, max_pres=cmd_args.max_press, 
-                   npres=cmd_args.n_press, pref=cmd_args.ref_press, comp=cmd_args.comp_name)
+                   npres=cmd_args.n_press, pref=cmd_args.ref_press, comp=cmd_args.comp_name,
+                   nproc=cmd_args.n_workers, engine=cmd_args.engine, checkpoint=not cmd_args.no_checkpoint,
+                   tol=cmd_args.tolerance)
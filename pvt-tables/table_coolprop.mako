@@ -13,6 +13,9 @@
 *
 * Temperature range: ${'{0:.3f}'.format(minTemp)} K to ${'{0:.3f}'.format(maxTemp)} K, using ${nTemp} sampling points
 * Pressure range: ${'{0:.3f}'.format(minPress/1e6)} MPa to ${'{0:.3f}'.format(maxPress/1e6)} MPa, using ${nPress} sampling points
+% if tol is not None:
+* Adaptive grid: ${nEval} of ${nTemp*nPress} points calculated, the others interpolated with a max. estimated relative error of ${'{0:.3e}'.format(maxErr)} (tolerance ${tol})
+% endif
 % if refP is not None and refT is not None:
 * Reference temperature and pressure: ${refT} K and ${refP/1e6} MPa
 % else:
@@ -23,9 +26,9 @@
 * Generated using opm_tables_coolprop.py in opm-utilities like this:
 *
 % if refP is None and refT is None:
-* >> python3 opm_tables_coolprop.py -t1 ${minTemp} -t2 ${maxTemp} -nt ${nTemp} -p1 ${minPress} -p2 ${maxPress} -np ${nPress} -c ${comp}
+* >> python3 opm_tables_coolprop.py -t1 ${minTemp} -t2 ${maxTemp} -nt ${nTemp} -p1 ${minPress} -p2 ${maxPress} -np ${nPress} -c ${comp}${'' if tol is None else ' -tol ' + str(tol)}
 % else:
-* >> python3 opm_tables_coolprop.py -t1 ${minTemp} -t2 ${maxTemp} -nt ${nTemp} -tref ${refT} -p1 ${minPress} -p2 ${maxPress} -np ${nPress} -pref ${refP} -c ${comp}
+* >> python3 opm_tables_coolprop.py -t1 ${minTemp} -t2 ${maxTemp} -nt ${nTemp} -tref ${refT} -p1 ${minPress} -p2 ${maxPress} -np ${nPress} -pref ${refP} -c ${comp}${'' if tol is None else ' -tol ' + str(tol)}
 % endif
 * 
 */
@@ -50,16 +53,8 @@ inline const char  *Opm::${comp}TabulatedDensityTraits::name = "density";
 
 inline const Opm::${comp}TabulatedDensityTraits::Scalar Opm::${comp}TabulatedDensityTraits::vals[${nTemp}][${nPress}] =
 {
-% for i in range(nTemp):
-${'\t{'}
-% for j in range(nPress):
-%if (j+1) % 5 == 0:
-${'\t\t{0:.15e}'.format(density[i][j])}${'\n' if loop.last else ',\n'}\
-%else:
-${'\t\t{0:.15e}'.format(density[i][j])}${'\n' if loop.last else ','}\
-%endif
-% endfor
-${'\t}' if loop.last else '\t},'}
+% for row in density:
+${row}\
 % endfor
 };
 
@@ -84,16 +79,8 @@ inline const char  *Opm::${comp}TabulatedEnthalpyTraits::name = "enthalpy";
 
 inline const Opm::${comp}TabulatedEnthalpyTraits::Scalar Opm::${comp}TabulatedEnthalpyTraits::vals[${nTemp}][${nPress}] =
 {
-% for i in range(nTemp):
-${'\t{'}
-% for j in range(nPress):
-%if (j+1) % 5 == 0:
-${'\t\t{0:.15e}'.format(enthalpy[i][j])}${'\n' if loop.last else ',\n'}\
-%else:
-${'\t\t{0:.15e}'.format(enthalpy[i][j])}${'\n' if loop.last else ','}\
-%endif
-% endfor
-${'\t}' if loop.last else '\t},'}
+% for row in enthalpy:
+${row}\
 % endfor
 };
 